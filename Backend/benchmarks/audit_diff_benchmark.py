@@ -0,0 +1,101 @@
+"""
+Audit row size and insert throughput: full before/after snapshots vs field diffs.
+
+Generates synthetic student and subject edits (one or two fields changed per edit,
+like the real update endpoints), stores them once as full snapshots (the old
+format) and once through `diff_changes`, and reports the JSON payload per row and
+multi-row INSERT throughput into a scratch sqlite database.
+
+    python benchmarks/audit_diff_benchmark.py --rows 50000
+"""
+import argparse
+import json
+import os
+import random
+import sys
+import tempfile
+import time
+from datetime import datetime, timezone
+
+BACKEND_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+
+def make_edits(count, rng):
+    edits = []
+    for i in range(count):
+        if i % 2:
+            old = {
+                "id": i, "roll": str(1000 + i), "name": f"Student Name {i}", "year": "2081",
+                "grade_id": 1 + i % 12, "is_active": True,
+            }
+            changes = rng.choice([{"name": f"Student Renamed {i}"}, {"roll": str(5000 + i)}, {"is_active": False}])
+            table = "students"
+        else:
+            old = {
+                "sub_code": f"SUB{i % 40:03d}", "sub_name": f"Subject Title {i % 40}", "Th_ch": 3.0, "Pr_ch": 1.0,
+                "is_elective": bool(i % 3 == 0), "is_active": True, "grade_id": 1 + i % 12,
+            }
+            changes = rng.choice([{"sub_name": "Renamed Subject"}, {"Th_ch": 4.0, "Pr_ch": 0.0}])
+            table = "subjects"
+        edits.append((table, i, old, {**old, **changes}))
+    return edits
+
+
+def build_rows(edits, use_diff):
+    from src.routes.log.utils import diff_changes, json_safe
+
+    now = datetime.now(timezone.utc)
+    rows = []
+    for table, record_id, old, new in edits:
+        if use_diff:
+            old_data, new_data = diff_changes(old, new)
+        else:
+            old_data, new_data = json_safe(old), json_safe(new)
+        rows.append(dict(
+            user_id=1, action="UPDATE", table_name=table, record_id=record_id,
+            old_data=old_data, new_data=new_data, created_at=now,
+        ))
+    return rows
+
+
+def measure(label, rows, batch_size):
+    from sqlalchemy import create_engine, insert
+    from src.config.database import Base
+    from src.routes.log.model import AuditLog
+
+    payload = [len(json.dumps(r["old_data"])) + len(json.dumps(r["new_data"])) for r in rows]
+    db_path = os.path.join(tempfile.mkdtemp(), f"{label}.db")
+    engine = create_engine(f"sqlite:///{db_path}")
+    Base.metadata.create_all(engine, tables=[AuditLog.__table__])
+
+    start = time.perf_counter()
+    with engine.begin() as conn:
+        for offset in range(0, len(rows), batch_size):
+            conn.execute(insert(AuditLog).values(rows[offset:offset + batch_size]))
+    elapsed = time.perf_counter() - start
+    engine.dispose()
+
+    print(
+        f"{label:<9} payload {sum(payload) / len(payload):7.1f} B/row   "
+        f"file {os.path.getsize(db_path) / len(rows):7.1f} B/row   "
+        f"insert {len(rows) / elapsed:10.0f} rows/s"
+    )
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--rows", type=int, default=20000)
+    parser.add_argument("--batch-size", type=int, default=200)
+    args = parser.parse_args()
+
+    os.environ.setdefault("DATABASE_URL", "sqlite://")
+    os.environ.setdefault("ASYNC_DATABASE_URL", "sqlite+aiosqlite://")
+    sys.path.insert(0, BACKEND_DIR)
+
+    edits = make_edits(args.rows, random.Random(7))
+    measure("snapshot", build_rows(edits, use_diff=False), args.batch_size)
+    measure("diff", build_rows(edits, use_diff=True), args.batch_size)
+
+
+if __name__ == "__main__":
+    main()
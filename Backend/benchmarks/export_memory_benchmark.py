@@ -0,0 +1,80 @@
+"""
+Peak Python memory of the streaming exports as the grade grows.
+
+Seeds a throwaway SQLite database with one grade of N students (for each N in
+--sizes), drains the CSV and XLSX bodies of the students export exactly as
+StreamingResponse would, and reports bytes produced and tracemalloc's peak.
+Constant peaks across sizes mean rows are never accumulated.
+
+    python benchmarks/export_memory_benchmark.py --sizes 50 5000 50000
+"""
+import argparse
+import asyncio
+import os
+import sys
+import tempfile
+import time
+import tracemalloc
+
+BACKEND_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+
+async def drain(body):
+    size = 0
+    async for chunk in body:
+        size += len(chunk)
+    return size
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--sizes", type=int, nargs="+", default=[50, 5000, 50000])
+    args = parser.parse_args()
+
+    path = os.path.join(tempfile.mkdtemp(), "export.db")
+    os.environ["DATABASE_URL"] = f"sqlite:///{path}"
+    os.environ["ASYNC_DATABASE_URL"] = f"sqlite+aiosqlite:///{path}"
+    sys.path.insert(0, BACKEND_DIR)
+
+    from sqlalchemy import insert, delete
+    import main as app_main  # noqa: F401 - registers every model and creates the tables
+    from src.config.database import SessionLocal, async_engine
+    from src.routes.export.service import ExportService
+    from src.routes.grade.model import Grade
+    from src.routes.student.model import Student
+
+    with SessionLocal() as db:
+        db.add(Grade(id=1, code="G1", name="Grade 1", subject_count=0))
+        db.commit()
+
+    async def export(fmt):
+        header, batches = await ExportService.students(1, None)
+        return await drain(ExportService.render(fmt, "students", header, batches)[1])
+
+    async def run():
+        print(f"  {'rows':>7}{'format':>8}{'bytes':>12}{'peak KB':>10}{'ms':>8}")
+        for size in args.sizes:
+            with SessionLocal() as db:
+                db.execute(delete(Student))
+                for offset in range(0, size, 5000):
+                    db.execute(insert(Student).values([
+                        {"roll": str(100000 + i), "name": f"Student Name {i}", "year": "2081", "grade_id": 1,
+                         "is_active": True}
+                        for i in range(offset, min(offset + 5000, size))
+                    ]))
+                db.commit()
+            for fmt in ("csv", "xlsx"):
+                tracemalloc.start()
+                start = time.perf_counter()
+                produced = await export(fmt)
+                elapsed = (time.perf_counter() - start) * 1000
+                peak = tracemalloc.get_traced_memory()[1]
+                tracemalloc.stop()
+                print(f"  {size:>7}{fmt:>8}{produced:>12}{peak / 1024:>10.0f}{elapsed:>8.0f}")
+        # pooled aiosqlite connections run on threads that keep the process alive
+        await async_engine.dispose()
+
+    asyncio.run(run())
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,131 @@
+"""
+List endpoint throughput: ORM entities + response_model vs lean column projection.
+
+Seeds a throwaway sqlite database with --rows students, subjects, grades and users,
+then fetches GET /students/ (all pages), /subjects/, /grades/ and /auth/allusers
+in-process with LEAN_LIST_RESPONSES off and on, and reports rows/sec for each.
+
+    python benchmarks/list_projection_benchmark.py --rows 10000
+"""
+import argparse
+import asyncio
+import contextlib
+import os
+import sys
+import tempfile
+import time
+
+import httpx
+
+BACKEND_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+PASSWORD = "bench-password"
+
+
+def build_local_app(rows):
+    db_path = os.path.join(tempfile.mkdtemp(), "bench.db")
+    os.environ.setdefault("DATABASE_URL", f"sqlite:///{db_path}")
+    os.environ.setdefault("ASYNC_DATABASE_URL", f"sqlite+aiosqlite:///{db_path}")
+    os.environ.setdefault("DB_POOL_LOG_INTERVAL", "0")
+    sys.path.insert(0, BACKEND_DIR)
+
+    import main
+    from sqlalchemy import insert
+    from src.config.database import engine
+    from src.routes.auth.model import User
+    from src.routes.auth.service import pwd_context
+    from src.routes.grade.model import Grade
+    from src.routes.student.model import Student
+    from src.routes.subject.model import Subject
+    from src.routes.year.model import Year
+
+    hashed = pwd_context.hash(PASSWORD)
+    with engine.begin() as conn:
+        conn.execute(insert(Year).values(year="2081", is_current=True))
+        conn.execute(insert(User).values(id=1, username="admin", password=hashed, is_admin=True))
+        conn.execute(insert(User).values(id=2, username="teacher", password=hashed, is_admin=False))
+        conn.execute(insert(Grade).values(
+            id=1, code="G1", name="Grade 1", subject_count=5, has_elective=False, elective_count=0, grade_teacher_id=2,
+        ))
+        for offset in range(0, rows, 500):
+            chunk = range(offset, min(offset + 500, rows))
+            conn.execute(insert(Student).values([
+                dict(roll=str(100000 + i), name=f"Student {i}", year="2081", grade_id=1, is_active=i % 10 != 0)
+                for i in chunk
+            ]))
+            conn.execute(insert(Subject).values([
+                dict(sub_code=f"S{i}", sub_name=f"Subject {i}", Th_ch=3, Pr_ch=1, is_elective=False, grade_id=1)
+                for i in chunk
+            ]))
+            conn.execute(insert(Grade).values([
+                dict(code=f"C{i}", name=f"Grade {i}", subject_count=5, has_elective=False, elective_count=0)
+                for i in chunk
+            ]))
+            conn.execute(insert(User).values([
+                dict(username=f"user{i}", password=hashed, grade_code=None, is_admin=False) for i in chunk
+            ]))
+    return main.app
+
+
+async def fetch_students(client, headers):
+    count, cursor = 0, None
+    while True:
+        params = {"limit": 500, **({"cursor": cursor} if cursor else {})}
+        page = (await client.get("/students/", params=params, headers=headers)).json()
+        count += len(page["items"])
+        cursor = page["next_cursor"]
+        if not cursor:
+            return count
+
+
+async def fetch_list(client, url, headers):
+    response = await client.get(url, headers=headers)
+    response.raise_for_status()
+    return len(response.json())
+
+
+async def run(app, repeat):
+    from src.config.settings import settings
+
+    async with contextlib.AsyncExitStack() as stack:
+        await stack.enter_async_context(app.router.lifespan_context(app))
+        client = await stack.enter_async_context(
+            httpx.AsyncClient(transport=httpx.ASGITransport(app=app), base_url="http://bench")
+        )
+
+        async def token(username):
+            response = await client.post("/auth/login", data={"username": username, "password": PASSWORD})
+            return {"Authorization": f"Bearer {response.json()['access_token']}"}
+
+        teacher, admin = await token("teacher"), await token("admin")
+        cases = [
+            ("/students/", lambda: fetch_students(client, teacher)),
+            ("/subjects/", lambda: fetch_list(client, "/subjects/", teacher)),
+            ("/grades/", lambda: fetch_list(client, "/grades/", None)),
+            ("/auth/allusers", lambda: fetch_list(client, "/auth/allusers", admin)),
+        ]
+
+        print(f"{'endpoint':<16}{'orm rows/s':>14}{'lean rows/s':>14}{'speedup':>10}")
+        for label, fetch in cases:
+            rates = {}
+            for lean in (False, True):
+                settings.LEAN_LIST_RESPONSES = lean
+                await fetch()  # warm caches and adapters
+                start, total = time.perf_counter(), 0
+                for _ in range(repeat):
+                    total += await fetch()
+                rates[lean] = total / (time.perf_counter() - start)
+            print(f"{label:<16}{rates[False]:>14.0f}{rates[True]:>14.0f}{rates[True] / rates[False]:>9.2f}x")
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--rows", type=int, default=10000)
+    parser.add_argument("--repeat", type=int, default=3)
+    args = parser.parse_args()
+
+    app = build_local_app(args.rows)
+    asyncio.run(run(app, args.repeat))
+
+
+if __name__ == "__main__":
+    main()
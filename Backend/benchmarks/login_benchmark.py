@@ -0,0 +1,127 @@
+"""
+Login throughput benchmark.
+
+Runs a burst of concurrent logins and, at the same time, probes an unrelated
+endpoint (GET /years/current) to show how much the login burst slows everything
+else down. Reports logins/sec, rejected (503) logins and probe latency percentiles.
+
+    python benchmarks/login_benchmark.py                 # in-process, sqlite stand-in
+    python benchmarks/login_benchmark.py --url http://127.0.0.1:8000 --username admin --password secret
+
+Without --url the app is loaded in-process against a throwaway sqlite database,
+so HASH_WORKERS / HASH_MAX_QUEUE can be tuned through the environment.
+"""
+import argparse
+import asyncio
+import contextlib
+import os
+import statistics
+import sys
+import tempfile
+import time
+
+import httpx
+
+BACKEND_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+
+def percentile(values, pct):
+    if not values:
+        return 0.0
+    values = sorted(values)
+    index = min(len(values) - 1, int(round(pct / 100 * (len(values) - 1))))
+    return values[index]
+
+
+def build_local_app(username, password):
+    db_path = os.path.join(tempfile.mkdtemp(), "bench.db")
+    os.environ.setdefault("DATABASE_URL", f"sqlite:///{db_path}")
+    os.environ.setdefault("ASYNC_DATABASE_URL", f"sqlite+aiosqlite:///{db_path}")
+    os.environ.setdefault("DB_POOL_LOG_INTERVAL", "0")
+    sys.path.insert(0, BACKEND_DIR)
+
+    import main
+    from src.config.database import SessionLocal
+    from src.routes.auth.model import User
+    from src.routes.auth.service import pwd_context
+    from src.routes.year.model import Year
+
+    with SessionLocal() as db:
+        db.add(User(username=username, password=pwd_context.hash(password), is_admin=True))
+        db.add(Year(year="2081", is_current=True))
+        db.commit()
+    return main.app
+
+
+async def login_worker(client, username, password, deadline, results):
+    while time.perf_counter() < deadline:
+        start = time.perf_counter()
+        response = await client.post("/auth/login", data={"username": username, "password": password})
+        elapsed = time.perf_counter() - start
+        if response.status_code == 200:
+            results["ok"].append(elapsed)
+        elif response.status_code == 503:
+            results["rejected"] += 1
+        else:
+            results["errors"] += 1
+
+
+async def probe_worker(client, headers, deadline, latencies, interval):
+    while time.perf_counter() < deadline:
+        start = time.perf_counter()
+        await client.get("/years/current", headers=headers)
+        latencies.append(time.perf_counter() - start)
+        await asyncio.sleep(interval)
+
+
+async def run(args):
+    if args.url:
+        transport, base_url, lifespan = None, args.url, contextlib.nullcontext()
+    else:
+        app = build_local_app(args.username, args.password)
+        transport, base_url = httpx.ASGITransport(app=app), "http://bench"
+        lifespan = app.router.lifespan_context(app)
+
+    async with lifespan, httpx.AsyncClient(transport=transport, base_url=base_url, timeout=60) as client:
+        response = await client.post("/auth/login", data={"username": args.username, "password": args.password})
+        response.raise_for_status()
+        headers = {"Authorization": f"Bearer {response.json()['access_token']}"}
+
+        # baseline probe latency with no logins running
+        baseline = []
+        await probe_worker(client, headers, time.perf_counter() + args.baseline, baseline, args.probe_interval)
+
+        results = {"ok": [], "rejected": 0, "errors": 0}
+        under_load = []
+        deadline = time.perf_counter() + args.duration
+        started = time.perf_counter()
+        await asyncio.gather(
+            *(login_worker(client, args.username, args.password, deadline, results) for _ in range(args.concurrency)),
+            probe_worker(client, headers, deadline, under_load, args.probe_interval),
+        )
+        wall = time.perf_counter() - started
+
+    ms = lambda seconds: round(seconds * 1000, 2)
+    print(f"login concurrency      : {args.concurrency}")
+    print(f"logins/sec             : {len(results['ok']) / wall:.1f}")
+    print(f"logins ok/503/error    : {len(results['ok'])}/{results['rejected']}/{results['errors']}")
+    if results["ok"]:
+        print(f"login p50/p99 (ms)     : {ms(statistics.median(results['ok']))}/{ms(percentile(results['ok'], 99))}")
+    print(f"probe baseline p50/p99 : {ms(percentile(baseline, 50))}/{ms(percentile(baseline, 99))} ms ({len(baseline)} requests)")
+    print(f"probe under load p50/p99: {ms(percentile(under_load, 50))}/{ms(percentile(under_load, 99))} ms ({len(under_load)} requests)")
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--url", help="benchmark a running server instead of an in-process app")
+    parser.add_argument("--username", default="bench")
+    parser.add_argument("--password", default="bench-password")
+    parser.add_argument("--concurrency", type=int, default=64)
+    parser.add_argument("--duration", type=float, default=10.0)
+    parser.add_argument("--baseline", type=float, default=2.0)
+    parser.add_argument("--probe-interval", type=float, default=0.01)
+    asyncio.run(run(parser.parse_args()))
+
+
+if __name__ == "__main__":
+    main()
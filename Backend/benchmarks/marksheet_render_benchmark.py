@@ -0,0 +1,107 @@
+"""
+Marksheet rendering: one process vs the marksheet pool.
+
+Builds --students synthetic marksheets (the dicts MarksheetService.load_sheets
+produces) and streams them into a ZIP the way GET /marksheets/ does, first
+rendering every chunk in this process, then fanning the chunks out to
+MarksheetPool. Reports total time and time to the first ZIP bytes.
+
+    python benchmarks/marksheet_render_benchmark.py --students 2000 --workers 4
+"""
+import argparse
+import asyncio
+import os
+import random
+import sys
+import time
+import zipfile
+
+BACKEND_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+
+def make_sheets(students, subjects, rng):
+    letters = ["A+", "A", "B+", "B", "C+", "C", "D", "NG"]
+    return [
+        {
+            "grade": "Grade 11 Science", "year": "2081", "student_id": i, "roll": str(100000 + i),
+            "name": f"Student Name {i}", "gpa": round(rng.uniform(1.6, 4.0), 2), "final_grade": rng.choice(letters),
+            "percentage": round(rng.uniform(35, 98), 2), "division": "First", "passed": True,
+            "subjects": [
+                {"subject_id": j, "sub_code": f"SUB{j:03d}", "sub_name": f"Subject Title {j}", "credit_hours": 4.0,
+                 "th_grade": rng.choice(letters), "pr_grade": rng.choice(letters), "grade": rng.choice(letters),
+                 "grade_point": round(rng.uniform(1.6, 4.0), 2)}
+                for j in range(subjects)
+            ],
+        }
+        for i in range(students)
+    ]
+
+
+class Sink:
+    def __init__(self):
+        self.size = 0
+
+    def write(self, data):
+        self.size += len(data)
+        return len(data)
+
+    def flush(self):
+        pass
+
+
+async def stream(chunks, render):
+    """Render chunks (in completion order) into a streamed ZIP; returns (total s, first bytes s, zip size)."""
+    sink = Sink()
+    archive = zipfile.ZipFile(sink, "w", compression=zipfile.ZIP_DEFLATED)
+    start = time.perf_counter()
+    first = None
+    for finished in asyncio.as_completed([render(chunk) for chunk in chunks]):
+        for filename, body in await finished:
+            archive.writestr(filename, body)
+        if first is None:
+            first = time.perf_counter() - start
+    archive.close()
+    return time.perf_counter() - start, first, sink.size
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--students", type=int, default=2000)
+    parser.add_argument("--subjects", type=int, default=8)
+    parser.add_argument("--chunk", type=int, default=50)
+    parser.add_argument("--workers", type=int, default=min(4, os.cpu_count() or 1))
+    args = parser.parse_args()
+
+    os.environ.setdefault("DATABASE_URL", "sqlite://")
+    os.environ.setdefault("ASYNC_DATABASE_URL", "sqlite+aiosqlite://")
+    sys.path.insert(0, BACKEND_DIR)
+    from src.routes.marksheet.pool import MarksheetPool
+    from src.routes.marksheet.renderer import render_chunk
+
+    sheets = make_sheets(args.students, args.subjects, random.Random(5))
+    chunks = [sheets[i:i + args.chunk] for i in range(0, len(sheets), args.chunk)]
+
+    async def in_process(chunk):
+        return render_chunk(chunk)
+
+    pool = MarksheetPool(args.workers, 1, "spawn")
+
+    async def pooled(chunk):
+        return await pool.submit(render_chunk, chunk)
+
+    async def run():
+        # start the workers outside the timing
+        await asyncio.gather(*(pool.submit(render_chunk, chunks[0][:1]) for _ in range(args.workers)))
+        return await stream(chunks, in_process), await stream(chunks, pooled)
+
+    (serial, serial_first, size), (parallel, parallel_first, _) = asyncio.run(run())
+    pool.shutdown()
+
+    print(f"{args.students} marksheets x {args.subjects} subjects, {len(chunks)} chunks of {args.chunk}, zip {size / 1024:.0f} KB")
+    print(f"  {'':<22}{'total':>10}{'first bytes':>14}")
+    print(f"  {'one process':<22}{serial * 1000:>8.0f}ms{serial_first * 1000:>12.0f}ms")
+    print(f"  {f'pool ({args.workers} workers)':<22}{parallel * 1000:>8.0f}ms{parallel_first * 1000:>12.0f}ms")
+
+
+if __name__ == "__main__":
+    main()
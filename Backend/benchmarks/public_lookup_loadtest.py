@@ -0,0 +1,194 @@
+"""
+Result-day load on the public lookup `GET /published/{year}/{roll}`.
+
+Publishes a grade of --students students into a throwaway results directory,
+then runs --users concurrent virtual users against one worker for --duration
+seconds. Each request comes from a random address out of --clients (sent as
+X-Forwarded-For, which the worker trusts here) and asks for a roll number drawn
+from a skewed distribution, so a few rolls are hot and the rest long-tail; a
+share of lookups are unknown rolls. One extra user hammers from a single
+address and should be throttled. Reports lookups/sec, latency percentiles of
+the answered lookups and whether p99 is within --p99-target.
+
+In process (ASGI calls straight into the app, one event loop = one worker):
+
+    python benchmarks/public_lookup_loadtest.py --users 64 --duration 10
+
+Against a running worker instead (publish first and start it with TRUST_FORWARDED_FOR=1):
+
+    python benchmarks/public_lookup_loadtest.py --url http://127.0.0.1:8000 --year 2081 --rolls 1 1000
+"""
+import argparse
+import asyncio
+import itertools
+import os
+import random
+import sys
+import tempfile
+import time
+from types import SimpleNamespace
+
+BACKEND_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+
+
+def publish_grade(students: int, year: str):
+    """Write and activate a snapshot straight from engine output (no database rows needed)."""
+    from result_engine_benchmark import make_grade
+    from src.routes.published import store
+    from src.routes.published.service import GRADE_LABELS, _columns
+    from src.routes.published.snapshot import write_snapshot
+    from src.routes.result.engine import DIVISIONS, GRADE_LETTERS, build_sheet, compute
+    from src.routes.result.service import ResultSet
+
+    student_ids, subjects, chosen, marks = make_grade(students, 6, 4, random.Random(7))
+    sheet = build_sheet(student_ids, subjects, chosen, marks)
+    rows = [SimpleNamespace(roll=str(sid), name=f"Student {sid}") for sid in student_ids]
+    labels = [
+        SimpleNamespace(id=sub_id, sub_code=f"S{sub_id}", sub_name=f"Subject {sub_id}", Th_ch=th, Pr_ch=pr)
+        for sub_id, th, pr, _ in subjects
+    ]
+    result = ResultSet(year, rows, labels, sheet, compute(sheet))
+    header = {
+        "grade_id": 1, "grade_code": "G1", "grade_name": "Grade 1", "year": year,
+        "published_at": "2026-01-01T00:00:00+00:00", "count": students,
+        "subjects": [{"id": s.id, "code": s.sub_code, "name": s.sub_name, "th_ch": s.Th_ch, "pr_ch": s.Pr_ch}
+                     for s in labels],
+        "labels": {"grade": GRADE_LABELS, "division": list(DIVISIONS), "component": list(GRADE_LETTERS)},
+    }
+    version, f = store.create_version(year, 1)
+    with f:
+        write_snapshot(f, {**header, "version": version}, _columns(result))
+    store.set_current(year, 1, version)
+
+
+class ASGIClient:
+    """Calls the app directly (no HTTP parsing), so the numbers are the worker's own cost."""
+
+    def __init__(self, app):
+        self.app = app
+
+    async def get(self, path, headers):
+        scope = {
+            "type": "http", "asgi": {"version": "3.0"}, "http_version": "1.1", "method": "GET", "scheme": "http",
+            "path": path, "raw_path": path.encode(), "query_string": b"", "root_path": "",
+            "headers": [(k.lower().encode(), v.encode()) for k, v in headers.items()],
+            "client": ("127.0.0.1", 50000), "server": ("loadtest", 80),
+        }
+        response = SimpleNamespace(status_code=None)
+
+        async def receive():
+            return {"type": "http.request", "body": b"", "more_body": False}
+
+        async def send(message):
+            if message["type"] == "http.response.start":
+                response.status_code = message["status"]
+
+        await self.app(scope, receive, send)
+        return response
+
+
+def percentile(sorted_values, q):
+    if not sorted_values:
+        return 0.0
+    return sorted_values[min(len(sorted_values) - 1, int(q / 100 * len(sorted_values)))]
+
+
+async def virtual_user(client, year, rolls, weights, clients, unknown, deadline, rng, latencies, codes, address=None):
+    while time.perf_counter() < deadline:
+        roll = str(rng.randrange(10**7, 10**8)) if rng.random() < unknown else rng.choices(rolls, cum_weights=weights)[0]
+        ip = address or clients[rng.randrange(len(clients))]
+        start = time.perf_counter()
+        response = await client.get(f"/published/{year}/{roll}", headers={"X-Forwarded-For": ip})
+        elapsed = (time.perf_counter() - start) * 1000
+        codes[response.status_code] = codes.get(response.status_code, 0) + 1
+        if address is None:
+            latencies.append(elapsed)
+        # in process a cached answer never suspends; yield as a socket round trip would
+        await asyncio.sleep(0)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--url", help="base URL of a running worker; default runs the app in process")
+    parser.add_argument("--students", type=int, default=2000)
+    parser.add_argument("--year", default="2081")
+    parser.add_argument("--rolls", type=int, nargs=2, metavar=("FIRST", "LAST"), help="roll range (with --url)")
+    parser.add_argument("--users", type=int, default=64, help="concurrent virtual users")
+    parser.add_argument("--clients", type=int, default=20000, help="distinct client addresses")
+    parser.add_argument("--unknown", type=float, default=0.05, help="share of lookups for rolls that do not exist")
+    parser.add_argument("--duration", type=float, default=10.0)
+    parser.add_argument("--p99-target", type=float, default=25.0, help="ms")
+    args = parser.parse_args()
+
+    if args.url:
+        import httpx
+
+        first, last = args.rolls or (1, args.students)
+        rolls = [str(r) for r in range(first, last + 1)]
+        app = None
+    else:
+        os.environ["DATABASE_URL"] = f"sqlite:///{os.path.join(tempfile.mkdtemp(), 'lookup.db')}"
+        os.environ["ASYNC_DATABASE_URL"] = os.environ["DATABASE_URL"].replace("sqlite:", "sqlite+aiosqlite:", 1)
+        os.environ["PUBLISHED_RESULTS_DIR"] = tempfile.mkdtemp()
+        os.environ["TRUST_FORWARDED_FOR"] = "1"
+        os.environ.setdefault("MARKS_PER_CREDIT_HOUR", "25")
+        sys.path.insert(0, BACKEND_DIR)
+        import main as app_main
+
+        publish_grade(args.students, args.year)
+        rolls = [str(r) for r in range(1, args.students + 1)]
+        app = app_main.app
+
+    # Zipf-like: the first rolls are looked up far more often than the tail
+    weights = [1 / (i + 1) ** 0.8 for i in range(len(rolls))]
+    random.Random(3).shuffle(weights)
+    weights = list(itertools.accumulate(weights))
+    clients = [f"10.{i >> 16 & 255}.{i >> 8 & 255}.{i & 255}" for i in range(args.clients)]
+
+    async def load(client):
+        latencies, codes, abuse = [], {}, {}
+        deadline = time.perf_counter() + args.duration
+        started = time.perf_counter()
+        users = [
+            virtual_user(client, args.year, rolls, weights, clients, args.unknown, deadline,
+                         random.Random(i), latencies, codes)
+            for i in range(args.users)
+        ]
+        users.append(virtual_user(client, args.year, rolls, weights, clients, 0, deadline,
+                                  random.Random(-1), [], abuse, address="192.0.2.1"))
+        await asyncio.gather(*users)
+        return latencies, codes, abuse, time.perf_counter() - started
+
+    async def run():
+        if app is None:
+            limits = httpx.Limits(max_connections=args.users + 1)
+            async with httpx.AsyncClient(base_url=args.url, limits=limits) as client:
+                return await load(client)
+        try:
+            return await load(ASGIClient(app))
+        finally:
+            # pooled aiosqlite connections run on threads that keep the process alive
+            from src.config.database import async_engine
+            await async_engine.dispose()
+
+    latencies, codes, abuse, elapsed = asyncio.run(run())
+    latencies.sort()
+    p50, p95, p99 = (percentile(latencies, q) for q in (50, 95, 99))
+    print(f"{args.users} users x {args.duration:.0f}s, {len(rolls)} rolls, {args.clients} client addresses")
+    print(f"lookups/sec      {len(latencies) / elapsed:10.0f}")
+    print(f"status codes     {dict(sorted(codes.items()))}")
+    print(f"latency ms       p50 {p50:.2f}  p95 {p95:.2f}  p99 {p99:.2f}  max {latencies[-1] if latencies else 0:.2f}")
+    print(f"single abuser    {dict(sorted(abuse.items()))}")
+    if not args.url:
+        from src.routes.published.cache import lookup_cache, lookup_flight, lookup_limiter
+        print(f"hot cache        {lookup_cache.stats()}")
+        print(f"coalescing       {lookup_flight.stats()}")
+        print(f"throttle         {lookup_limiter.stats()}")
+    verdict = "PASS" if p99 <= args.p99_target else "FAIL"
+    print(f"p99 target       {args.p99_target:.1f} ms  {verdict}")
+    sys.exit(0 if verdict == "PASS" else 1)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,124 @@
+"""
+Response encoding: serialization CPU and bytes on the wire.
+
+Builds payloads shaped like the largest responses (a whole grade from
+GET /electives/, a 500-row /students/ page, a 500-row /logs/ page and a
+grade's /subjects/), then reports:
+
+  * render time of Starlette's JSONResponse (json.dumps) vs FastJSONResponse (orjson)
+  * body size uncompressed, gzip (GZIP_LEVEL) and brotli (BROTLI_QUALITY), with
+    the time each compression takes
+
+    python benchmarks/response_encoding_benchmark.py --students 2000
+"""
+import argparse
+import gzip
+import os
+import sys
+import time
+from datetime import datetime, timedelta
+
+BACKEND_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+
+def build_payloads(students):
+    from pydantic import TypeAdapter
+    from src.routes.elective_subject.schema import StudentWithElectiveSub
+    from src.routes.log.schema import AuditLogPage
+    from src.routes.student.schema import StudentPage
+    from src.routes.subject.schema import SubjectResponse
+
+    def jsonable(tp, data):
+        # what FastAPI hands to the response class after response_model serialization
+        return TypeAdapter(tp).dump_python(TypeAdapter(tp).validate_python(data), mode="json")
+
+    electives = [
+        {
+            "id": i, "roll": str(100000 + i), "name": f"Student Name {i}",
+            "elective_subjects": [
+                {"id": 2 * i, "sub_id": 30 + i % 4, "year": "2081"},
+                {"id": 2 * i + 1, "sub_id": 40 + i % 3, "year": "2081"},
+            ],
+        }
+        for i in range(students)
+    ]
+    page = {
+        "items": [
+            {"id": i, "roll": str(100000 + i), "name": f"Student Name {i}", "year": "2081", "grade_id": 7,
+             "is_active": i % 9 != 0}
+            for i in range(500)
+        ],
+        "next_cursor": "WzEsIjEwMDQ5OSIsNDk5XQ", "total": students,
+    }
+    start = datetime(2081, 1, 1, 9, 30)
+    logs = {
+        "items": [
+            {"id": i, "user_id": 2, "action": "UPDATE", "table_name": "students", "record_id": i,
+             "old_data": {"name": f"Student Name {i}"}, "new_data": {"name": f"Student Renamed {i}"},
+             "created_at": start + timedelta(seconds=i)}
+            for i in range(500)
+        ],
+        "next_cursor": "WyIyMDgxLTAxLTAxVDA5OjM4OjE5Iiw1MDBd",
+    }
+    subjects = [
+        {"id": i, "sub_code": f"SUB{i:03d}", "sub_name": f"Subject Title {i}", "Th_ch": 3.75, "Pr_ch": 1.25,
+         "is_elective": i % 5 == 0, "is_active": True, "grade_id": 7}
+        for i in range(40)
+    ]
+    return [
+        (f"/electives/ ({students})", jsonable(list[StudentWithElectiveSub], electives)),
+        ("/students/ page (500)", jsonable(StudentPage, page)),
+        ("/logs/ page (500)", jsonable(AuditLogPage, logs)),
+        ("/subjects/ (40)", jsonable(list[SubjectResponse], subjects)),
+    ]
+
+
+def timed(fn, repeat):
+    fn()
+    start = time.perf_counter()
+    for _ in range(repeat):
+        result = fn()
+    return (time.perf_counter() - start) / repeat * 1000, result
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--students", type=int, default=2000)
+    parser.add_argument("--repeat", type=int, default=20)
+    args = parser.parse_args()
+
+    os.environ.setdefault("DATABASE_URL", "sqlite://")
+    os.environ.setdefault("ASYNC_DATABASE_URL", "sqlite+aiosqlite://")
+    sys.path.insert(0, BACKEND_DIR)
+
+    from starlette.responses import JSONResponse
+    from src.config.settings import settings
+    from src.util.compression import brotli
+    from src.util.responses import FastJSONResponse
+
+    payloads = build_payloads(args.students)
+
+    print("serialization (ms per response)")
+    print(f"  {'endpoint':<26}{'json.dumps':>12}{'orjson':>10}{'speedup':>10}")
+    for label, content in payloads:
+        slow, body = timed(lambda: JSONResponse(content).body, args.repeat)
+        fast, fast_body = timed(lambda: FastJSONResponse(content).body, args.repeat)
+        assert len(body) == len(fast_body), label
+        print(f"  {label:<26}{slow:>12.2f}{fast:>10.2f}{slow / fast:>9.1f}x")
+
+    print("\nbytes on the wire (size, compression ms)")
+    print(f"  {'endpoint':<26}{'identity':>10}{'gzip':>18}{'br':>18}")
+    for label, content in payloads:
+        body = FastJSONResponse(content).body
+        gz_ms, gz = timed(lambda: gzip.compress(body, compresslevel=settings.GZIP_LEVEL), args.repeat)
+        row = f"  {label:<26}{len(body):>10}{len(gz):>10} {gz_ms:>6.2f}ms"
+        if brotli is not None:
+            br_ms, br = timed(lambda: brotli.compress(body, quality=settings.BROTLI_QUALITY), args.repeat)
+            row += f"{len(br):>10} {br_ms:>6.2f}ms"
+        else:
+            row += f"{'(brotli not installed)':>18}"
+        print(row)
+
+
+if __name__ == "__main__":
+    main()
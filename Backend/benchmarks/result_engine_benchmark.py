@@ -0,0 +1,116 @@
+"""
+Result engine throughput for one grade.
+
+Generates a grade of --students students with compulsory and elective subjects
+and random theory/practical marks (as the DB query rows the service loads),
+then times `build_sheet` + `compute` against a straightforward per-student
+Python loop that applies the same scale, and checks both agree on every GPA.
+
+    python benchmarks/result_engine_benchmark.py --students 1000
+"""
+import argparse
+import os
+import random
+import statistics
+import sys
+import time
+
+BACKEND_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+
+def make_grade(students, compulsory, electives, rng):
+    subjects = [(i + 1, 3.0, 1.0, False) for i in range(compulsory)]
+    subjects += [(compulsory + i + 1, 4.0 if i % 2 else 2.0, 0.0 if i % 2 else 2.0, True) for i in range(electives)]
+    elective_ids = [s[0] for s in subjects if s[3]]
+
+    student_ids = list(range(1, students + 1))
+    chosen, marks = [], []
+    for sid in student_ids:
+        taken = rng.sample(elective_ids, 2)
+        chosen += [(sid, sub) for sub in taken]
+        for sub_id, th_ch, pr_ch, is_elective in subjects:
+            if is_elective and sub_id not in taken:
+                continue
+            th = None if rng.random() < 0.002 else round(rng.uniform(0.2, 1.0) * th_ch * 25, 1)
+            pr = round(rng.uniform(0.3, 1.0) * pr_ch * 25, 1) if pr_ch else None
+            marks.append((sid, sub_id, th, pr))
+    return student_ids, subjects, chosen, marks
+
+
+def loop_gpa(student_ids, subjects, chosen, marks):
+    """Reference: one student at a time, the way a Python loop would do it."""
+    from src.routes.result import engine
+
+    def point(om, fm):
+        if om is None:
+            return 0.0, False
+        pct = om / fm * 100
+        scale = sum(pct >= b for b in engine.PERCENT_BOUNDS)
+        return float(engine.GRADE_POINTS[scale]), pct
+
+    by_student = {}
+    for sid, sub_id, th, pr in marks:
+        by_student.setdefault(sid, {})[sub_id] = (th, pr)
+    electives = {}
+    for sid, sub_id in chosen:
+        electives.setdefault(sid, set()).add(sub_id)
+
+    result = {}
+    for sid in student_ids:
+        weighted = credits = 0.0
+        for sub_id, th_ch, pr_ch, is_elective in subjects:
+            if is_elective and sub_id not in electives.get(sid, ()):
+                continue
+            th, pr = by_student.get(sid, {}).get(sub_id, (None, None))
+            for om, ch in ((th, th_ch), (pr, pr_ch)):
+                if ch:
+                    gp, _ = point(om, ch * 25)
+                    weighted += gp * ch
+                    credits += ch
+        result[sid] = round(weighted / credits, 2) if credits else 0.0
+    return result
+
+
+def timed(fn, repeat):
+    times, value = [], None
+    for _ in range(repeat):
+        start = time.perf_counter()
+        value = fn()
+        times.append((time.perf_counter() - start) * 1000)
+    return statistics.median(times), value
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--students", type=int, default=1000)
+    parser.add_argument("--compulsory", type=int, default=6)
+    parser.add_argument("--electives", type=int, default=4)
+    parser.add_argument("--repeat", type=int, default=20)
+    args = parser.parse_args()
+
+    os.environ.setdefault("DATABASE_URL", "sqlite://")
+    os.environ.setdefault("ASYNC_DATABASE_URL", "sqlite+aiosqlite://")
+    os.environ.setdefault("MARKS_PER_CREDIT_HOUR", "25")
+    sys.path.insert(0, BACKEND_DIR)
+    from src.routes.result.engine import build_sheet, compute
+
+    data = make_grade(args.students, args.compulsory, args.electives, random.Random(11))
+    build_ms, sheet = timed(lambda: build_sheet(*data), args.repeat)
+    compute_ms, results = timed(lambda: compute(sheet), args.repeat)
+    loop_ms, reference = timed(lambda: loop_gpa(*data), max(3, args.repeat // 4))
+
+    # the loop rounds half-even, the engine half-up: allow one hundredth
+    mismatches = sum(
+        abs(reference[sid] - gpa) > 0.0101 for sid, gpa in zip(results.student_ids.tolist(), results.gpa.tolist())
+    )
+    cells = sheet.enrolled.sum()
+    print(f"grade: {args.students} students x {len(data[1])} subjects, {cells} enrolled cells, {len(data[3])} mark rows")
+    print(f"build_sheet      {build_ms:8.2f} ms")
+    print(f"compute          {compute_ms:8.2f} ms")
+    print(f"vectorized total {build_ms + compute_ms:8.2f} ms")
+    print(f"python loop      {loop_ms:8.2f} ms   ({loop_ms / (build_ms + compute_ms):.1f}x slower, GPA only)")
+    print(f"GPA mismatches   {mismatches}")
+
+
+if __name__ == "__main__":
+    main()
@@ -1,6 +1,19 @@
+import asyncio
+import logging
+from contextlib import asynccontextmanager
+
 from fastapi import FastAPI
 
-from src.config.database import engine, Base
+from src.config.database import engine, async_engine, Base, get_pools
+from src.config.pool import log_pool_status
+from src.config.settings import settings
+from src.util.invalidation import invalidation_channel
+from src.util.compression import CompressionMiddleware
+from src.util.responses import FastJSONResponse
+from src.routes.auth.hashing import hashing_pool
+from src.routes.marksheet.pool import marksheet_pool
+from src.routes.log.services import audit_writer
+from src.routes.log.archive import archive_periodically
 from src.routes.auth.router import router as auth_router
 from fastapi.middleware.cors import CORSMiddleware
 from src.routes.year.router import router as year_router
@@ -8,16 +21,44 @@ from src.routes.grade.router import router as grade_router
 from src.routes.subject.router import router as subject_router
 from src.routes.student.router import router as student_router
 from src.routes.elective_subject.router import router as elective_router
+from src.routes.monitor.router import router as monitor_router
+from src.routes.log.router import router as log_router
+from src.routes.aamaster.router import router as marks_router
+from src.routes.result.router import router as result_router
+from src.routes.marksheet.router import router as marksheet_router
+from src.routes.export.router import router as export_router
+from src.routes.published.router import router as published_router
 
 
+logging.basicConfig(level=logging.INFO)
 
 Base.metadata.create_all(bind=engine)
 
 
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    await invalidation_channel.start()
+    tasks = []
+    if settings.DB_POOL_LOG_INTERVAL > 0:
+        tasks.append(asyncio.create_task(log_pool_status(get_pools(), settings.DB_POOL_LOG_INTERVAL)))
+    if settings.AUDIT_ARCHIVE_INTERVAL > 0:
+        tasks.append(asyncio.create_task(archive_periodically(settings.AUDIT_ARCHIVE_INTERVAL)))
+    yield
+    for task in tasks:
+        task.cancel()
+    await invalidation_channel.stop()
+    hashing_pool.shutdown()
+    marksheet_pool.shutdown()
+    audit_writer.shutdown()
+    await async_engine.dispose()
+
+
 app = FastAPI(
     title="Authentication Based FastAPI Project",
     description="FastAPI + MySQL with JWT Authentication",
-    version="1.0.0"
+    version="1.0.0",
+    lifespan=lifespan,
+    default_response_class=FastJSONResponse,
 )
 
 
@@ -27,8 +68,23 @@ app.include_router(grade_router)
 app.include_router(subject_router)
 app.include_router(student_router)
 app.include_router(elective_router)
+app.include_router(monitor_router)
+app.include_router(log_router)
+app.include_router(marks_router)
+app.include_router(result_router)
+app.include_router(marksheet_router)
+app.include_router(export_router)
+app.include_router(published_router)
+
 
 
+if settings.COMPRESSION_MIN_SIZE > 0:
+    app.add_middleware(
+        CompressionMiddleware,
+        minimum_size=settings.COMPRESSION_MIN_SIZE,
+        gzip_level=settings.GZIP_LEVEL,
+        brotli_quality=settings.BROTLI_QUALITY,
+    )
 
 app.add_middleware(
     CORSMiddleware,
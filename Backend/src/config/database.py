@@ -1,17 +1,30 @@
 from sqlalchemy import create_engine
+from sqlalchemy.ext.asyncio import create_async_engine, async_sessionmaker, AsyncSession
 from sqlalchemy.orm import sessionmaker, declarative_base
 from src.config.settings import settings
+from src.config.pool import engine_options, pool_status
 
-DATABASE_URL = (
+DATABASE_URL = settings.DATABASE_URL or (
     f"mysql+pymysql://{settings.DB_USER}:"
     f"{settings.DB_PASSWORD}@"
     f"{settings.DB_HOST}/"
     f"{settings.DB_NAME}"
 )
 
-engine = create_engine(DATABASE_URL, echo=True)
+ASYNC_DATABASE_URL = settings.ASYNC_DATABASE_URL or (
+    f"mysql+aiomysql://{settings.DB_USER}:"
+    f"{settings.DB_PASSWORD}@"
+    f"{settings.DB_HOST}/"
+    f"{settings.DB_NAME}"
+)
+
+engine = create_engine(DATABASE_URL, **engine_options(DATABASE_URL))
 SessionLocal = sessionmaker(bind=engine)
 
+# Async engine for read paths, so requests don't each hold a threadpool slot
+async_engine = create_async_engine(ASYNC_DATABASE_URL, **engine_options(ASYNC_DATABASE_URL, is_async=True))
+AsyncSessionLocal = async_sessionmaker(bind=async_engine, expire_on_commit=False)
+
 Base = declarative_base()
 
 def get_db():
@@ -20,3 +33,16 @@ def get_db():
         yield db
     finally:
         db.close()
+
+
+async def get_async_db():
+    async with AsyncSessionLocal() as db:
+        yield db
+
+
+def get_pools():
+    return {"sync": engine.pool, "async": async_engine.pool}
+
+
+def get_pool_stats():
+    return {name: pool_status(pool) for name, pool in get_pools().items()}
@@ -1,8 +1,5 @@
 from fastapi import Depends, HTTPException, status, Request
 from src.routes.auth.dependencies import get_current_user
-from src.routes.grade.service import GradeService
-from src.routes.auth.service import UserService
-from sqlalchemy.orm import Session
 
 def admin_only(user=Depends(get_current_user)):
     if not user.is_admin:
@@ -38,10 +35,9 @@ def user_only(request: Request, user=Depends(get_current_user)):
 
 
 
-def check_user_validation_for_grade(db:Session ,user, grade_id: int):
-        if user.is_admin:
-            if not (UserService.get_admin_selected_grade(db,user.id).id==grade_id):
+def check_user_validation_for_grade(user, grade_id: int):
+        # decided from the token claims alone; grade changes revoke older tokens
+        if user.grade_id != grade_id:
+            if user.is_admin:
                 raise HTTPException(status_code=403, detail="You are not allowed to work for this grade as Admin.")
-        elif not user.is_admin:
-            if GradeService.get_by_id(db, grade_id).grade_teacher_id != user.id:
-                raise HTTPException(status_code=403, detail="You are not allowed to work for this grade.")
\ No newline at end of file
+            raise HTTPException(status_code=403, detail="You are not allowed to work for this grade.")
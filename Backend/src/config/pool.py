@@ -0,0 +1,116 @@
+import asyncio
+import logging
+import threading
+import time
+
+from sqlalchemy import exc
+from sqlalchemy.engine import make_url
+from sqlalchemy.pool import QueuePool, AsyncAdaptedQueuePool
+
+from src.config.settings import settings
+
+logger = logging.getLogger(__name__)
+
+
+class PoolStats:
+    """Checkout counters for one engine's pool, shared across threads."""
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self.checkouts = 0
+        self.timeouts = 0
+        self.wait_total = 0.0
+        self.wait_max = 0.0
+
+    def record(self, waited: float, timed_out: bool = False):
+        with self._lock:
+            if timed_out:
+                self.timeouts += 1
+                return
+            self.checkouts += 1
+            self.wait_total += waited
+            self.wait_max = max(self.wait_max, waited)
+
+    def snapshot(self):
+        with self._lock:
+            return {
+                "checkouts": self.checkouts,
+                "checkout_timeouts": self.timeouts,
+                "wait_avg_ms": round(self.wait_total / self.checkouts * 1000, 3) if self.checkouts else 0.0,
+                "wait_max_ms": round(self.wait_max * 1000, 3),
+            }
+
+
+class _InstrumentedPoolMixin:
+    stats: PoolStats
+
+    def __init__(self, *args, **kwargs):
+        super().__init__(*args, **kwargs)
+        self.stats = PoolStats()
+
+    def connect(self):
+        start = time.perf_counter()
+        try:
+            conn = super().connect()
+        except exc.TimeoutError:
+            self.stats.record(time.perf_counter() - start, timed_out=True)
+            logger.warning("DB pool checkout timed out: %s", self.status())
+            raise
+        self.stats.record(time.perf_counter() - start)
+        return conn
+
+    def recreate(self):
+        # Keep counters when the engine disposes and rebuilds its pool
+        new_pool = super().recreate()
+        new_pool.stats = self.stats
+        return new_pool
+
+
+class InstrumentedQueuePool(_InstrumentedPoolMixin, QueuePool):
+    pass
+
+
+class InstrumentedAsyncQueuePool(_InstrumentedPoolMixin, AsyncAdaptedQueuePool):
+    pass
+
+
+def engine_options(url: str, is_async: bool = False) -> dict:
+    options = {"echo": settings.DB_ECHO}
+
+    # in-memory sqlite uses its own single-connection pool
+    parsed = make_url(url)
+    if parsed.get_backend_name() == "sqlite" and parsed.database in (None, "", ":memory:"):
+        return options
+
+    options.update(
+        poolclass=InstrumentedAsyncQueuePool if is_async else InstrumentedQueuePool,
+        pool_size=settings.DB_POOL_SIZE,
+        max_overflow=settings.DB_MAX_OVERFLOW,
+        pool_timeout=settings.DB_POOL_TIMEOUT,
+        pool_recycle=settings.DB_POOL_RECYCLE,
+        pool_pre_ping=settings.DB_POOL_PRE_PING,
+    )
+    return options
+
+
+def pool_status(pool) -> dict:
+    data = {"pool_class": type(pool).__name__}
+    if isinstance(pool, QueuePool):
+        data.update(
+            size=pool.size(),
+            checked_out=pool.checkedout(),
+            checked_in=pool.checkedin(),
+            overflow=pool.overflow(),
+            max_overflow=pool._max_overflow,
+            timeout=pool.timeout(),
+        )
+    if isinstance(pool, _InstrumentedPoolMixin):
+        data.update(pool.stats.snapshot())
+    return data
+
+
+async def log_pool_status(pools: dict, interval: int):
+    while True:
+        await asyncio.sleep(interval)
+        for name, pool in pools.items():
+            logger.info("DB pool [%s] %s", name, pool_status(pool))
@@ -3,11 +3,117 @@ import os
 
 load_dotenv()
 
+
+def _bool(value: str | None, default: bool = False) -> bool:
+    if value is None:
+        return default
+    return value.strip().lower() in ("1", "true", "yes", "on")
+
+
 class Settings:
     DB_USER = os.getenv("DB_USER")
     DB_PASSWORD = os.getenv("DB_PASSWORD")
     DB_HOST = os.getenv("DB_HOST")
     DB_NAME = os.getenv("DB_NAME")
 
+    # Full URL overrides, e.g. sqlite:///./test.db and
+    # sqlite+aiosqlite:///./test.db as a stand-in for tests
+    DATABASE_URL = os.getenv("DATABASE_URL")
+    ASYNC_DATABASE_URL = os.getenv("ASYNC_DATABASE_URL")
+
+    # Connection pool (applied to both the sync and the async engine)
+    DB_POOL_SIZE = int(os.getenv("DB_POOL_SIZE", "10"))
+    DB_MAX_OVERFLOW = int(os.getenv("DB_MAX_OVERFLOW", "20"))
+    DB_POOL_TIMEOUT = float(os.getenv("DB_POOL_TIMEOUT", "30"))
+    DB_POOL_RECYCLE = int(os.getenv("DB_POOL_RECYCLE", "1800"))
+    DB_POOL_PRE_PING = _bool(os.getenv("DB_POOL_PRE_PING"), True)
+    DB_ECHO = _bool(os.getenv("DB_ECHO"), False)
+    # Seconds between pool stats log lines, 0 disables
+    DB_POOL_LOG_INTERVAL = int(os.getenv("DB_POOL_LOG_INTERVAL", "60"))
+
+    # Cross-worker cache invalidation: "local" (single process) or "db"
+    CACHE_INVALIDATION_BACKEND = os.getenv("CACHE_INVALIDATION_BACKEND", "local")
+    CACHE_INVALIDATION_POLL_INTERVAL = float(os.getenv("CACHE_INVALIDATION_POLL_INTERVAL", "1"))
+    # ids re-read below the newest one seen: rows numbered earlier but committed later still arrive
+    CACHE_INVALIDATION_POLL_OVERLAP = int(os.getenv("CACHE_INVALIDATION_POLL_OVERLAP", "500"))
+
+    # bcrypt executor: worker threads and how many jobs may wait before login fails fast
+    HASH_WORKERS = int(os.getenv("HASH_WORKERS", str(min(4, os.cpu_count() or 1))))
+    HASH_MAX_QUEUE = int(os.getenv("HASH_MAX_QUEUE", "32"))
+
+    # Write-behind audit log; AUDIT_BATCHING=false commits every row inline
+    AUDIT_BATCHING = _bool(os.getenv("AUDIT_BATCHING"), True)
+    AUDIT_BATCH_SIZE = int(os.getenv("AUDIT_BATCH_SIZE", "200"))
+    AUDIT_FLUSH_INTERVAL = float(os.getenv("AUDIT_FLUSH_INTERVAL", "1"))
+    AUDIT_MAX_PENDING = int(os.getenv("AUDIT_MAX_PENDING", "10000"))
+    # failed flushes of the same rows before they are split and the rejected ones dead-lettered
+    AUDIT_MAX_ATTEMPTS = int(os.getenv("AUDIT_MAX_ATTEMPTS", "3"))
+
+    # Audit rows older than AUDIT_RETENTION_DAYS move to monthly gzip files in
+    # AUDIT_ARCHIVE_DIR; AUDIT_ARCHIVE_INTERVAL (hours, 0 = never) runs it in-process
+    AUDIT_RETENTION_DAYS = int(os.getenv("AUDIT_RETENTION_DAYS", "365"))
+    AUDIT_ARCHIVE_DIR = os.getenv("AUDIT_ARCHIVE_DIR", "archive/audit_logs")
+    AUDIT_ARCHIVE_BATCH = int(os.getenv("AUDIT_ARCHIVE_BATCH", "5000"))
+    AUDIT_ARCHIVE_INTERVAL = float(os.getenv("AUDIT_ARCHIVE_INTERVAL", "0"))
+
+    # Rows fetched per server-side cursor batch (and written per chunk) by /exports/
+    EXPORT_BATCH = int(os.getenv("EXPORT_BATCH", "1000"))
+
+    # GradeContext cache (grade row + active elective subjects, keyed by grade id)
+    GRADE_CACHE_SIZE = int(os.getenv("GRADE_CACHE_SIZE", "256"))
+    GRADE_CACHE_TTL = float(os.getenv("GRADE_CACHE_TTL", "600"))
+
+    # Responses of at least COMPRESSION_MIN_SIZE bytes are brotli/gzip compressed (0 = off)
+    COMPRESSION_MIN_SIZE = int(os.getenv("COMPRESSION_MIN_SIZE", "1024"))
+    GZIP_LEVEL = int(os.getenv("GZIP_LEVEL", "6"))
+    BROTLI_QUALITY = int(os.getenv("BROTLI_QUALITY", "4"))
+
+    # List endpoints select bare columns and serialize them straight to JSON bytes
+    LEAN_LIST_RESPONSES = _bool(os.getenv("LEAN_LIST_RESPONSES"), True)
+
+    # Marksheet ZIP downloads: render processes, students per pool task, concurrent downloads
+    MARKSHEET_WORKERS = int(os.getenv("MARKSHEET_WORKERS", str(min(4, os.cpu_count() or 1))))
+    MARKSHEET_CHUNK = int(os.getenv("MARKSHEET_CHUNK", "50"))
+    MARKSHEET_MAX_JOBS = int(os.getenv("MARKSHEET_MAX_JOBS", "2"))
+    MARKSHEET_START_METHOD = os.getenv("MARKSHEET_START_METHOD", "spawn")
+
+    # Full marks of a theory/practical component per credit hour (Th_ch / Pr_ch)
+    MARKS_PER_CREDIT_HOUR = float(os.getenv("MARKS_PER_CREDIT_HOUR", "25"))
+
+    # Public result lookup: hot cache of answers, per-IP token bucket, browser/CDN max-age
+    PUBLIC_LOOKUP_CACHE_SIZE = int(os.getenv("PUBLIC_LOOKUP_CACHE_SIZE", "50000"))
+    PUBLIC_LOOKUP_CACHE_TTL = float(os.getenv("PUBLIC_LOOKUP_CACHE_TTL", "600"))
+    PUBLIC_LOOKUP_RATE = float(os.getenv("PUBLIC_LOOKUP_RATE", "2"))
+    PUBLIC_LOOKUP_BURST = int(os.getenv("PUBLIC_LOOKUP_BURST", "10"))
+    PUBLIC_RESULT_MAX_AGE = int(os.getenv("PUBLIC_RESULT_MAX_AGE", "60"))
+    # Take the client address from the last X-Forwarded-For entry (only behind a proxy that sets it)
+    TRUST_FORWARDED_FOR = _bool(os.getenv("TRUST_FORWARDED_FOR"), False)
+
+    # Published result snapshots (see src/routes/published/store.py) and the open-snapshot cache
+    PUBLISHED_RESULTS_DIR = os.getenv("PUBLISHED_RESULTS_DIR", "published_results")
+    PUBLISHED_CACHE_SIZE = int(os.getenv("PUBLISHED_CACHE_SIZE", "256"))
+    PUBLISHED_CACHE_TTL = float(os.getenv("PUBLISHED_CACHE_TTL", "3600"))
+
+    # Refresh result_ranks with RANK() OVER (...) where the database supports it
+    RANKING_WINDOW_FUNCTIONS = _bool(os.getenv("RANKING_WINDOW_FUNCTIONS"), True)
+
+    # Computed results: grade/year summaries (patched per student on writes) and per-student details
+    RESULT_CACHE_SIZE = int(os.getenv("RESULT_CACHE_SIZE", "64"))
+    STUDENT_RESULT_CACHE_SIZE = int(os.getenv("STUDENT_RESULT_CACHE_SIZE", "4096"))
+    RESULT_CACHE_TTL = float(os.getenv("RESULT_CACHE_TTL", "1800"))
+
+    # Rows validated and inserted per transaction by POST /students/import
+    STUDENT_IMPORT_BATCH = int(os.getenv("STUDENT_IMPORT_BATCH", "500"))
+
+    # Cached per-table versions behind the ETags of reference-data GETs
+    TABLE_VERSION_TTL = float(os.getenv("TABLE_VERSION_TTL", "60"))
+
+    # Current academic year cache; TTL is only a safety net behind invalidation
+    YEAR_CACHE_TTL = float(os.getenv("YEAR_CACHE_TTL", "3600"))
+
+    # Authenticated-user cache used by get_current_user
+    USER_CACHE_SIZE = int(os.getenv("USER_CACHE_SIZE", "2048"))
+    USER_CACHE_TTL = float(os.getenv("USER_CACHE_TTL", "300"))
+
 settings = Settings()
 
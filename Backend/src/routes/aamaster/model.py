@@ -0,0 +1,28 @@
+from sqlalchemy import Column, Integer, String, Numeric, ForeignKey, DateTime, UniqueConstraint, Index
+from sqlalchemy.sql import func
+
+from src.config.database import Base
+
+
+class Mark(Base):
+    """Obtained theory/practical marks of one student in one subject for one academic year."""
+    __tablename__ = "marks"
+
+    id = Column(Integer, primary_key=True, index=True)
+
+    student_id = Column(Integer, ForeignKey("students.id"), nullable=False)
+    subject_id = Column(Integer, ForeignKey("subjects.id"), nullable=False)
+    year = Column(String(10), nullable=False)
+
+    # NULL = not entered yet
+    th_om = Column(Numeric(5, 2), nullable=True)
+    pr_om = Column(Numeric(5, 2), nullable=True)
+
+    updated_by = Column(Integer, nullable=False)
+    updated_at = Column(DateTime(timezone=True), server_default=func.now(), nullable=False)
+
+    __table_args__ = (
+        # the upsert key of the grid endpoint
+        UniqueConstraint("student_id", "subject_id", "year", name="uq_marks_student_subject_year"),
+        Index("ix_marks_year_subject", "year", "subject_id"),
+    )
@@ -0,0 +1,34 @@
+from fastapi import APIRouter, Depends
+from sqlalchemy.orm import Session
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from src.config.database import get_db, get_async_db
+from src.config.dependencies import user_only
+from src.routes.auth.dependencies import get_current_user
+from src.routes.auth.model import User
+from src.routes.grade.dependencies import get_grade_context
+from src.routes.grade.schema import GradeContext
+
+from .schema import MarkSheetIn, MarkSheetResult, MarkSheetOut
+from .service import MarkService
+
+router = APIRouter(prefix="/marks", tags=["Marks"])
+
+
+@router.get("/grid", response_model=MarkSheetOut, dependencies=[Depends(user_only)])
+async def get_mark_sheet(
+    year: str | None = None,
+    db: AsyncSession = Depends(get_async_db),
+    grade: GradeContext = Depends(get_grade_context),
+):
+    return await MarkService.get_sheet(db, grade, year)
+
+
+@router.put("/grid", response_model=MarkSheetResult, dependencies=[Depends(user_only)])
+def upsert_mark_sheet(
+    data: MarkSheetIn,
+    db: Session = Depends(get_db),
+    current_user: User = Depends(get_current_user),
+    grade: GradeContext = Depends(get_grade_context),
+):
+    return MarkService.upsert_sheet(db, data, current_user, grade)
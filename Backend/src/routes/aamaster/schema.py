@@ -0,0 +1,53 @@
+from pydantic import BaseModel, Field
+
+
+class MarkCell(BaseModel):
+    th_om: float | None = Field(None, ge=0)
+    pr_om: float | None = Field(None, ge=0)
+
+
+class MarkSheetRow(BaseModel):
+    student_id: int
+    # subject id -> marks; subjects left out of a row are not touched
+    marks: dict[int, MarkCell]
+
+
+class MarkSheetIn(BaseModel):
+    year: str | None = None
+    rows: list[MarkSheetRow]
+
+
+class MarkRejected(BaseModel):
+    student_id: int
+    subject_id: int
+    reason: str
+
+
+class MarkSheetResult(BaseModel):
+    year: str
+    upserted: int
+    rejected: list[MarkRejected]
+
+
+class MarkSheetSubject(BaseModel):
+    id: int
+    sub_code: str
+    sub_name: str
+    Th_ch: float
+    Pr_ch: float
+    is_elective: bool
+    th_fm: float
+    pr_fm: float
+
+
+class MarkSheetStudent(BaseModel):
+    student_id: int
+    roll: str
+    name: str
+    marks: dict[int, MarkCell]
+
+
+class MarkSheetOut(BaseModel):
+    year: str
+    subjects: list[MarkSheetSubject]
+    rows: list[MarkSheetStudent]
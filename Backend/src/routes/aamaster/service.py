@@ -0,0 +1,232 @@
+from datetime import datetime, timezone
+
+from sqlalchemy import select, tuple_
+from sqlalchemy.orm import Session
+from sqlalchemy.ext.asyncio import AsyncSession
+from fastapi import HTTPException
+
+from .model import Mark
+from .schema import MarkSheetIn
+from src.config.settings import settings
+from src.routes.log.services import log_action, log_records
+from src.routes.grade.schema import GradeContext
+from src.routes.result.cache import bump_results, invalidate_results
+from src.routes.student.model import Student
+from src.routes.subject.model import Subject
+from src.routes.elective_subject.model import ElectiveSub
+from src.routes.year.model import Year
+from src.routes.year.service import YearService
+
+UPSERT_CHUNK = 1000
+
+
+def full_marks(credit_hours) -> float:
+    """Full marks of a theory/practical component: MARKS_PER_CREDIT_HOUR per credit hour."""
+    return float(credit_hours or 0) * settings.MARKS_PER_CREDIT_HOUR
+
+
+def upsert_marks_statement(db: Session, rows: list[dict], components=("th_om", "pr_om")):
+    """
+    One multi-row INSERT that overwrites existing (student, subject, year) rows:
+    ON DUPLICATE KEY UPDATE on MySQL, ON CONFLICT DO UPDATE on SQLite/PostgreSQL.
+    Only `components` (and updated_by/at) are overwritten on existing rows, so a
+    cell that sends just th_om keeps the stored pr_om.
+    """
+    dialect = db.get_bind().dialect.name
+    columns = (*components, "updated_by", "updated_at")
+    if dialect == "mysql":
+        from sqlalchemy.dialects.mysql import insert
+
+        stmt = insert(Mark).values(rows)
+        return stmt.on_duplicate_key_update({c: stmt.inserted[c] for c in columns})
+    if dialect in ("sqlite", "postgresql"):
+        from sqlalchemy.dialects.sqlite import insert as sqlite_insert
+        from sqlalchemy.dialects.postgresql import insert as pg_insert
+
+        stmt = (sqlite_insert if dialect == "sqlite" else pg_insert)(Mark).values(rows)
+        return stmt.on_conflict_do_update(
+            index_elements=["student_id", "subject_id", "year"],
+            set_={c: stmt.excluded[c] for c in columns},
+        )
+    raise RuntimeError(f"Marks upsert is not supported on {dialect}; use MySQL/MariaDB, SQLite or PostgreSQL")
+
+
+class MarkService:
+
+    @staticmethod
+    def _resolve_year(db: Session, year: str | None) -> str:
+        if year is None:
+            current = YearService.get_current_sync(db)
+            if not current:
+                raise HTTPException(status_code=400, detail="No current year is set")
+            return current.year
+        if not db.query(Year.id).filter(Year.year == year).first():
+            raise HTTPException(status_code=404, detail="Year not found")
+        return year
+
+    # ---------------- GRID UPSERT ----------------
+    @staticmethod
+    def upsert_sheet(db: Session, data: MarkSheetIn, user, grade: GradeContext):
+        """
+        Save a whole grade x subject mark sheet.
+
+        Two queries load the grade's subjects and its active students with their
+        electives; every cell is checked against them in memory and the accepted
+        cells are written with one upsert statement per UPSERT_CHUNK rows (and per
+        set of components sent), in a single transaction. A cell only overwrites
+        the components it sends. Cells that fail a check are returned, not saved.
+        """
+        year = MarkService._resolve_year(db, data.year)
+
+        subjects = {
+            sub_id: (full_marks(th_ch), full_marks(pr_ch), is_elective)
+            for sub_id, th_ch, pr_ch, is_elective in db.execute(
+                select(Subject.id, Subject.Th_ch, Subject.Pr_ch, Subject.is_elective)
+                .where(Subject.grade_id == grade.id, Subject.is_active == True)
+            )
+        }
+        student_ids = {row.student_id for row in data.rows}
+        electives = {}
+        for student_id, sub_id in db.execute(
+            select(Student.id, ElectiveSub.sub_id)
+            .outerjoin(ElectiveSub, (Student.id == ElectiveSub.student_id) & (ElectiveSub.year == year))
+            .where(Student.id.in_(student_ids), Student.grade_id == grade.id, Student.is_active == True)
+        ):
+            taken = electives.setdefault(student_id, set())
+            if sub_id is not None:
+                taken.add(sub_id)
+
+        now = datetime.now(timezone.utc)
+        accepted, rejected = {}, []
+        for row in data.rows:
+            taken = electives.get(row.student_id)
+            for sub_id, cell in row.marks.items():
+                subject = subjects.get(sub_id)
+                if taken is None:
+                    reason = "Student is not an active student of this grade"
+                elif subject is None:
+                    reason = "Subject is not an active subject of this grade"
+                elif subject[2] and sub_id not in taken:
+                    reason = "Elective subject is not assigned to the student"
+                elif not cell.model_fields_set:
+                    reason = "Cell has neither th_om nor pr_om"
+                elif cell.th_om is not None and cell.th_om > subject[0]:
+                    reason = f"Theory marks exceed full marks {subject[0]:g}"
+                elif cell.pr_om is not None and cell.pr_om > subject[1]:
+                    reason = f"Practical marks exceed full marks {subject[1]:g}"
+                else:
+                    # only the components the cell sends are written; a repeated cell in the
+                    # same sheet overrides the components it sends
+                    entry = accepted.setdefault((row.student_id, sub_id), ({
+                        "student_id": row.student_id, "subject_id": sub_id, "year": year,
+                        "th_om": None, "pr_om": None, "updated_by": user.id, "updated_at": now,
+                    }, set()))
+                    for component in cell.model_fields_set:
+                        entry[0][component] = getattr(cell, component)
+                    entry[1].update(cell.model_fields_set)
+                    continue
+                rejected.append({"student_id": row.student_id, "subject_id": sub_id, "reason": reason})
+
+        # one upsert per set of sent components, UPSERT_CHUNK rows at a time
+        groups = {}
+        for values, components in accepted.values():
+            groups.setdefault(tuple(sorted(components, reverse=True)), []).append(values)
+        rows = [values for values, _ in accepted.values()]
+        if rows:
+            for components, group in groups.items():
+                for offset in range(0, len(group), UPSERT_CHUNK):
+                    chunk = group[offset:offset + UPSERT_CHUNK]
+                    keys = tuple_(Mark.student_id, Mark.subject_id).in_(
+                        [(r["student_id"], r["subject_id"]) for r in chunk]
+                    )
+                    before = {
+                        (student_id, subject_id): {"th_om": th_om, "pr_om": pr_om}
+                        for student_id, subject_id, th_om, pr_om in db.execute(
+                            select(Mark.student_id, Mark.subject_id, Mark.th_om, Mark.pr_om)
+                            .where(Mark.year == year, keys)
+                        )
+                    }
+                    db.execute(upsert_marks_statement(db, chunk, components))
+                    MarkService._log_cells(db, user, year, chunk, components, before, keys)
+            log_action(
+                db=db,
+                user_id=user.id,
+                action="GRID_UPSERT",
+                table_name="marks",
+                record_id=0,
+                new_data={
+                    "grade_id": grade.id,
+                    "year": year,
+                    "count": len(rows),
+                    "students": sorted({r["student_id"] for r in rows}),
+                    "subjects": sorted({r["subject_id"] for r in rows}),
+                },
+                strict=True,
+            )
+            bump_results(db, grade.id, year)
+            db.commit()
+            invalidate_results(grade.id, year, {r["student_id"] for r in rows})
+
+        return {"year": year, "upserted": len(rows), "rejected": rejected}
+
+    @staticmethod
+    def _log_cells(db: Session, user, year: str, chunk: list[dict], components, before: dict, keys):
+        """Per-mark audit rows for an upserted chunk: CREATE for new cells, UPDATE with the diff otherwise."""
+        written = {(r["student_id"], r["subject_id"]): r for r in chunk}
+        created, updated = [], []
+        for mark_id, student_id, subject_id in db.execute(
+            select(Mark.id, Mark.student_id, Mark.subject_id).where(Mark.year == year, keys)
+        ):
+            key = (student_id, subject_id)
+            row = written[key]
+            if key in before:
+                updated.append((mark_id, before[key], {c: row[c] for c in components}))
+            else:
+                created.append((mark_id, None, {"student_id": student_id, "subject_id": subject_id, "year": year,
+                                                "th_om": row["th_om"], "pr_om": row["pr_om"]}))
+        log_records(db, user_id=user.id, action="CREATE", table_name="marks", records=created)
+        log_records(db, user_id=user.id, action="UPDATE", table_name="marks", records=updated)
+
+    # ---------------- GRID READ ----------------
+    @staticmethod
+    async def get_sheet(db: AsyncSession, grade: GradeContext, year: str | None):
+        if year is None:
+            current = await YearService.get_current(db)
+            if not current:
+                raise HTTPException(status_code=400, detail="No current year is set")
+            year = current.year
+
+        subjects = (
+            await db.execute(
+                select(Subject.id, Subject.sub_code, Subject.sub_name, Subject.Th_ch, Subject.Pr_ch, Subject.is_elective)
+                .where(Subject.grade_id == grade.id, Subject.is_active == True)
+                .order_by(Subject.is_elective, Subject.id)
+            )
+        ).all()
+        students = (
+            await db.execute(
+                select(Student.id, Student.roll, Student.name)
+                .where(Student.grade_id == grade.id, Student.is_active == True)
+                .order_by(Student.roll, Student.id)
+            )
+        ).all()
+        marks = (
+            await db.execute(
+                select(Mark.student_id, Mark.subject_id, Mark.th_om, Mark.pr_om)
+                .join(Student, Student.id == Mark.student_id)
+                .where(Student.grade_id == grade.id, Mark.year == year)
+            )
+        ).all()
+
+        sheet = {s.id: {"student_id": s.id, "roll": s.roll, "name": s.name, "marks": {}} for s in students}
+        for student_id, subject_id, th_om, pr_om in marks:
+            if student_id in sheet:
+                sheet[student_id]["marks"][subject_id] = {"th_om": th_om, "pr_om": pr_om}
+
+        return {
+            "year": year,
+            "subjects": [
+                {**s._asdict(), "th_fm": full_marks(s.Th_ch), "pr_fm": full_marks(s.Pr_ch)} for s in subjects
+            ],
+            "rows": list(sheet.values()),
+        }
@@ -1,28 +1,71 @@
 from fastapi import Depends, HTTPException, status
 from fastapi.security import OAuth2PasswordBearer
 from jose import jwt, JWTError
-from sqlalchemy.orm import Session
+from sqlalchemy import select
+from sqlalchemy.ext.asyncio import AsyncSession
 
 from src.config.security import SECRET_KEY, ALGORITHM
-from src.config.database import get_db
+from src.config.database import get_async_db
+from src.config.settings import settings
 from src.routes.auth.model import User
+from src.routes.auth.schema import CurrentUser
+from src.util.cache import TTLCache
+from src.util.invalidation import invalidation_channel
 
 oauth2_scheme = OAuth2PasswordBearer(tokenUrl="/auth/login")
 
-def get_current_user(
+# user id -> current token_version, so revoked tokens are rejected without a query
+token_versions = TTLCache(maxsize=settings.USER_CACHE_SIZE, ttl=settings.USER_CACHE_TTL)
+
+
+def _on_user_invalidated(user_id):
+    if user_id is None:
+        token_versions.clear()
+    else:
+        token_versions.pop(int(user_id))
+
+
+invalidation_channel.subscribe("users", _on_user_invalidated)
+
+
+def invalidate_user(*user_ids: int):
+    """Drop cached token versions in this and every other worker. Call after commit."""
+    for user_id in dict.fromkeys(user_ids):
+        if user_id is not None:
+            invalidation_channel.publish("users", user_id)
+
+
+async def get_token_version(db: AsyncSession, user_id: int):
+    version = token_versions.get(user_id)
+    if version is None:
+        generation = token_versions.generation
+        version = (await db.execute(select(User.token_version).where(User.id == user_id))).scalar()
+        if version is None:
+            return None
+        token_versions.set(user_id, version, generation)
+    return version
+
+
+async def get_current_user(
     token: str = Depends(oauth2_scheme),
-    db: Session = Depends(get_db)
+    db: AsyncSession = Depends(get_async_db)
 ):
     try:
         payload = jwt.decode(token, SECRET_KEY, algorithms=[ALGORITHM])
-        username = payload.get("sub")
-        if username is None:
-            raise HTTPException(status_code=401, detail="Invalid token")
-    except JWTError:
+        user = CurrentUser(
+            id=payload["uid"],
+            username=payload["sub"],
+            is_admin=payload["role"] == "admin",
+            grade_id=payload.get("grade_id"),
+            token_version=payload["ver"],
+        )
+    except (JWTError, KeyError, ValueError):
         raise HTTPException(status_code=401, detail="Invalid token")
 
-    user = db.query(User).filter(User.username == username).first()
-    if not user:
+    version = await get_token_version(db, user.id)
+    if version is None:
         raise HTTPException(status_code=401, detail="User not found")
+    if version != user.token_version:
+        raise HTTPException(status_code=401, detail="Token has been revoked, please log in again")
 
     return user
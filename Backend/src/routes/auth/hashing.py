@@ -0,0 +1,64 @@
+import asyncio
+import threading
+from concurrent.futures import ThreadPoolExecutor
+
+from fastapi import HTTPException
+
+from src.config.settings import settings
+
+
+class HashingPool:
+    """
+    Dedicated, bounded executor for bcrypt. bcrypt releases the GIL, so a few
+    threads keep the cores busy without occupying Starlette's request threadpool.
+    Once `workers + max_queue` jobs are pending, new jobs are rejected straight
+    away instead of piling up behind a login burst.
+    """
+
+    def __init__(self, workers: int, max_queue: int):
+        self.workers = workers
+        self.max_queue = max_queue
+        self._executor = ThreadPoolExecutor(max_workers=workers, thread_name_prefix="bcrypt")
+        self._lock = threading.Lock()
+        self.pending = 0
+        self.completed = 0
+        self.rejected = 0
+
+    def _acquire(self):
+        with self._lock:
+            if self.pending >= self.workers + self.max_queue:
+                self.rejected += 1
+                raise HTTPException(
+                    status_code=503,
+                    detail="Too many logins in progress, please retry shortly",
+                    headers={"Retry-After": "1"},
+                )
+            self.pending += 1
+
+    def _release(self):
+        with self._lock:
+            self.pending -= 1
+            self.completed += 1
+
+    async def run(self, fn, *args):
+        self._acquire()
+        try:
+            return await asyncio.get_running_loop().run_in_executor(self._executor, fn, *args)
+        finally:
+            self._release()
+
+    def stats(self):
+        return {
+            "workers": self.workers,
+            "max_queue": self.max_queue,
+            "in_flight": min(self.pending, self.workers),
+            "queued": max(self.pending - self.workers, 0),
+            "completed": self.completed,
+            "rejected": self.rejected,
+        }
+
+    def shutdown(self):
+        self._executor.shutdown(wait=False, cancel_futures=True)
+
+
+hashing_pool = HashingPool(settings.HASH_WORKERS, settings.HASH_MAX_QUEUE)
@@ -10,6 +10,8 @@ class User(Base):
     password = Column(String(255), nullable=False) 
     grade_code = Column(String(20), nullable=True)
     is_admin = Column(Boolean, default=False, nullable=False)
+    # bumped to revoke every token issued before a password/role/grade change
+    token_version = Column(Integer, default=0, server_default="0", nullable=False)
 
     grade = relationship(
         "Grade",
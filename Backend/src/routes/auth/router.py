@@ -1,8 +1,9 @@
 from fastapi import APIRouter, Depends, HTTPException
 from fastapi.security import OAuth2PasswordRequestForm
 from sqlalchemy.orm import Session
+from sqlalchemy.ext.asyncio import AsyncSession
 
-from src.config.database import get_db
+from src.config.database import get_db, get_async_db
 from src.routes.auth import schema
 from src.routes.auth.model import User
 from src.routes.auth.schema import UserRegister
@@ -10,26 +11,28 @@ from src.config.dependencies import admin_only,read_only_or_admin
 from src.routes.auth.dependencies import get_current_user
 from src.routes.auth.service import UserService
 from src.routes.grade.schema import GradeBase
+from src.config.settings import settings
+from src.util.projection import lean_response
 
 
 router = APIRouter(prefix="/auth", tags=["Authentication"])
 
 # -------- Register --------
 @router.post("/register", dependencies=[Depends(admin_only)])
-def register(user: schema.UserRegister, db: Session = Depends(get_db), current_user:User= Depends(get_current_user)):
-    return UserService.user_register(db, current_user, user)
+async def register(user: schema.UserRegister, db: Session = Depends(get_db), current_user:User= Depends(get_current_user)):
+    return await UserService.user_register(db, current_user, user)
 
 # -------- Login --------
 @router.post("/login", response_model=schema.Token)
-def login(
+async def login(
     form_data: OAuth2PasswordRequestForm = Depends(),
-    db: Session = Depends(get_db)
+    db: AsyncSession = Depends(get_async_db)
 ):
-    user = UserService.authenticate_user(db, form_data.username, form_data.password)
+    user = await UserService.authenticate_user(db, form_data.username, form_data.password)
     if not user:
         raise HTTPException(status_code=401, detail="Invalid username or password")
 
-    token = UserService.create_access_token(user)
+    token = UserService.create_access_token(user, await UserService.get_working_grade_id(db, user))
     return {
         "access_token": token,
         "token_type": "bearer"
@@ -39,30 +42,30 @@ def login(
 def all_users(
     db: Session = Depends(get_db)
 ):
-    users = UserService.get_all(db)
+    users = UserService.get_all(db, lean=settings.LEAN_LIST_RESPONSES)
     if not users:
         raise HTTPException(status_code=404, detail="User not found")
-    return users
+    return lean_response(list[schema.UserMini], users) if settings.LEAN_LIST_RESPONSES else users
 
 @router.post("/change-password", dependencies=[Depends(read_only_or_admin)])
-def change_password_endpoint(
+async def change_password_endpoint(
     current_user:User= Depends(get_current_user),
     old_password: str = None,
     new_password: str=  None,
     db: Session = Depends(get_db)
 ):
-    result = UserServicechange_password(db, current_user.id, old_password, new_password)
+    result = await UserService.change_password(db, current_user.id, old_password, new_password)
     if "error" in result:
         raise HTTPException(status_code=400, detail=result["error"])
     return result
 
 @router.post("/reset-password", dependencies=[Depends(admin_only)])
-def reset_user_password_endpoint(
+async def reset_user_password_endpoint(
     data:schema.PasswordReset,
     current_user:User= Depends(get_current_user),
     db: Session = Depends(get_db)
 ):
-    result = UserService.reset_password(db, current_user.id, data.user_id, data.new_password)
+    result = await UserService.reset_password(db, current_user.id, data.user_id, data.new_password)
    
     if "error" in result:
         raise HTTPException(status_code=400, detail=result["error"])
@@ -1,4 +1,4 @@
-from pydantic import BaseModel
+from pydantic import BaseModel, ConfigDict
 
 class UserRegister(BaseModel):
     username: str
@@ -28,3 +28,14 @@ class UserMini(BaseModel):
 class PasswordReset(BaseModel):
     user_id: int
     new_password: str
+
+
+class CurrentUser(BaseModel):
+    """Authenticated user, built from the access token claims alone."""
+    id: int
+    username: str
+    is_admin: bool
+    grade_id: int | None = None
+    token_version: int
+
+    model_config = ConfigDict(from_attributes=True, frozen=True)
@@ -1,14 +1,19 @@
+from sqlalchemy import select, update
 from sqlalchemy.orm import Session
+from sqlalchemy.ext.asyncio import AsyncSession
 from passlib.context import CryptContext
 from jose import jwt
 from datetime import datetime, timedelta
 from fastapi import HTTPException, Depends
+from starlette.concurrency import run_in_threadpool
 from src.routes.auth.model import User
 from src.routes.grade.model import Grade
 from src.routes.auth import schema
 from src.config.security import SECRET_KEY, ALGORITHM, ACCESS_TOKEN_EXPIRE_MINUTES
 from src.routes.log.services import log_action
-from .dependencies import get_current_user
+from .dependencies import get_current_user, invalidate_user
+from .hashing import hashing_pool
+from src.util.projection import as_dicts
 
 
 pwd_context = CryptContext(schemes=["bcrypt"], deprecated="auto")
@@ -17,33 +22,81 @@ pwd_context = CryptContext(schemes=["bcrypt"], deprecated="auto")
 class UserService:
 
     # ---------- Password ----------
+    # bcrypt runs on hashing_pool and is awaited, so no request thread waits on it;
+    # the password endpoints run their Session work around it in the threadpool
     @staticmethod
-    def hash_password(password: str):
-        return pwd_context.hash(password)
+    async def hash_password(password: str):
+        return await hashing_pool.run(pwd_context.hash, password)
 
     @staticmethod
-    def verify_password(plain_password, hashed_password):
-        return pwd_context.verify(plain_password, hashed_password)
+    async def verify_password(plain_password, hashed_password):
+        return await hashing_pool.run(pwd_context.verify, plain_password, hashed_password)
 
     # ---------- Auth ----------
     @staticmethod
-    def authenticate_user(db: Session, username: str, password: str):
-        user = db.query(User).filter(User.username == username).first()
-        if not user or not UserService.verify_password(password, user.password):
+    async def authenticate_user(db: AsyncSession, username: str, password: str):
+        user = (await db.execute(select(User).where(User.username == username))).scalars().first()
+        # hand the connection back to the pool while bcrypt runs
+        await db.close()
+        if not user or not await UserService.verify_password(password, user.password):
             return None
         return user
 
     # ---------- JWT ----------
     @staticmethod
-    def create_access_token(user: User):
+    async def get_working_grade_id(db: AsyncSession, user: User):
+        # admins work on the grade they selected, teachers on the grade they lead
+        if user.is_admin:
+            # older rows may hold free text; such an admin simply has no grade selected yet
+            code = user.grade_code
+            return int(code) if code and code.isdigit() else None
+        return (
+            await db.execute(select(Grade.id).where(Grade.grade_teacher_id == user.id))
+        ).scalar()
+
+    @staticmethod
+    def create_access_token(user: User, grade_id: int | None):
         expire = datetime.utcnow() + timedelta(minutes=ACCESS_TOKEN_EXPIRE_MINUTES)
         payload = {
             "sub": user.username,
+            "uid": user.id,
             "is_admin": user.is_admin,
+            "role": "admin" if user.is_admin else "teacher",
+            "grade_id": grade_id,
+            "ver": user.token_version,
             "exp": expire,
         }
         return jwt.encode(payload, SECRET_KEY, algorithm=ALGORITHM)
 
+    @staticmethod
+    def revoke_tokens(db: Session, *user_ids: int):
+        """Bump token_version so older tokens fail; commit, then invalidate_user(*user_ids)."""
+        user_ids = [user_id for user_id in user_ids if user_id is not None]
+        if user_ids:
+            db.execute(
+                update(User)
+                .where(User.id.in_(user_ids))
+                .values(token_version=User.token_version + 1)
+                .execution_options(synchronize_session="fetch")
+            )
+
+    @staticmethod
+    def resolve_grade_code(db: Session, value: str | None):
+        """
+        `grade_code` is stored as a grade id. Accepts the id or the grade's code
+        (e.g. "10A") and returns the id as a string; unknown values are rejected.
+        """
+        if value is None or not value.strip():
+            return None
+        value = value.strip()
+        condition = Grade.code == value
+        if value.isdigit():
+            condition = (Grade.id == int(value)) | condition
+        grade_id = db.execute(select(Grade.id).where(condition).order_by(Grade.id)).scalars().first()
+        if grade_id is None:
+            raise HTTPException(status_code=400, detail=f"Grade '{value}' not found")
+        return str(grade_id)
+
     # ---------- Grade Teachers ----------
     @staticmethod
     def get_available_grade_teachers(db: Session):
@@ -63,7 +116,14 @@ class UserService:
 
     # ---------- Users ----------
     @staticmethod
-    def get_all(db: Session):
+    def get_all(db: Session, lean: bool = False):
+        if lean:
+            return as_dicts(
+                db.execute(
+                    select(User.id, User.username, User.grade_code, User.is_admin)
+                    .order_by(User.is_admin.desc(), User.username)
+                )
+            )
         return (
             db.query(User.id, User.username, User.grade_code, User.is_admin)
             #.order_by(User.username)
@@ -74,41 +134,61 @@ class UserService:
 
     # ---------- Change Own Password ----------
     @staticmethod
-    def change_password(
+    async def change_password(
         db: Session,
         user_id: int,
         old_password: str,
         new_password: str
     ):
-        user = db.query(User).filter(User.id == user_id).first()
-        if not user:
+        stored = await run_in_threadpool(
+            lambda: db.query(User.password).filter(User.id == user_id).scalar()
+        )
+        if stored is None:
             raise HTTPException(status_code=404, detail="User not found")
 
-        if not UserService.verify_password(old_password, user.password):
+        if not await UserService.verify_password(old_password, stored):
             raise HTTPException(status_code=400, detail="Incorrect old password")
 
-        user.password = UserService.hash_password(new_password)
+        hashed = await UserService.hash_password(new_password)
+        return await run_in_threadpool(UserService._store_own_password, db, user_id, hashed)
 
-        db.commit()
+    @staticmethod
+    def _store_own_password(db: Session, user_id: int, hashed: str):
+        user = db.query(User).filter(User.id == user_id).first()
+        if not user:
+            raise HTTPException(status_code=404, detail="User not found")
 
+        user.password = hashed
+        UserService.revoke_tokens(db, user.id)
+
+        # security events are audited in the same transaction
         log_action(
             db=db,
             user_id=user_id,
             action="PASSWORD_CHANGE",
             table_name="users",
             record_id=user.id,
+            strict=True,
         )
 
+        db.commit()
+        invalidate_user(user.id)
+
         return {"success": True, "message": "Password changed successfully"}
 
     # ---------- Reset Password (Admin) ----------
     @staticmethod
-    def reset_password(
+    async def reset_password(
         db: Session,
         admin_id: int,
         target_user_id: int,
         new_password: str
     ):
+        hashed = await UserService.hash_password(new_password)
+        return await run_in_threadpool(UserService._store_reset_password, db, admin_id, target_user_id, hashed)
+
+    @staticmethod
+    def _store_reset_password(db: Session, admin_id: int, target_user_id: int, hashed: str):
         print( "target_user_id:", target_user_id)
         target_user = db.query(User).filter(User.id == target_user_id).first()
         if not target_user:
@@ -122,8 +202,8 @@ class UserService:
 
         old_data = {"username": target_user.username}
 
-        target_user.password = UserService.hash_password(new_password)
-        db.commit()
+        target_user.password = hashed
+        UserService.revoke_tokens(db, target_user.id)
 
         log_action(
             db=db,
@@ -132,8 +212,12 @@ class UserService:
             table_name="users",
             record_id=target_user.id,
             old_data=old_data,
+            strict=True,
         )
 
+        db.commit()
+        invalidate_user(target_user.id)
+
         return {
             "success": True,
             "message": f"Password for user '{target_user.username}' reset successfully",
@@ -167,11 +251,11 @@ class UserService:
             "is_admin": user.is_admin,
         }
 
-        for key, value in data.dict().items():
+        values = data.dict()
+        values["grade_code"] = UserService.resolve_grade_code(db, data.grade_code)
+        for key, value in values.items():
             setattr(user, key, value)
-
-        db.commit()
-        db.refresh(user)
+        UserService.revoke_tokens(db, user.id)
 
         log_action(
             db=db,
@@ -180,9 +264,14 @@ class UserService:
             table_name="users",
             record_id=user.id,
             old_data=old_data,
-            new_data=data.dict(),
+            new_data=values,
+            strict=True,
         )
 
+        db.commit()
+        db.refresh(user)
+        invalidate_user(user.id)
+
         return user
 
     # ---------- Delete User ----------
@@ -213,7 +302,6 @@ class UserService:
         old_data = {"username": user.username}
 
         db.delete(user)
-        db.commit()
 
         log_action(
             db=db,
@@ -222,23 +310,32 @@ class UserService:
             table_name="users",
             record_id=target_user_id,
             old_data=old_data,
+            strict=True,
         )
 
+        db.commit()
+        invalidate_user(target_user_id)
+
         return {"success": True, "message": "User deleted successfully"}
 
     @staticmethod
-    def user_register(
+    async def user_register(
         db: Session,
         current_user: User,
         user: schema.UserRegister
     ):
+        hashed = await UserService.hash_password(user.password)
+        return await run_in_threadpool(UserService._create_user, db, current_user, user, hashed)
+
+    @staticmethod
+    def _create_user(db: Session, current_user: User, user: schema.UserRegister, hashed: str):
         if db.query(User).filter(User.username == user.username).first():
             raise HTTPException(status_code=400, detail="Username already exists")
 
         new_user = User(
             username=user.username,
-            password=UserService.hash_password(user.password),
-            grade_code=user.grade_code,
+            password=hashed,
+            grade_code=UserService.resolve_grade_code(db, user.grade_code),
             is_admin=user.is_admin
         )
         if new_user.is_admin and current_user.id != 0:
@@ -284,9 +381,11 @@ class UserService:
             "grade_code": user.grade_code,
         }
 
-        user.grade_code = grade.id
+        user.grade_code = str(grade.id)
+        UserService.revoke_tokens(db, user.id)
         db.commit()
         db.refresh(user)
+        invalidate_user(user.id)
 
         log_action(
             db=db,
@@ -300,7 +399,13 @@ class UserService:
             },
         )
 
-        return {"success": True, "message": f"Grade '{grade.name}' assigned to user '{user.username}' successfully"}
+        # the old token carries the previous grade, hand back one for the new grade
+        return {
+            "success": True,
+            "message": f"Grade '{grade.name}' assigned to user '{user.username}' successfully",
+            "access_token": UserService.create_access_token(user, grade.id),
+            "token_type": "bearer",
+        }
     @staticmethod
     def get_admin_selected_grade(
         db: Session,
@@ -1,30 +1,38 @@
 from fastapi import APIRouter, Depends
 from sqlalchemy.orm import Session
+from sqlalchemy.ext.asyncio import AsyncSession
 
-from src.config.database import get_db
+from src.config.database import get_db, get_async_db
 from src.routes.auth.dependencies import get_current_user
 from src.routes.auth.model import User
 from src.config.dependencies import user_only
+from src.routes.grade.dependencies import get_grade_context
+from src.routes.grade.schema import GradeContext
 
-from .schema import ElectiveSubCreate, ElectiveSubResponse, StudentWithElectiveSub, ElectiveSubUpdate
+from .schema import ElectiveSubCreate, ElectiveSubResponse, StudentWithElectiveSub, ElectiveSubUpdate, ElectiveBulkCreate, ElectiveBulkResult
 from .service import ElectiveSubService
 
 router = APIRouter(prefix="/electives", tags=["Elective Subjects"])
 
 
+@router.post("/bulk", response_model=ElectiveBulkResult, dependencies=[Depends(user_only)])
+def bulk_create_electives(data: ElectiveBulkCreate, db: Session = Depends(get_db), current_user: User = Depends(get_current_user), grade: GradeContext = Depends(get_grade_context)):
+    return ElectiveSubService.bulk_create(db, data, current_user, grade)
+
+
 @router.post("/{student_id}", response_model=ElectiveSubResponse, dependencies=[Depends(user_only)])
-def create_elective(student_id: int, data: ElectiveSubCreate, db: Session = Depends(get_db), current_user: User = Depends(get_current_user)):
-    return ElectiveSubService.create(db, data, current_user, student_id)
+def create_elective(student_id: int, data: ElectiveSubCreate, db: Session = Depends(get_db), current_user: User = Depends(get_current_user), grade: GradeContext = Depends(get_grade_context)):
+    return ElectiveSubService.create(db, data, current_user, student_id, grade)
 
 
 @router.get("/", response_model=list[StudentWithElectiveSub], dependencies=[Depends(user_only)])
-def get_all(db: Session = Depends(get_db), current_user: User = Depends(get_current_user)):
-    return ElectiveSubService.get_all(db, current_user)
+async def get_all(db: AsyncSession = Depends(get_async_db), grade: GradeContext = Depends(get_grade_context)):
+    return await ElectiveSubService.get_all(db, grade)
 
 
 @router.get("/student/{student_id}", response_model=list[ElectiveSubResponse], dependencies=[Depends(user_only)])
-def get_student_electives(student_id: int, db: Session = Depends(get_db)):
-    return ElectiveSubService.get_by_student(db, student_id)
+async def get_student_electives(student_id: int, db: AsyncSession = Depends(get_async_db)):
+    return await ElectiveSubService.get_by_student(db, student_id)
 
 
 @router.put("/{elective_id}", response_model=ElectiveSubResponse, dependencies=[Depends(user_only)])
@@ -35,4 +35,24 @@ class StudentWithElectiveSub(BaseModel):
     elective_subjects: list[ElectiveSubResponse] = []
 
     class Config:
-        from_attributes = True
\ No newline at end of file
+        from_attributes = True
+
+class ElectiveBulkRow(BaseModel):
+    student_id: int
+    sub_ids: list[int]
+
+
+class ElectiveBulkCreate(BaseModel):
+    assignments: list[ElectiveBulkRow]
+
+
+class ElectiveBulkRejected(BaseModel):
+    student_id: int
+    sub_id: int
+    reason: str
+
+
+class ElectiveBulkResult(BaseModel):
+    year: str
+    inserted: int
+    rejected: list[ElectiveBulkRejected]
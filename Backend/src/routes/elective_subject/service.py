@@ -1,31 +1,39 @@
+from sqlalchemy import select, func, insert, tuple_
 from sqlalchemy.orm import Session
+from sqlalchemy.ext.asyncio import AsyncSession
 from fastapi import HTTPException
 
 from .model import ElectiveSub
-from .schema import ElectiveSubCreate, ElectiveSubResponse, ElectiveSubUpdate
-from src.routes.log.services import log_action
+from .schema import ElectiveSubCreate, ElectiveSubResponse, ElectiveSubUpdate, ElectiveBulkCreate
+from src.routes.log.services import log_action, log_records
+from src.routes.log.utils import model_snapshot
 from src.routes.student.model import Student
 from src.routes.grade.service import GradeService
+from src.routes.grade.schema import GradeContext
+from src.routes.result.cache import bump_results, invalidate_results
 from src.routes.year.service import YearService
-from src.config.dependencies import check_user_validation_for_grade
 
 
 
 class ElectiveSubService:
 
     @staticmethod
-    def create(db: Session, data: ElectiveSubCreate, user, student_id: int):
-        grade_id = GradeService.get_grade_by_user(user, db).id
-        check_user_validation_for_grade(db, user, grade_id)
-        current_year = YearService.get_current(db).year
-        electives = db.query(ElectiveSub).filter(ElectiveSub.student_id == student_id).filter(ElectiveSub.year == current_year).all()
-        if len(electives) >= GradeService.get_elective_count(db, grade_id):
+    def create(db: Session, data: ElectiveSubCreate, user, student_id: int, grade: GradeContext):
+        current_year = YearService.get_current_sync(db).year
+        elective_total = (
+            db.query(func.count(ElectiveSub.id))
+            .filter(ElectiveSub.student_id == student_id, ElectiveSub.year == current_year)
+            .scalar()
+        )
+        if elective_total >= grade.elective_count:
             raise HTTPException(status_code=400, detail="Elective subject limit reached for the student in this grade")
         data.student_id = student_id
         elective = ElectiveSub(**data.model_dump())
         db.add(elective)
+        bump_results(db, grade.id, elective.year)
         db.commit()
         db.refresh(elective)
+        invalidate_results(grade.id, elective.year, [student_id])
 
         log_action(
             db=db,
@@ -40,15 +48,99 @@ class ElectiveSubService:
         return elective
 
     @staticmethod
-    def get_all(db: Session, user):
-        grade_id=GradeService.get_grade_by_user(user, db).id
-        current_year = YearService.get_current(db).year
-        student_with_elective=(
-            db.query(Student, ElectiveSub)
-            .outerjoin(ElectiveSub, (Student.id==ElectiveSub.student_id) & (ElectiveSub.year==current_year))
-            .filter(Student.grade_id==grade_id, Student.is_active==True)
-            .all()
+    def bulk_create(db: Session, data: ElectiveBulkCreate, user, grade: GradeContext):
+        """
+        Assign electives to many students of `grade` for the current year.
+
+        One query loads the requested students' existing electives, every pair is
+        checked against it in memory and the accepted pairs go in as a single
+        multi-row INSERT; offending pairs are returned instead of failing the call.
+        """
+        if not grade.has_elective:
+            raise HTTPException(status_code=400, detail="This grade has no elective subjects")
+        current = YearService.get_current_sync(db)
+        if not current:
+            raise HTTPException(status_code=400, detail="No current year is set")
+
+        student_ids = {row.student_id for row in data.assignments}
+        assigned = {}
+        for student_id, sub_id in db.execute(
+            select(Student.id, ElectiveSub.sub_id)
+            .outerjoin(ElectiveSub, (Student.id == ElectiveSub.student_id) & (ElectiveSub.year == current.year))
+            .where(Student.id.in_(student_ids), Student.grade_id == grade.id, Student.is_active == True)
+        ):
+            subs = assigned.setdefault(student_id, set())
+            if sub_id is not None:
+                subs.add(sub_id)
+
+        electives = {subject.id for subject in grade.elective_subjects}
+        accepted, rejected = [], []
+        for row in data.assignments:
+            subs = assigned.get(row.student_id)
+            for sub_id in row.sub_ids:
+                if subs is None:
+                    reason = "Student is not an active student of this grade"
+                elif sub_id not in electives:
+                    reason = "Subject is not an elective of this grade"
+                elif sub_id in subs:
+                    reason = "Elective already assigned"
+                elif len(subs) >= grade.elective_count:
+                    reason = "Elective subject limit reached for the student in this grade"
+                else:
+                    subs.add(sub_id)
+                    accepted.append({"student_id": row.student_id, "sub_id": sub_id, "year": current.year})
+                    continue
+                rejected.append({"student_id": row.student_id, "sub_id": sub_id, "reason": reason})
+
+        if accepted:
+            db.execute(insert(ElectiveSub).values(accepted))
+            log_records(
+                db,
+                user_id=user.id,
+                action="CREATE",
+                table_name="elective_subjects",
+                records=(
+                    (elective_id, None, {"student_id": student_id, "sub_id": sub_id, "year": current.year})
+                    for elective_id, student_id, sub_id in db.execute(
+                        select(ElectiveSub.id, ElectiveSub.student_id, ElectiveSub.sub_id).where(
+                            ElectiveSub.year == current.year,
+                            tuple_(ElectiveSub.student_id, ElectiveSub.sub_id).in_(
+                                [(a["student_id"], a["sub_id"]) for a in accepted]
+                            ),
                         )
+                    )
+                ),
+            )
+            log_action(
+                db=db,
+                user_id=user.id,
+                action="BULK_CREATE",
+                table_name="elective_subjects",
+                record_id=0,
+                new_data={
+                    "year": current.year,
+                    "count": len(accepted),
+                    "pairs": [[a["student_id"], a["sub_id"]] for a in accepted],
+                },
+                strict=True,
+            )
+            bump_results(db, grade.id, current.year)
+            db.commit()
+            invalidate_results(grade.id, current.year, {a["student_id"] for a in accepted})
+
+        return {"year": current.year, "inserted": len(accepted), "rejected": rejected}
+
+    @staticmethod
+    async def get_all(db: AsyncSession, grade: GradeContext):
+        grade_id = grade.id
+        current_year = (await YearService.get_current(db)).year
+        student_with_elective = (
+            await db.execute(
+                select(Student, ElectiveSub)
+                .outerjoin(ElectiveSub, (Student.id==ElectiveSub.student_id) & (ElectiveSub.year==current_year))
+                .where(Student.grade_id==grade_id, Student.is_active==True)
+            )
+        ).all()
         if not student_with_elective:
             raise HTTPException(status_code=404, detail="No Student found")
         
@@ -70,27 +162,36 @@ class ElectiveSubService:
 
 
     @staticmethod
-    def get_by_student(db: Session, student_id: int):
-        return db.query(ElectiveSub).filter(ElectiveSub.student_id == student_id).all()
+    async def get_by_student(db: AsyncSession, student_id: int):
+        result = await db.execute(select(ElectiveSub).where(ElectiveSub.student_id == student_id))
+        return result.scalars().all()
 
    
 
     # In service.py, ensure the update method exists
     @staticmethod
     def update(db: Session, data: ElectiveSubUpdate, user):
-        grade_id = GradeService.get_grade_by_user(user, db).id
-        check_user_validation_for_grade(db, user, grade_id)
+        grade_id = GradeService.get_grade_id_by_user(user)
         elective = db.query(ElectiveSub).filter(ElectiveSub.id == data.id).first()
         if not elective:
             raise HTTPException(status_code=404, detail="Elective subject not found")
 
+        old_data = model_snapshot(elective)
+        old_student_id, old_year = elective.student_id, elective.year
+
         # Update only the sub_id (subject code) and keep other fields
         elective.sub_id = data.sub_id
         elective.year = data.year if data.year else elective.year
         elective.student_id = data.student_id if data.student_id else elective.student_id
 
+        bump_results(db, grade_id, old_year)
+        if elective.year != old_year:
+            bump_results(db, grade_id, elective.year)
         db.commit()
         db.refresh(elective)
+        # only the old and new holder change: their subject rows, GPA and rank
+        invalidate_results(grade_id, old_year, [old_student_id])
+        invalidate_results(grade_id, elective.year, [elective.student_id])
 
         log_action(
             db=db,
@@ -98,7 +199,7 @@ class ElectiveSubService:
             action="UPDATE",
             table_name="elective_subjects",
             record_id=elective.id,
-            old_data=elective.__dict__,
+            old_data=old_data,
             new_data=data.model_dump(exclude_unset=True),
         )
 
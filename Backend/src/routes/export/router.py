@@ -0,0 +1,42 @@
+from typing import Literal
+
+from fastapi import APIRouter, Depends
+from fastapi.responses import StreamingResponse
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from src.config.database import get_async_db
+from src.config.dependencies import user_only
+from src.routes.grade.dependencies import get_grade_context
+from src.routes.grade.schema import GradeContext
+from src.routes.result.service import ResultService
+
+from .service import ExportService
+
+router = APIRouter(prefix="/exports", tags=["Exports"])
+
+Dataset = Literal["students", "subjects", "electives", "results"]
+
+
+@router.get("/{dataset}", dependencies=[Depends(user_only)])
+async def export_dataset(
+    dataset: Dataset,
+    format: Literal["csv", "xlsx"] = "csv",
+    year: str | None = None,
+    db: AsyncSession = Depends(get_async_db),
+    grade: GradeContext = Depends(get_grade_context),
+):
+    """
+    Download a grade's students, subjects, electives or results as CSV/XLSX.
+    Rows are written as they are fetched. Students are filtered by `year` only
+    when it is given; electives and results default to the current year.
+    """
+    if dataset in ("electives", "results"):
+        year = await ResultService.resolve_year(db, year)
+
+    header, batches = await getattr(ExportService, dataset)(grade.id, year)
+    media_type, body = ExportService.render(format, dataset, header, batches)
+
+    filename = "-".join(part for part in (dataset, grade.code, year) if part) + f".{format}"
+    return StreamingResponse(
+        body, media_type=media_type, headers={"Content-Disposition": f'attachment; filename="{filename}"'}
+    )
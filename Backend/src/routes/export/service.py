@@ -0,0 +1,109 @@
+from sqlalchemy import select
+
+from src.config.database import AsyncSessionLocal
+from src.config.settings import settings
+from src.routes.elective_subject.model import ElectiveSub
+from src.routes.result.service import ResultService
+from src.routes.student.model import Student
+from src.routes.subject.model import Subject
+from src.util.streaming import CSV_MEDIA_TYPE, XLSX_MEDIA_TYPE, csv_chunks, xlsx_chunks
+
+RESULT_COLUMNS = [
+    "student_id", "roll", "name", "credit_hours", "obtained", "full_marks", "percentage", "gpa", "grade",
+    "division", "passed", "missing",
+]
+
+
+async def _partitions(stmt):
+    """
+    Rows of `stmt` in EXPORT_BATCH-sized lists from a server-side cursor
+    (stream_results + yield_per), on a session of its own that lives as long as
+    the response body.
+    """
+    async with AsyncSessionLocal() as db:
+        result = await db.stream(stmt.execution_options(yield_per=settings.EXPORT_BATCH))
+        async for rows in result.partitions():
+            yield [tuple(row) for row in rows]
+
+
+class ExportService:
+    """Each dataset is a header plus an async iterator of row batches."""
+
+    @staticmethod
+    async def students(grade_id: int, year: str | None):
+        stmt = (
+            select(Student.id, Student.roll, Student.name, Student.year, Student.is_active)
+            .where(Student.grade_id == grade_id)
+            .order_by(Student.roll, Student.id)
+        )
+        if year is not None:
+            stmt = stmt.where(Student.year == year)
+        return ["id", "roll", "name", "year", "is_active"], _partitions(stmt)
+
+    @staticmethod
+    async def subjects(grade_id: int, year: str | None):
+        stmt = (
+            select(Subject.id, Subject.sub_code, Subject.sub_name, Subject.Th_ch, Subject.Pr_ch,
+                   Subject.is_elective, Subject.is_active)
+            .where(Subject.grade_id == grade_id)
+            .order_by(Subject.is_elective, Subject.id)
+        )
+        return ["id", "sub_code", "sub_name", "Th_ch", "Pr_ch", "is_elective", "is_active"], _partitions(stmt)
+
+    @staticmethod
+    async def electives(grade_id: int, year: str):
+        stmt = (
+            select(Student.id, Student.roll, Student.name, Subject.id, Subject.sub_code, Subject.sub_name,
+                   ElectiveSub.year)
+            .join(ElectiveSub, ElectiveSub.student_id == Student.id)
+            .join(Subject, Subject.id == ElectiveSub.sub_id)
+            .where(Student.grade_id == grade_id, Student.is_active == True, ElectiveSub.year == year)
+            .order_by(Student.roll, Student.id, Subject.id)
+        )
+        header = ["student_id", "roll", "name", "subject_id", "sub_code", "sub_name", "year"]
+        return header, _partitions(stmt)
+
+    @staticmethod
+    async def results(grade_id: int, year: str):
+        """
+        One column per active subject holds the subject grade (blank when not taken).
+        Student ids are streamed in batches and the engine runs per batch; its rows
+        are independent, so batching does not change any value.
+        """
+        async with AsyncSessionLocal() as db:
+            subjects = (
+                await db.execute(
+                    select(Subject.id, Subject.sub_code)
+                    .where(Subject.grade_id == grade_id, Subject.is_active == True)
+                    .order_by(Subject.is_elective, Subject.id)
+                )
+            ).all()
+
+        async def batches():
+            stmt = (
+                select(Student.id)
+                .where(Student.grade_id == grade_id, Student.is_active == True)
+                .order_by(Student.roll, Student.id)
+            )
+            async with AsyncSessionLocal() as db:
+                async for rows in _partitions(stmt):
+                    result = await ResultService.compute(db, grade_id, year, student_ids=[r[0] for r in rows])
+                    columns = {subject_id: j for j, subject_id in enumerate(result.results.subject_ids.tolist())}
+                    out = []
+                    for index, summary in enumerate(result.summaries()):
+                        grades = [
+                            str(result.results.subject_grade[index, columns[s.id]])
+                            if s.id in columns and result.results.enrolled[index, columns[s.id]] else None
+                            for s in subjects
+                        ]
+                        out.append(tuple(summary[c] for c in RESULT_COLUMNS) + tuple(grades))
+                    yield out
+
+        return RESULT_COLUMNS + [s.sub_code for s in subjects], batches()
+
+    @staticmethod
+    def render(fmt: str, sheet_name: str, header: list[str], batches):
+        """(media type, body iterator) for `fmt`."""
+        if fmt == "xlsx":
+            return XLSX_MEDIA_TYPE, xlsx_chunks(sheet_name, header, batches)
+        return CSV_MEDIA_TYPE, csv_chunks(header, batches)
@@ -0,0 +1,23 @@
+from src.config.settings import settings
+from src.util.cache import TTLCache
+from src.util.invalidation import invalidation_channel
+
+# grade id -> GradeContext
+grade_contexts = TTLCache(maxsize=settings.GRADE_CACHE_SIZE, ttl=settings.GRADE_CACHE_TTL)
+
+
+def _on_grade_invalidated(grade_id):
+    if grade_id is None:
+        grade_contexts.clear()
+    else:
+        grade_contexts.pop(int(grade_id))
+
+
+invalidation_channel.subscribe("grades", _on_grade_invalidated)
+
+
+def invalidate_grade(*grade_ids: int):
+    """Drop cached grade contexts in this and every other worker. Call after commit."""
+    for grade_id in dict.fromkeys(grade_ids):
+        if grade_id is not None:
+            invalidation_channel.publish("grades", grade_id)
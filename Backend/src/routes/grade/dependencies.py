@@ -0,0 +1,25 @@
+from fastapi import Depends, HTTPException
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from src.config.database import get_async_db
+from src.routes.auth.dependencies import get_current_user
+from .cache import grade_contexts
+from .schema import GradeContext
+from .service import GradeService
+
+
+async def get_grade_context(
+    current_user=Depends(get_current_user),
+    db: AsyncSession = Depends(get_async_db),
+) -> GradeContext:
+    # the grade id comes from the token claims, which are re-issued on reassignment
+    grade_id = GradeService.get_grade_id_by_user(current_user)
+
+    context = grade_contexts.get(grade_id)
+    if context is None:
+        generation = grade_contexts.generation
+        context = await GradeService.load_context(db, grade_id)
+        if context is None:
+            raise HTTPException(status_code=404, detail="You are not assigned to any grade yet")
+        grade_contexts.set(grade_id, context, generation)
+    return context
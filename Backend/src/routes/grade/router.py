@@ -1,12 +1,17 @@
-from fastapi import APIRouter, Depends
+from fastapi import APIRouter, Depends, HTTPException, Request, Response
 from sqlalchemy.orm import Session
+from sqlalchemy.ext.asyncio import AsyncSession
 
-from src.config.database import get_db
+from src.config.database import get_db, get_async_db
 from src.config.dependencies import admin_only, get_current_user, read_only_or_admin
-from .schema import GradeCreate, GradeUpdate, GradeOut, GradeOutNormal
+from .schema import GradeCreate, GradeUpdate, GradeOut, GradeOutNormal, GradeContext
+from .dependencies import get_grade_context
 from .service import GradeService
 from src.routes.auth.service import UserService
 from src.routes.auth.schema import UserMini
+from src.config.settings import settings
+from src.util.projection import lean_response
+from src.util.versions import table_etag, not_modified, etag_headers
 
 router = APIRouter(prefix="/grades", tags=["Grades"])
 
@@ -33,10 +38,18 @@ def update_grade(
 
 
 @router.get("/", response_model=list[GradeOutNormal])
-def get_grades(
-    db: Session = Depends(get_db),
+async def get_grades(
+    request: Request,
+    response: Response,
+    db: AsyncSession = Depends(get_async_db),
 ):
-    return GradeService.get_all(db)
+    etag = await table_etag(db, "grades")
+    if cached := not_modified(request, etag):
+        return cached
+    response.headers.update(etag_headers(etag))
+    lean = settings.LEAN_LIST_RESPONSES
+    grades = await GradeService.get_all(db, lean=lean)
+    return lean_response(list[GradeOutNormal], grades, headers=etag_headers(etag)) if lean else grades
 
     
 @router.get("/available-grade-teachers", response_model=list[UserMini], dependencies=[Depends(admin_only)])
@@ -58,21 +71,15 @@ def toggle_grade_active(
     return data
 
 @router.get("/grade-by-user", response_model=GradeOut, dependencies=[Depends(read_only_or_admin)])
-def get_grade_by_user(
-    db: Session = Depends(get_db),
-    current_user=Depends(get_current_user)
+async def get_grade_by_user(
+    grade: GradeContext = Depends(get_grade_context),
 ):
-    grade = GradeService.get_grade_by_user(current_user, db)
-
-    
-    if not grade:
-        raise HTTPException(status_code=404, detail="You are not assigned to any grade yet ")
     return grade
 
 
 @router.get("/{grade_id}", response_model=GradeOut, dependencies=[Depends(read_only_or_admin)])
-def get_grade(
+async def get_grade(
     grade_id: int,
-    db: Session = Depends(get_db),
+    db: AsyncSession = Depends(get_async_db),
 ):
-    return GradeService.get_by_id(db, grade_id)
\ No newline at end of file
+    return await GradeService.get_by_id(db, grade_id)
\ No newline at end of file
@@ -50,3 +50,11 @@ class GradeResponse(BaseModel):
     is_active: bool
 
     model_config = ConfigDict(from_attributes=True)
+
+
+class GradeContext(GradeBase):
+    """The grade the current user works on, resolved once per request and cached per process."""
+    id: int
+    elective_subjects: list[SubjectMini] = []
+
+    model_config = ConfigDict(frozen=True)
@@ -1,11 +1,17 @@
+from sqlalchemy import select
 from sqlalchemy.orm import Session
+from sqlalchemy.ext.asyncio import AsyncSession
 from fastapi import HTTPException
 from .model import Grade
-from .schema import GradeCreate, GradeUpdate, GradeBase, GradeOut
+from .schema import GradeCreate, GradeUpdate, GradeBase, GradeOut, GradeOutNormal, GradeContext
 from src.routes.log.services import log_action
 from src.routes.auth.service import UserService
+from src.routes.auth.dependencies import invalidate_user
+from .cache import invalidate_grade
+from src.util.versions import bump_versions, invalidate_versions
 from src.routes.auth.model import User
 from src.routes.subject.model import Subject
+from src.util.projection import columns_for, as_dicts
 
 
 
@@ -18,8 +24,13 @@ class GradeService:
             raise HTTPException(status_code=400, detail="Grade code already exists")
         grade = Grade(**data.dict())
         db.add(grade)
+        UserService.revoke_tokens(db, grade.grade_teacher_id)
+        bump_versions(db, "grades")
         db.commit()
         db.refresh(grade)
+        invalidate_user(grade.grade_teacher_id)
+        invalidate_grade(grade.id)
+        invalidate_versions("grades")
 
         log_action(
             db=db,
@@ -56,8 +67,18 @@ class GradeService:
         for key, value in data.dict().items():
             setattr(grade, key, value)
 
+        # teachers moved on or off this grade must pick up the new grade claim
+        reassigned = []
+        if grade.grade_teacher_id != old_data["grade_teacher_id"]:
+            reassigned = [old_data["grade_teacher_id"], grade.grade_teacher_id]
+            UserService.revoke_tokens(db, *reassigned)
+
+        bump_versions(db, "grades")
         db.commit()
         db.refresh(grade)
+        invalidate_user(*reassigned)
+        invalidate_grade(grade.id)
+        invalidate_versions("grades")
 
         log_action(
             db=db,
@@ -73,13 +94,26 @@ class GradeService:
 
     # ---------------- GET ----------------
     @staticmethod
-    def get_all(db: Session, include_inactive: bool = False):
-        query = db.query(Grade)
-        query=query.order_by(Grade.is_active.desc(), Grade.id.desc()).all()
-        return query
+    async def get_all(db: AsyncSession, include_inactive: bool = False, lean: bool = False):
+        if lean:
+            # bare columns, so the joined teacher row is never loaded
+            return as_dicts(
+                await db.execute(
+                    select(*columns_for(GradeOutNormal, Grade)).order_by(Grade.is_active.desc(), Grade.id.desc())
+                )
+            )
+        result = await db.execute(
+            select(Grade).order_by(Grade.is_active.desc(), Grade.id.desc())
+        )
+        return result.scalars().all()
+
+    @staticmethod
+    async def get_by_id(db: AsyncSession, grade_id: int):
+        result = await db.execute(select(Grade).where(Grade.id == grade_id))
+        return result.scalars().first()
 
     @staticmethod
-    def get_by_id(db: Session, grade_id: int):
+    def get_by_id_sync(db: Session, grade_id: int):
         return db.query(Grade).filter(Grade.id == grade_id).first()
 
     @staticmethod
@@ -93,10 +127,17 @@ class GradeService:
         }
 
         grade.is_active = not grade.is_active
+        old_teacher_id = None
         if not grade.is_active:
-            grade.grade_teacher_id = None  
+            old_teacher_id = grade.grade_teacher_id
+            grade.grade_teacher_id = None
+            UserService.revoke_tokens(db, old_teacher_id)
+        bump_versions(db, "grades")
         db.commit()
         db.refresh(grade)
+        invalidate_user(old_teacher_id)
+        invalidate_grade(grade.id)
+        invalidate_versions("grades")
 
         log_action(
             db=db,
@@ -111,43 +152,37 @@ class GradeService:
         return grade
 
 
-    def get_grade_by_user(current_user, db: Session):
-
-        # 1️⃣ Get grade
-        print("this is test",current_user.is_admin, current_user.username)
-        if current_user.is_admin:
-            grade_id=db.query(User).filter(User.id==current_user.id).first().grade_code
-            grade = (
-                db.query(Grade)
-                .filter(Grade.id == grade_id)
-                .first()
-            )
-        else:
-            grade = (
-                db.query(Grade)
-                .filter(Grade.grade_teacher_id == current_user.id)
-                .first()
-            )
+    @staticmethod
+    def get_grade_id_by_user(current_user):
+        # the working grade travels in the token claims, no lookup needed
+        if not current_user.grade_id:
+            raise HTTPException(status_code=404, detail="You are not assigned to any grade yet")
+        return current_user.grade_id
 
+    @staticmethod
+    async def load_context(db: AsyncSession, grade_id: int):
+        grade = (await db.execute(select(Grade).where(Grade.id == grade_id))).scalars().first()
         if not grade:
-            raise HTTPException(status_code=404, detail="You are not assigned to any grade yet")
+            return None
 
         elective_subjects = (
-            db.query(Subject)
-            .filter(
-                Subject.grade_id == grade.id,
-                Subject.is_elective == True,
-                Subject.is_active == True
+            await db.execute(
+                select(Subject.id, Subject.sub_code, Subject.sub_name).where(
+                    Subject.grade_id == grade.id,
+                    Subject.is_elective == True,
+                    Subject.is_active == True
+                )
             )
-            .all()
+        ).mappings().all()
+
+        return GradeContext(
+            id=grade.id,
+            code=grade.code,
+            name=grade.name,
+            subject_count=grade.subject_count,
+            has_elective=grade.has_elective,
+            elective_count=grade.elective_count or 0,
+            grade_teacher_id=grade.grade_teacher_id,
+            is_active=grade.is_active,
+            elective_subjects=[dict(subject) for subject in elective_subjects],
         )
-
-        grade.elective_subjects= elective_subjects
-        return grade
-
-    @staticmethod
-    def get_elective_count(db: Session, grade_id: int):
-        grade = db.query(Grade).filter(Grade.id == grade_id).first()
-        if not grade:
-            raise HTTPException(status_code=404, detail="Grade not found")
-        return grade.elective_count
@@ -0,0 +1,192 @@
+"""
+Audit log retention.
+
+Rows older than the retention window are appended to one gzip JSON-lines file
+per month (`audit_logs-YYYY-MM.jsonl.gz`) and then deleted from `audit_logs` in
+bounded batches. Each batch is written as its own gzip member and fsynced before
+the rows are deleted, so files are only ever appended to and a crash can at
+worst archive a batch twice (readers skip the duplicate ids).
+
+Run it from cron with `python -m src.routes.log.archive`, through
+`POST /logs/archive`, or in-process every AUDIT_ARCHIVE_INTERVAL hours.
+"""
+import asyncio
+import gzip
+import json
+import logging
+import os
+import re
+import threading
+from collections import defaultdict
+from datetime import datetime, timedelta, timezone
+
+from sqlalchemy import select, delete
+
+from src.config.database import SessionLocal
+from src.config.settings import settings
+from .model import AuditLog
+from .services import audit_writer
+
+logger = logging.getLogger(__name__)
+
+_SEGMENT_RE = re.compile(r"^audit_logs-(\d{4})-(\d{2})\.jsonl\.gz$")
+_run_lock = threading.Lock()
+
+
+def _naive_utc(value: datetime | None) -> datetime | None:
+    if value is not None and value.tzinfo is not None:
+        return value.astimezone(timezone.utc).replace(tzinfo=None)
+    return value
+
+
+def segment_path(year: int, month: int, archive_dir: str | None = None) -> str:
+    return os.path.join(archive_dir or settings.AUDIT_ARCHIVE_DIR, f"audit_logs-{year:04d}-{month:02d}.jsonl.gz")
+
+
+def _row_to_dict(row: AuditLog) -> dict:
+    return {
+        "id": row.id,
+        "user_id": row.user_id,
+        "action": row.action,
+        "table_name": row.table_name,
+        "record_id": row.record_id,
+        "old_data": row.old_data,
+        "new_data": row.new_data,
+        "created_at": row.created_at.isoformat(),
+    }
+
+
+def _append(path: str, rows: list[dict]):
+    with open(path, "ab") as raw:
+        with gzip.GzipFile(fileobj=raw, mode="wb") as gz:
+            for row in rows:
+                gz.write(json.dumps(row, separators=(",", ":")).encode() + b"\n")
+        raw.flush()
+        os.fsync(raw.fileno())
+
+
+def archive_old_logs(
+    retention_days: int | None = None,
+    batch_size: int | None = None,
+    archive_dir: str | None = None,
+    max_batches: int | None = None,
+) -> dict:
+    """Move audit rows past the retention window into the monthly archive files."""
+    retention_days = settings.AUDIT_RETENTION_DAYS if retention_days is None else retention_days
+    batch_size = batch_size or settings.AUDIT_ARCHIVE_BATCH
+    archive_dir = archive_dir or settings.AUDIT_ARCHIVE_DIR
+    cutoff = datetime.utcnow() - timedelta(days=retention_days)
+
+    if not _run_lock.acquire(blocking=False):
+        return {"archived": 0, "batches": 0, "cutoff": cutoff, "skipped": "already running"}
+
+    archived = batches = 0
+    try:
+        os.makedirs(archive_dir, exist_ok=True)
+        # anything still buffered belongs in the table before we look at it
+        audit_writer.flush()
+        while max_batches is None or batches < max_batches:
+            with SessionLocal() as db:
+                rows = db.execute(
+                    select(AuditLog)
+                    .where(AuditLog.created_at < cutoff)
+                    .order_by(AuditLog.created_at, AuditLog.id)
+                    .limit(batch_size)
+                ).scalars().all()
+                if not rows:
+                    break
+
+                by_month = defaultdict(list)
+                for row in rows:
+                    by_month[(row.created_at.year, row.created_at.month)].append(_row_to_dict(row))
+                for (year, month), month_rows in by_month.items():
+                    _append(segment_path(year, month, archive_dir), month_rows)
+
+                db.execute(delete(AuditLog).where(AuditLog.id.in_([row.id for row in rows])))
+                db.commit()
+
+            archived += len(rows)
+            batches += 1
+            if len(rows) < batch_size:
+                break
+    finally:
+        _run_lock.release()
+
+    if archived:
+        logger.info("Archived %d audit rows older than %s in %d batches", archived, cutoff, batches)
+    return {"archived": archived, "batches": batches, "cutoff": cutoff}
+
+
+def list_segments(archive_dir: str | None = None) -> list[dict]:
+    archive_dir = archive_dir or settings.AUDIT_ARCHIVE_DIR
+    if not os.path.isdir(archive_dir):
+        return []
+    segments = []
+    for name in sorted(os.listdir(archive_dir)):
+        match = _SEGMENT_RE.match(name)
+        if match:
+            segments.append({
+                "month": f"{match.group(1)}-{match.group(2)}",
+                "file": name,
+                "bytes": os.path.getsize(os.path.join(archive_dir, name)),
+            })
+    return segments
+
+
+def iter_archived_logs(
+    *,
+    table_name: str | None = None,
+    record_id: int | None = None,
+    user_id: int | None = None,
+    action: str | None = None,
+    created_from: datetime | None = None,
+    created_to: datetime | None = None,
+    archive_dir: str | None = None,
+):
+    """Stream archived rows (oldest first), one month segment at a time."""
+    archive_dir = archive_dir or settings.AUDIT_ARCHIVE_DIR
+    created_from, created_to = _naive_utc(created_from), _naive_utc(created_to)
+    first_month = (created_from.year, created_from.month) if created_from else None
+    last_month = (created_to.year, created_to.month) if created_to else None
+
+    for segment in list_segments(archive_dir):
+        month = tuple(int(part) for part in segment["month"].split("-"))
+        if (first_month and month < first_month) or (last_month and month > last_month):
+            continue
+
+        seen = set()
+        with gzip.open(os.path.join(archive_dir, segment["file"]), "rt") as lines:
+            for line in lines:
+                row = json.loads(line)
+                if row["id"] in seen:
+                    continue
+                seen.add(row["id"])
+                if table_name is not None and row["table_name"] != table_name:
+                    continue
+                if record_id is not None and row["record_id"] != record_id:
+                    continue
+                if user_id is not None and row["user_id"] != user_id:
+                    continue
+                if action is not None and row["action"] != action:
+                    continue
+                if created_from or created_to:
+                    created_at = _naive_utc(datetime.fromisoformat(row["created_at"]))
+                    if created_from and created_at < created_from:
+                        continue
+                    if created_to and created_at >= created_to:
+                        continue
+                yield row
+
+
+async def archive_periodically(interval_hours: float):
+    while True:
+        await asyncio.sleep(interval_hours * 3600)
+        try:
+            await asyncio.to_thread(archive_old_logs)
+        except Exception:
+            logger.exception("Audit log archiving failed")
+
+
+if __name__ == "__main__":
+    logging.basicConfig(level=logging.INFO)
+    print(archive_old_logs())
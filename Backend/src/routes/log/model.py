@@ -1,5 +1,5 @@
 
-from sqlalchemy import Column, Integer, String, DateTime, JSON
+from sqlalchemy import Column, Integer, String, DateTime, JSON, Index
 from sqlalchemy.sql import func
 from src.config.database import Base
 
@@ -16,4 +16,12 @@ class AuditLog(Base):
     old_data = Column(JSON, nullable=True)
     new_data = Column(JSON, nullable=True)
 
-    created_at = Column(DateTime(timezone=True), server_default=func.now())
+    created_at = Column(DateTime(timezone=True), server_default=func.now(), nullable=False)
+
+    # every listing is keyset-paginated on (created_at, id), so each index ends with it
+    __table_args__ = (
+        Index("ix_audit_logs_record", "table_name", "record_id", "created_at", "id"),
+        Index("ix_audit_logs_user", "user_id", "created_at", "id"),
+        Index("ix_audit_logs_action", "action", "created_at", "id"),
+        Index("ix_audit_logs_created", "created_at", "id"),
+    )
@@ -0,0 +1,92 @@
+import json
+from datetime import datetime
+
+from fastapi import APIRouter, BackgroundTasks, Depends, Query
+from fastapi.responses import StreamingResponse
+from sqlalchemy.orm import Session
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from src.config.database import get_db, get_async_db
+from src.config.dependencies import admin_only
+
+from .schema import AuditLogPage, RecordState
+from .services import search_logs, rebuild_record
+from .archive import archive_old_logs, list_segments, iter_archived_logs
+
+router = APIRouter(prefix="/logs", tags=["Audit Logs"], dependencies=[Depends(admin_only)])
+
+
+@router.get("/", response_model=AuditLogPage)
+async def get_logs(
+    table_name: str | None = None,
+    record_id: int | None = None,
+    user_id: int | None = None,
+    action: str | None = None,
+    created_from: datetime | None = None,
+    created_to: datetime | None = None,
+    cursor: str | None = None,
+    limit: int = Query(50, ge=1, le=500),
+    db: AsyncSession = Depends(get_async_db),
+):
+    return await search_logs(
+        db,
+        table_name=table_name,
+        record_id=record_id,
+        user_id=user_id,
+        action=action,
+        created_from=created_from,
+        created_to=created_to,
+        cursor=cursor,
+        limit=limit,
+    )
+
+
+@router.get("/{table_name}/{record_id}/state", response_model=RecordState)
+def get_record_state(
+    table_name: str,
+    record_id: int,
+    as_of: datetime | None = None,
+    db: Session = Depends(get_db),
+):
+    return {
+        "table_name": table_name,
+        "record_id": record_id,
+        "as_of": as_of,
+        "state": rebuild_record(db, table_name, record_id, as_of),
+    }
+
+
+# ---------------- ARCHIVE ----------------
+@router.post("/archive", status_code=202)
+def run_archive(background_tasks: BackgroundTasks, retention_days: int | None = Query(None, ge=0)):
+    """Archiving can take long on a big table: it runs after the response, the outcome is logged."""
+    background_tasks.add_task(archive_old_logs, retention_days=retention_days)
+    return {"scheduled": True, "retention_days": retention_days}
+
+
+@router.get("/archive/segments")
+def get_archive_segments():
+    return list_segments()
+
+
+@router.get("/archive")
+def stream_archive(
+    table_name: str | None = None,
+    record_id: int | None = None,
+    user_id: int | None = None,
+    action: str | None = None,
+    created_from: datetime | None = None,
+    created_to: datetime | None = None,
+):
+    rows = iter_archived_logs(
+        table_name=table_name,
+        record_id=record_id,
+        user_id=user_id,
+        action=action,
+        created_from=created_from,
+        created_to=created_to,
+    )
+    return StreamingResponse(
+        (json.dumps(row, separators=(",", ":")) + "\n" for row in rows),
+        media_type="application/x-ndjson",
+    )
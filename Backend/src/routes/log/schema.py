@@ -0,0 +1,29 @@
+from datetime import datetime
+from typing import Any
+
+from pydantic import BaseModel, ConfigDict
+
+
+class AuditLogOut(BaseModel):
+    id: int
+    user_id: int
+    action: str
+    table_name: str
+    record_id: int
+    old_data: dict[str, Any] | None = None
+    new_data: dict[str, Any] | None = None
+    created_at: datetime
+
+    model_config = ConfigDict(from_attributes=True)
+
+
+class AuditLogPage(BaseModel):
+    items: list[AuditLogOut]
+    next_cursor: str | None = None
+
+
+class RecordState(BaseModel):
+    table_name: str
+    record_id: int
+    as_of: datetime | None = None
+    state: dict[str, Any] | None = None
@@ -1,7 +1,159 @@
 
+import logging
+import threading
+import time
+from collections import deque
+from datetime import datetime, timezone
+
+from sqlalchemy import insert, select, and_, or_
 from sqlalchemy.orm import Session
+from sqlalchemy.ext.asyncio import AsyncSession
+from fastapi import HTTPException
 from .model import AuditLog
-from .utils import json_safe
+from .utils import json_safe, diff_changes, apply_changes
+from src.config.database import engine
+from src.config.settings import settings
+from src.util.pagination import encode_cursor, decode_cursor
+
+logger = logging.getLogger(__name__)
+
+
+class AuditWriter:
+    """
+    Write-behind buffer for audit rows. Rows are queued in memory and a background
+    thread writes them with one multi-row INSERT when `batch_size` rows are waiting
+    or every `flush_interval` seconds, whichever comes first. If the database falls
+    behind and more than `max_pending` rows pile up, callers flush inline.
+
+    A batch that fails is retried with a growing delay; after `max_attempts`
+    failures it is split in halves down to single rows, and a row the database
+    still rejects is logged at error level with its contents and dropped, so one
+    bad row (or a long outage) cannot block the queue or grow it without bound.
+    """
+
+    def __init__(self, batch_size: int, flush_interval: float, max_pending: int, max_attempts: int):
+        self.batch_size = batch_size
+        self.flush_interval = flush_interval
+        self.max_pending = max_pending
+        self.max_attempts = max(max_attempts, 1)
+        self._pending = deque()
+        self._cond = threading.Condition()
+        self._flush_lock = threading.Lock()
+        self._thread = None
+        self._stopped = False
+        self._attempts = 0  # consecutive failed flushes of the batch at the head
+        self._retry_at = 0.0
+        self.written = 0
+        self.batches = 0
+        self.failures = 0
+        self.dead_lettered = 0
+
+    def enqueue(self, values: dict):
+        with self._cond:
+            self._pending.append(values)
+            size = len(self._pending)
+            if self._thread is None and not self._stopped:
+                self._thread = threading.Thread(target=self._run, name="audit-writer", daemon=True)
+                self._thread.start()
+            if size >= self.batch_size:
+                self._cond.notify()
+        # while the database is failing, requests don't each pay for another failing INSERT
+        if (size > self.max_pending or self._stopped) and time.monotonic() >= self._retry_at:
+            self.flush()
+
+    def _insert(self, rows: list[dict]):
+        with engine.begin() as conn:
+            conn.execute(insert(AuditLog).values(rows))
+
+    def _write_or_dead_letter(self, rows: list[dict]) -> int:
+        """Write `rows`, halving on failure; single rows that still fail are dropped. Returns rows written."""
+        try:
+            self._insert(rows)
+            return len(rows)
+        except Exception:
+            if len(rows) == 1:
+                self.dead_lettered += 1
+                logger.error("Dropping audit row the database rejects: %r", rows[0], exc_info=True)
+                return 0
+        middle = len(rows) // 2
+        return self._write_or_dead_letter(rows[:middle]) + self._write_or_dead_letter(rows[middle:])
+
+    def flush(self):
+        """Write everything queued so far. Returns the number of rows written."""
+        written = 0
+        with self._flush_lock:
+            while True:
+                with self._cond:
+                    batch = [self._pending.popleft() for _ in range(min(self.batch_size, len(self._pending)))]
+                if not batch:
+                    return written
+                if self._attempts >= self.max_attempts:
+                    count = self._write_or_dead_letter(batch)
+                    self._attempts = 0
+                else:
+                    try:
+                        self._insert(batch)
+                        count = len(batch)
+                        self._attempts = 0
+                    except Exception:
+                        self.failures += 1
+                        self._attempts += 1
+                        self._retry_at = time.monotonic() + self.flush_interval * 2 ** self._attempts
+                        logger.exception(
+                            "Writing %d audit rows failed (attempt %d/%d), will retry",
+                            len(batch), self._attempts, self.max_attempts,
+                        )
+                        with self._cond:
+                            self._pending.extendleft(reversed(batch))
+                        return written
+                written += count
+                self.written += count
+                self.batches += 1
+
+    def _run(self):
+        while True:
+            with self._cond:
+                while not self._stopped:
+                    delay = self._retry_at - time.monotonic()
+                    if delay > 0:
+                        self._cond.wait(delay)  # backing off after a failed flush
+                        continue
+                    if len(self._pending) < self.batch_size:
+                        self._cond.wait(self.flush_interval)
+                    break
+                stopped = self._stopped
+            self.flush()
+            if stopped:
+                return
+
+    def shutdown(self):
+        with self._cond:
+            self._stopped = True
+            self._cond.notify()
+            thread = self._thread
+        if thread is not None:
+            thread.join()
+        self.flush()
+
+    def stats(self):
+        return {
+            "pending": len(self._pending),
+            "written": self.written,
+            "batches": self.batches,
+            "failures": self.failures,
+            "dead_lettered": self.dead_lettered,
+            "batch_size": self.batch_size,
+            "flush_interval": self.flush_interval,
+        }
+
+
+audit_writer = AuditWriter(
+    batch_size=settings.AUDIT_BATCH_SIZE,
+    flush_interval=settings.AUDIT_FLUSH_INTERVAL,
+    max_pending=settings.AUDIT_MAX_PENDING,
+    max_attempts=settings.AUDIT_MAX_ATTEMPTS,
+)
+
 
 def log_action(
     db: Session,
@@ -12,14 +164,179 @@ def log_action(
     record_id: int,
     old_data: dict | None = None,
     new_data: dict | None = None,
+    strict: bool = False,
 ):
-    log = AuditLog(
+    """
+    Record an audit row.
+
+    When both `old_data` and `new_data` are given only the changed fields are
+    stored, as `{field: old}` / `{field: new}`; CREATE keeps the full new state and
+    DELETE the full old state, so `rebuild_record` can replay a record's history.
+
+    By default the row goes through the write-behind `audit_writer`. With
+    `strict=True` it is added to `db` instead and commits (or rolls back)
+    together with the caller's business change, so call it before `db.commit()`.
+    """
+    if old_data is not None and new_data is not None:
+        old_data, new_data = diff_changes(old_data, new_data)
+    else:
+        old_data, new_data = json_safe(old_data), json_safe(new_data)
+
+    values = dict(
         user_id=user_id,
         action=action,
         table_name=table_name,
         record_id=record_id,
-        old_data=json_safe(old_data),
-        new_data=json_safe(new_data),
+        old_data=old_data,
+        new_data=new_data,
+        # UTC, stamped when logged: queued rows are inserted later, and replay orders by it
+        created_at=datetime.now(timezone.utc),
     )
-    db.add(log)
-    db.commit()
+
+    if strict:
+        db.add(AuditLog(**values))
+        return
+
+    if not settings.AUDIT_BATCHING:
+        db.add(AuditLog(**values))
+        db.commit()
+        return
+
+    audit_writer.enqueue(values)
+
+
+# rows per multi-row INSERT of log_records; keeps SQLite under its bound-parameter limit
+RECORDS_CHUNK = 500
+
+
+def log_records(db: Session, *, user_id: int, action: str, table_name: str, records):
+    """
+    Per-record audit rows for a bulk write, so `rebuild_record` has a baseline for
+    every row it touched. `records` yields `(record_id, old_data, new_data)` with the
+    same meaning as in `log_action`; records whose diff is empty are skipped. The
+    rows go in as multi-row INSERTs in the caller's transaction: call before commit.
+    """
+    created_at = datetime.now(timezone.utc)
+    rows = []
+    for record_id, old_data, new_data in records:
+        if old_data is not None and new_data is not None:
+            old_data, new_data = diff_changes(old_data, new_data)
+            if not new_data:
+                continue
+        else:
+            old_data, new_data = json_safe(old_data), json_safe(new_data)
+        rows.append(dict(
+            user_id=user_id, action=action, table_name=table_name, record_id=record_id,
+            old_data=old_data, new_data=new_data, created_at=created_at,
+        ))
+    for offset in range(0, len(rows), RECORDS_CHUNK):
+        db.execute(insert(AuditLog).values(rows[offset:offset + RECORDS_CHUNK]))
+
+
+def rebuild_record(
+    db: Session,
+    table_name: str,
+    record_id: int,
+    as_of: datetime | None = None,
+):
+    """
+    Rebuild a record's state as of `as_of` (default: now) by replaying its audit
+    diffs in order, archived segments first. Returns None if it didn't exist yet
+    or had been deleted. A history that doesn't start with a CREATE (the record
+    predates auditing, or its creation was never logged per record) cannot give
+    the full state, so it is refused instead of returning a partial dict.
+    """
+    from .archive import _naive_utc, iter_archived_logs  # archive imports this module
+
+    audit_writer.flush()
+
+    limit = _naive_utc(as_of)
+    archived = sorted(
+        (
+            (_naive_utc(datetime.fromisoformat(row["created_at"])), row["id"], row["action"], row["new_data"])
+            for row in iter_archived_logs(table_name=table_name, record_id=record_id)
+        ),
+        key=lambda entry: (entry[0], entry[1]),
+    )
+    if limit is not None:
+        archived = [entry for entry in archived if entry[0] <= limit]
+
+    query = (
+        select(AuditLog.id, AuditLog.action, AuditLog.new_data)
+        .where(AuditLog.table_name == table_name, AuditLog.record_id == record_id)
+        .order_by(AuditLog.created_at, AuditLog.id)
+    )
+    if limit is not None:
+        query = query.where(AuditLog.created_at <= limit)
+    archived_ids = {entry[1] for entry in archived}
+    entries = [(action, new_data) for _, _, action, new_data in archived]
+    entries += [(action, new_data) for row_id, action, new_data in db.execute(query) if row_id not in archived_ids]
+
+    if entries and entries[0][0] != "CREATE":
+        raise HTTPException(
+            status_code=409,
+            detail=f"The audit history of {table_name} #{record_id} does not start with its creation; "
+                   "its full state cannot be rebuilt",
+        )
+    state = None
+    for action, new_data in entries:
+        state = apply_changes(state, action, new_data)
+    return state
+
+
+async def search_logs(
+    db: AsyncSession,
+    *,
+    table_name: str | None = None,
+    record_id: int | None = None,
+    user_id: int | None = None,
+    action: str | None = None,
+    created_from: datetime | None = None,
+    created_to: datetime | None = None,
+    cursor: str | None = None,
+    limit: int = 50,
+):
+    """
+    Newest-first audit rows, keyset-paginated on (created_at, id). Filtering on
+    table_name (optionally with record_id), user_id, action or nothing but the
+    date range uses one of the AuditLog indexes as a range scan; record_id without
+    table_name, or several of the other filters together, narrows only by the
+    first indexed filter and checks the rest row by row.
+    """
+    query = select(AuditLog)
+    if table_name is not None:
+        query = query.where(AuditLog.table_name == table_name)
+    if record_id is not None:
+        query = query.where(AuditLog.record_id == record_id)
+    if user_id is not None:
+        query = query.where(AuditLog.user_id == user_id)
+    if action is not None:
+        query = query.where(AuditLog.action == action)
+    if created_from is not None:
+        query = query.where(AuditLog.created_at >= created_from)
+    if created_to is not None:
+        query = query.where(AuditLog.created_at < created_to)
+
+    if cursor:
+        last_created_at, last_id = decode_cursor(cursor, 2)
+        try:
+            last_created_at = datetime.fromisoformat(last_created_at)
+        except (TypeError, ValueError):
+            raise HTTPException(status_code=400, detail="Invalid cursor")
+        if type(last_id) is not int:
+            raise HTTPException(status_code=400, detail="Invalid cursor")
+        query = query.where(
+            or_(
+                AuditLog.created_at < last_created_at,
+                and_(AuditLog.created_at == last_created_at, AuditLog.id < last_id),
+            )
+        )
+
+    query = query.order_by(AuditLog.created_at.desc(), AuditLog.id.desc()).limit(limit + 1)
+    rows = (await db.execute(query)).scalars().all()
+
+    next_cursor = None
+    if len(rows) > limit:
+        rows = rows[:limit]
+        next_cursor = encode_cursor(rows[-1].created_at.isoformat(), rows[-1].id)
+    return {"items": rows, "next_cursor": next_cursor}
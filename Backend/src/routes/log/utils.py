@@ -1,5 +1,6 @@
 from decimal import Decimal
 from datetime import datetime, date
+from sqlalchemy import inspect
 from sqlalchemy.orm.state import InstanceState
 
 def json_safe(data):
@@ -17,3 +18,36 @@ def json_safe(data):
         return data.isoformat()
     else:
         return data
+
+
+def model_snapshot(obj):
+    """Column values of an ORM object, without relationships or internal state."""
+    return {attr.key: getattr(obj, attr.key) for attr in inspect(obj).mapper.column_attrs}
+
+
+def diff_changes(old_data, new_data):
+    """
+    Reduce a before/after pair to the fields whose value changed.
+
+    `new_data` may be partial (e.g. `model_dump(exclude_unset=True)`): fields it
+    doesn't mention are treated as unchanged. Returns `(old, new)` dicts holding
+    only the changed fields.
+    """
+    old = json_safe(old_data) or {}
+    new = json_safe(new_data) or {}
+    changed = [key for key, value in new.items() if key not in old or old[key] != value]
+    return (
+        {key: old[key] for key in changed if key in old},
+        {key: new[key] for key in changed},
+    )
+
+
+def apply_changes(state, action, new_data):
+    """Advance a replayed record state by one audit entry."""
+    if action == "DELETE":
+        return None
+    if action == "CREATE":
+        return dict(new_data or {})
+    state = dict(state or {})
+    state.update(new_data or {})
+    return state
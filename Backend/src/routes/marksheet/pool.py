@@ -0,0 +1,89 @@
+import asyncio
+import multiprocessing
+import threading
+from concurrent.futures import ProcessPoolExecutor
+
+from fastapi import HTTPException
+
+from src.config.settings import settings
+from src.util.cache import TTLCache
+
+
+class Slot:
+    """One claimed download. `release` is idempotent, so every way a download can end may call it."""
+
+    def __init__(self, pool: "MarksheetPool"):
+        self._pool = pool
+        self._held = True
+
+    def release(self):
+        if self._held:
+            self._held = False
+            self._pool.release()
+
+
+class MarksheetPool:
+    """
+    Process pool for marksheet rendering, started on first use. Rendering is
+    pure-Python string work, so processes rather than threads are needed to
+    use more than one core. At most `max_jobs` downloads run at once; further
+    ones are rejected instead of queueing behind a whole grade.
+    """
+
+    def __init__(self, workers: int, max_jobs: int, start_method: str):
+        self.workers = workers
+        self.max_jobs = max_jobs
+        self.start_method = start_method
+        self._executor = None
+        self._lock = threading.Lock()
+        self.running = 0
+        self.chunks = 0
+        self.rejected = 0
+
+    def _get_executor(self) -> ProcessPoolExecutor:
+        with self._lock:
+            if self._executor is None:
+                self._executor = ProcessPoolExecutor(
+                    max_workers=self.workers, mp_context=multiprocessing.get_context(self.start_method)
+                )
+            return self._executor
+
+    def acquire(self) -> Slot:
+        with self._lock:
+            if self.running >= self.max_jobs:
+                self.rejected += 1
+                raise HTTPException(
+                    status_code=503,
+                    detail="Too many marksheet downloads in progress, please retry shortly",
+                    headers={"Retry-After": "5"},
+                )
+            self.running += 1
+        return Slot(self)
+
+    def release(self):
+        with self._lock:
+            self.running -= 1
+
+    def submit(self, fn, *args) -> asyncio.Future:
+        self.chunks += 1
+        return asyncio.wrap_future(self._get_executor().submit(fn, *args))
+
+    def stats(self):
+        return {
+            "workers": self.workers,
+            "started": self._executor is not None,
+            "max_jobs": self.max_jobs,
+            "running": self.running,
+            "chunks": self.chunks,
+            "rejected": self.rejected,
+        }
+
+    def shutdown(self):
+        if self._executor is not None:
+            self._executor.shutdown(wait=False, cancel_futures=True)
+
+
+marksheet_pool = MarksheetPool(settings.MARKSHEET_WORKERS, settings.MARKSHEET_MAX_JOBS, settings.MARKSHEET_START_METHOD)
+
+# (grade_id, job_id) -> progress dict; per process, so poll the worker that serves the download
+marksheet_jobs = TTLCache(maxsize=256, ttl=3600)
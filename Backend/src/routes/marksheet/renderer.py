@@ -0,0 +1,91 @@
+"""
+Print-ready HTML marksheets.
+
+Runs inside the marksheet process pool, so it only imports the standard
+library: each worker receives plain dicts and returns (filename, bytes) pairs.
+"""
+import re
+from html import escape
+
+PAGE = """<!DOCTYPE html>
+<html lang="en">
+<head>
+<meta charset="utf-8">
+<title>Marksheet {roll} - {name}</title>
+<style>
+@page {{ size: A4; margin: 18mm 15mm; }}
+body {{ font-family: "DejaVu Sans", Arial, sans-serif; font-size: 11pt; color: #000; }}
+h1 {{ font-size: 16pt; text-align: center; margin: 0 0 2mm; }}
+h2 {{ font-size: 12pt; text-align: center; margin: 0 0 6mm; font-weight: normal; }}
+table {{ width: 100%; border-collapse: collapse; page-break-inside: avoid; }}
+th, td {{ border: 1px solid #000; padding: 1.5mm 2mm; }}
+th {{ background: #eee; }}
+td.n {{ text-align: right; }}
+td.c {{ text-align: center; }}
+.info td, .summary td {{ border: none; padding: 1mm 0; }}
+.summary {{ margin-top: 6mm; }}
+.fail {{ font-weight: bold; }}
+</style>
+</head>
+<body>
+<h1>Grade Sheet</h1>
+<h2>{grade} &middot; Academic Year {year}</h2>
+<table class="info">
+<tr><td>Name: <b>{name}</b></td><td>Roll No.: <b>{roll}</b></td></tr>
+</table>
+<table>
+<thead>
+<tr><th>Code</th><th>Subject</th><th>Credit Hour</th><th>Theory</th><th>Practical</th><th>Final Grade</th><th>Grade Point</th></tr>
+</thead>
+<tbody>
+{rows}
+</tbody>
+</table>
+<table class="summary">
+<tr><td>Grade Point Average (GPA): <b>{gpa:.2f}</b></td><td>Final Grade: <b>{final_grade}</b></td></tr>
+<tr><td>Percentage: <b>{percentage:.2f}%</b></td><td>Division: <b class="{result_class}">{division}</b></td></tr>
+</table>
+</body>
+</html>
+"""
+
+ROW = (
+    '<tr><td>{code}</td><td>{subject}</td><td class="n">{credit_hours:g}</td><td class="c">{th_grade}</td>'
+    '<td class="c">{pr_grade}</td><td class="c">{grade}</td><td class="n">{grade_point:.2f}</td></tr>'
+)
+
+
+def render_marksheet(sheet: dict) -> str:
+    rows = "\n".join(
+        ROW.format(
+            code=escape(s["sub_code"]),
+            subject=escape(s["sub_name"]),
+            credit_hours=s["credit_hours"],
+            th_grade=s["th_grade"] or "-",
+            pr_grade=s["pr_grade"] or "-",
+            grade=s["grade"],
+            grade_point=s["grade_point"],
+        )
+        for s in sheet["subjects"]
+    )
+    return PAGE.format(
+        grade=escape(sheet["grade"]),
+        year=escape(sheet["year"]),
+        name=escape(sheet["name"]),
+        roll=escape(sheet["roll"]),
+        rows=rows,
+        gpa=sheet["gpa"],
+        final_grade=sheet["final_grade"],
+        percentage=sheet["percentage"],
+        division=sheet["division"],
+        result_class="" if sheet["passed"] else "fail",
+    )
+
+
+def marksheet_filename(sheet: dict) -> str:
+    # roll first so the archive lists in roll order; the id keeps names unique
+    return f"{re.sub(r'[^A-Za-z0-9_-]+', '_', sheet['roll'])}-{sheet['student_id']}.html"
+
+
+def render_chunk(sheets: list[dict]) -> list[tuple[str, bytes]]:
+    return [(marksheet_filename(sheet), render_marksheet(sheet).encode("utf-8")) for sheet in sheets]
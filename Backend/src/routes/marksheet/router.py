@@ -0,0 +1,59 @@
+from fastapi import APIRouter, Depends
+from fastapi.responses import StreamingResponse
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from src.config.database import get_async_db
+from src.config.dependencies import user_only
+from src.routes.grade.dependencies import get_grade_context
+from src.routes.grade.schema import GradeContext
+
+from .schema import MarksheetJob
+from .service import MarksheetService
+
+router = APIRouter(prefix="/marksheets", tags=["Marksheets"])
+
+
+class MarksheetResponse(StreamingResponse):
+    """Finishes the job however the response ends, including when the body is never iterated."""
+
+    def __init__(self, on_close, *args, **kwargs):
+        super().__init__(*args, **kwargs)
+        self.on_close = on_close
+
+    async def __call__(self, scope, receive, send):
+        try:
+            await super().__call__(scope, receive, send)
+        finally:
+            self.on_close()
+
+
+@router.get("/", dependencies=[Depends(user_only)])
+async def download_marksheets(
+    year: str | None = None,
+    job_id: str | None = None,
+    db: AsyncSession = Depends(get_async_db),
+    grade: GradeContext = Depends(get_grade_context),
+):
+    """
+    ZIP of print-ready HTML marksheets for every active student of the grade.
+    Pass your own `job_id` to poll /marksheets/jobs/{job_id} from the start.
+    """
+    job, slot, stream = await MarksheetService.start(db, grade, year, job_id)
+    try:
+        return MarksheetResponse(
+            lambda: MarksheetService.finish(job, slot),
+            stream,
+            media_type="application/zip",
+            headers={
+                "Content-Disposition": f'attachment; filename="marksheets-{grade.code}-{job["year"]}.zip"',
+                "X-Marksheet-Job": job["job_id"],
+            },
+        )
+    except BaseException:
+        MarksheetService.finish(job, slot)
+        raise
+
+
+@router.get("/jobs/{job_id}", response_model=MarksheetJob, dependencies=[Depends(user_only)])
+def get_marksheet_job(job_id: str, grade: GradeContext = Depends(get_grade_context)):
+    return MarksheetService.get_job(job_id, grade)
@@ -0,0 +1,14 @@
+from datetime import datetime
+
+from pydantic import BaseModel
+
+
+class MarksheetJob(BaseModel):
+    job_id: str
+    grade_id: int
+    year: str
+    status: str  # running | done | failed | cancelled
+    total: int
+    rendered: int
+    started_at: datetime
+    finished_at: datetime | None = None
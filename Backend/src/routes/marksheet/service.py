@@ -0,0 +1,117 @@
+import asyncio
+import logging
+import re
+import uuid
+import zipfile
+from datetime import datetime, timezone
+
+from sqlalchemy.ext.asyncio import AsyncSession
+from fastapi import HTTPException
+
+from .pool import Slot, marksheet_pool, marksheet_jobs
+from .renderer import render_chunk
+from src.config.settings import settings
+from src.routes.grade.schema import GradeContext
+from src.routes.result.service import ResultService
+from src.util.streaming import ZipSink
+
+logger = logging.getLogger(__name__)
+
+# job ids travel in the X-Marksheet-Job header and URLs
+JOB_ID_RE = re.compile(r"^[A-Za-z0-9_-]{1,64}$")
+
+
+class MarksheetService:
+
+    @staticmethod
+    async def load_sheets(db: AsyncSession, grade: GradeContext, year: str) -> list[dict]:
+        """One engine run for the grade (students, subjects, electives, marks) flattened into render input."""
+        result = await ResultService.compute(db, grade.id, year)
+        credit_hours = {s.id: float(s.Th_ch or 0) + float(s.Pr_ch or 0) for s in result.subjects}
+        sheets = []
+        for index in range(len(result.students)):
+            detail = result.detail(index)
+            sheets.append({
+                "grade": grade.name, "year": year, "student_id": detail["student_id"], "roll": detail["roll"],
+                "name": detail["name"], "gpa": detail["gpa"], "final_grade": detail["grade"],
+                "percentage": detail["percentage"], "division": detail["division"], "passed": detail["passed"],
+                "subjects": [{**s, "credit_hours": credit_hours[s["subject_id"]]} for s in detail["subjects"]],
+            })
+        return sheets
+
+    @staticmethod
+    async def start(db: AsyncSession, grade: GradeContext, year: str | None, job_id: str | None):
+        """
+        Load the grade and claim a pool slot; returns the job, the slot and the ZIP
+        byte stream. The caller must hand the slot to `finish` if the stream is
+        never iterated (the stream finishes the job itself otherwise).
+        """
+        if job_id is not None and not JOB_ID_RE.match(job_id):
+            raise HTTPException(status_code=400, detail="job_id must be 1-64 letters, digits, '_' or '-'")
+        year = await ResultService.resolve_year(db, year)
+        sheets = await MarksheetService.load_sheets(db, grade, year)
+        if not sheets:
+            raise HTTPException(status_code=404, detail="No active students in this grade")
+
+        slot = marksheet_pool.acquire()
+        job = {
+            "job_id": job_id or uuid.uuid4().hex, "grade_id": grade.id, "year": year, "status": "running",
+            "total": len(sheets), "rendered": 0, "started_at": datetime.now(timezone.utc), "finished_at": None,
+        }
+        marksheet_jobs.set((grade.id, job["job_id"]), job)
+        return job, slot, MarksheetService._stream(sheets, job, slot)
+
+    @staticmethod
+    def finish(job: dict, slot: Slot):
+        """Close the job and free its slot; safe to call more than once."""
+        if job["status"] == "running":
+            job["status"] = "cancelled"  # client went away, or the body was never sent
+        if job["finished_at"] is None:
+            job["finished_at"] = datetime.now(timezone.utc)
+        slot.release()
+
+    @staticmethod
+    async def _stream(sheets: list[dict], job: dict, slot: Slot):
+        """
+        Fan MARKSHEET_CHUNK students per task out to the pool and add each chunk to
+        the archive as soon as it is rendered, in completion order. Deflating a
+        chunk runs on a worker thread, off the event loop.
+        """
+        sink = ZipSink()
+        archive = zipfile.ZipFile(sink, "w", compression=zipfile.ZIP_DEFLATED)
+        size = max(settings.MARKSHEET_CHUNK, 1)
+        futures = [marksheet_pool.submit(render_chunk, sheets[i:i + size]) for i in range(0, len(sheets), size)]
+        try:
+            for finished in asyncio.as_completed(futures):
+                files = await finished
+                await asyncio.to_thread(MarksheetService._add_files, archive, files)
+                job["rendered"] += len(files)
+                logger.info("Marksheet job %s: %d/%d rendered", job["job_id"], job["rendered"], job["total"])
+                yield sink.drain()
+            archive.close()
+            job["status"] = "done"
+            yield sink.drain()
+        except asyncio.CancelledError:
+            job["status"] = "cancelled"
+            raise
+        except Exception:
+            job["status"] = "failed"
+            logger.exception("Marksheet job %s failed", job["job_id"])
+            raise
+        finally:
+            for future in futures:
+                future.cancel()
+            MarksheetService.finish(job, slot)
+
+    @staticmethod
+    def _add_files(archive: zipfile.ZipFile, files: list[tuple[str, bytes]]):
+        # one chunk at a time: the next call starts only after this one returned
+        for filename, body in files:
+            archive.writestr(filename, body)
+
+    @staticmethod
+    def get_job(job_id: str, grade: GradeContext) -> dict:
+        job = marksheet_jobs.get((grade.id, job_id))
+        if not job:
+            raise HTTPException(status_code=404, detail="Marksheet job not found")
+        return job
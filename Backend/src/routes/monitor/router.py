@@ -0,0 +1,56 @@
+from fastapi import APIRouter, Depends
+
+from src.config.database import get_pool_stats
+from src.config.dependencies import admin_only
+from src.routes.auth.dependencies import token_versions
+from src.routes.auth.hashing import hashing_pool
+from src.routes.log.services import audit_writer
+from src.routes.marksheet.pool import marksheet_pool
+from src.routes.grade.cache import grade_contexts
+from src.routes.year.cache import current_year_cache
+from src.routes.result.cache import grade_results, student_results
+from src.routes.published.store import snapshots, published_years
+from src.routes.published.cache import lookup_cache, lookup_limiter, lookup_flight
+from src.util.versions import table_versions
+
+router = APIRouter(prefix="/monitor", tags=["Monitor"], dependencies=[Depends(admin_only)])
+
+
+@router.get("/db-pool")
+def db_pool_stats():
+    return get_pool_stats()
+
+
+@router.get("/hashing")
+def hashing_stats():
+    return hashing_pool.stats()
+
+
+@router.get("/marksheets")
+def marksheet_stats():
+    return marksheet_pool.stats()
+
+
+@router.get("/public-lookups")
+def public_lookup_stats():
+    return {"cache": lookup_cache.stats(), "throttle": lookup_limiter.stats(), "coalescing": lookup_flight.stats()}
+
+
+@router.get("/audit")
+def audit_stats():
+    return audit_writer.stats()
+
+
+@router.get("/caches")
+def cache_stats():
+    return {
+        "token_versions": token_versions.stats(),
+        "grade_contexts": grade_contexts.stats(),
+        "current_year": current_year_cache.stats(),
+        "table_versions": table_versions.stats(),
+        "grade_results": grade_results.stats(),
+        "student_results": student_results.stats(),
+        "published_snapshots": snapshots.stats(),
+        "published_years": published_years.stats(),
+        "public_lookups": lookup_cache.stats(),
+    }
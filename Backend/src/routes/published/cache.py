@@ -0,0 +1,29 @@
+"""
+State of the public result lookup, per worker: the hot answer cache (dropped for
+a year whenever any of its grades is republished), the per-IP token bucket and
+the single-flight table that lets concurrent identical misses share one read.
+"""
+from src.config.settings import settings
+from src.util.cache import TTLCache
+from src.util.invalidation import invalidation_channel
+from src.util.ratelimit import TokenBucketLimiter
+from src.util.singleflight import SingleFlight
+
+# (year, roll, grade code or None) -> (status code, JSON body); 404/409 answers are cached too
+lookup_cache = TTLCache(maxsize=settings.PUBLIC_LOOKUP_CACHE_SIZE, ttl=settings.PUBLIC_LOOKUP_CACHE_TTL)
+lookup_limiter = TokenBucketLimiter(settings.PUBLIC_LOOKUP_RATE, settings.PUBLIC_LOOKUP_BURST)
+lookup_flight = SingleFlight()
+
+
+def _on_published(key):
+    # a new version of any grade can change every answer of that year (even "not found"/"ambiguous")
+    if key is None:
+        lookup_cache.clear()
+        return
+    year = key.split("|", 1)[0]
+    for cache_key in lookup_cache.keys():
+        if cache_key[0] == year:
+            lookup_cache.pop(cache_key)
+
+
+invalidation_channel.subscribe("published", _on_published)
@@ -0,0 +1,54 @@
+import math
+
+from fastapi import APIRouter, Depends, HTTPException, Request, Response
+from sqlalchemy.orm import Session
+
+from src.config.database import get_db
+from src.config.settings import settings
+from src.config.dependencies import user_only
+from src.routes.auth.dependencies import get_current_user
+from src.routes.auth.model import User
+from src.routes.grade.dependencies import get_grade_context
+from src.routes.grade.schema import GradeContext
+from src.util.ratelimit import client_ip
+
+from .cache import lookup_limiter
+from .schema import PublishResult, PublishedVersion, PublishedResult
+from .service import PublishService
+
+router = APIRouter(prefix="/published", tags=["Published Results"])
+
+
+@router.post("/", response_model=PublishResult, dependencies=[Depends(user_only)])
+def publish_results(
+    year: str | None = None,
+    db: Session = Depends(get_db),
+    current_user: User = Depends(get_current_user),
+    grade: GradeContext = Depends(get_grade_context),
+):
+    return PublishService.publish(db, grade, year, current_user)
+
+
+@router.get("/versions", response_model=list[PublishedVersion], dependencies=[Depends(user_only)])
+def list_published_versions(year: str, grade: GradeContext = Depends(get_grade_context)):
+    return PublishService.list_versions(grade, year)
+
+
+# ---------------- PUBLIC ----------------
+@router.get("/{year}/{roll}", response_model=PublishedResult)
+async def get_published_result(year: str, roll: str, request: Request, grade: str | None = None):
+    """
+    No login and no database: answers come from the hot lookup cache or the
+    memory-mapped snapshot of the published version. Each client IP gets
+    PUBLIC_LOOKUP_BURST lookups, refilled at PUBLIC_LOOKUP_RATE per second.
+    """
+    wait = lookup_limiter.acquire(client_ip(request, settings.TRUST_FORWARDED_FOR))
+    if wait:
+        raise HTTPException(
+            status_code=429,
+            detail="Too many lookups, please retry shortly",
+            headers={"Retry-After": str(math.ceil(wait))},
+        )
+    status_code, body = await PublishService.cached_lookup(year, roll, grade)
+    headers = {"Cache-Control": f"public, max-age={settings.PUBLIC_RESULT_MAX_AGE}"} if status_code == 200 else None
+    return Response(content=body, status_code=status_code, media_type="application/json", headers=headers)
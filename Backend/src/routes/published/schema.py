@@ -0,0 +1,49 @@
+from datetime import datetime
+
+from pydantic import BaseModel
+
+
+class PublishResult(BaseModel):
+    year: str
+    version: int
+    students: int
+    missing_marks: int  # students published with at least one mark not entered
+    bytes: int
+    published_at: datetime
+
+
+class PublishedVersion(BaseModel):
+    version: int
+    published_at: datetime
+    students: int
+    bytes: int
+    current: bool
+
+
+class PublishedSubject(BaseModel):
+    sub_code: str
+    sub_name: str
+    credit_hours: float
+    th_grade: str | None = None
+    pr_grade: str | None = None
+    grade: str
+    grade_point: float
+    passed: bool
+
+
+class PublishedResult(BaseModel):
+    grade_code: str
+    grade_name: str
+    year: str
+    version: int
+    published_at: datetime
+    roll: str
+    name: str
+    percentage: float
+    gpa: float
+    grade: str
+    division: str
+    passed: bool
+    rank: int
+    out_of: int
+    subjects: list[PublishedSubject]
@@ -0,0 +1,204 @@
+import os
+from bisect import bisect_left
+from collections import Counter
+from datetime import datetime, timezone
+
+import numpy as np
+import orjson
+from sqlalchemy.orm import Session
+from fastapi import HTTPException
+from starlette.concurrency import run_in_threadpool
+
+from . import store
+from .cache import lookup_cache, lookup_flight
+from .schema import PublishedResult
+from .snapshot import NO_LABEL, Snapshot, write_snapshot
+from src.routes.grade.schema import GradeContext
+from src.routes.log.services import log_action
+from src.routes.result.cache import rank_key
+from src.routes.result.engine import DIVISIONS, GPA_LETTERS, GRADE_LETTERS
+from src.routes.result.service import ResultService, RankingService
+from src.util.projection import adapter
+
+# final grades of subjects and of the GPA, including the fail grade
+GRADE_LABELS = list(GPA_LETTERS) + ["NG"]
+
+
+def _codes(values, labels) -> np.ndarray:
+    codes = np.full(np.shape(values), NO_LABEL, dtype=np.uint8)
+    for code, label in enumerate(labels):
+        codes[values == label] = code
+    return codes
+
+
+def _columns(result) -> dict[str, np.ndarray]:
+    r = result.results
+    rolls = [s.roll.encode("utf-8") for s in result.students]
+    roll = np.array(rolls, dtype=f"S{max(map(len, rolls)) or 1}")
+    roll_order = np.argsort(roll, kind="stable").astype(np.int32)
+    names = [s.name.encode("utf-8") for s in result.students]
+    summaries = result.summaries()
+    keys = sorted(rank_key(s) for s in summaries)
+    return {
+        "student_id": r.student_ids.astype(np.int32),
+        "roll": roll,
+        "roll_sorted": roll[roll_order],
+        "roll_order": roll_order,
+        "name_offsets": np.concatenate([[0], np.cumsum([len(n) for n in names])]).astype(np.int32),
+        "name_blob": np.frombuffer(b"".join(names), dtype=np.uint8),
+        "percentage": r.percentage.astype(np.float32),
+        "gpa": r.gpa.astype(np.float32),
+        "grade": _codes(r.grade, GRADE_LABELS),
+        "division": _codes(r.division, list(DIVISIONS)),
+        "passed": r.passed.astype(bool),
+        "rank": np.array([bisect_left(keys, rank_key(s)) + 1 for s in summaries], dtype=np.int32),
+        "enrolled": r.enrolled.astype(bool),
+        "th_grade": _codes(r.th_grade, list(GRADE_LETTERS)),
+        "pr_grade": _codes(r.pr_grade, list(GRADE_LETTERS)),
+        "subject_grade": _codes(r.subject_grade, GRADE_LABELS),
+        "subject_gp": r.subject_gp.astype(np.float32),
+        "subject_passed": r.subject_passed.astype(bool),
+    }
+
+
+class PublishService:
+
+    # ---------------- PUBLISH ----------------
+    @staticmethod
+    def publish(db: Session, grade: GradeContext, year: str | None, user):
+        """
+        Freeze the grade/year results into a new snapshot version and make it current.
+        The file is complete and fsynced before the audit row commits and before
+        CURRENT names it; a failure at any step leaves the previous version live.
+        """
+        year = RankingService.resolve_year_sync(db, year)
+        if not store.valid_year(year):
+            raise HTTPException(status_code=400, detail="This year cannot be published")
+        result = ResultService.compute_sync(db, grade.id, year)
+        if not result.students:
+            raise HTTPException(status_code=400, detail="No active students in this grade")
+        # the public lookup finds one row per roll; a repeated roll would answer with either student
+        duplicates = sorted(roll for roll, n in Counter(s.roll for s in result.students).items() if n > 1)
+        if duplicates:
+            raise HTTPException(
+                status_code=400,
+                detail=f"Roll numbers are shared by more than one active student: {', '.join(duplicates)}",
+            )
+
+        published_at = datetime.now(timezone.utc)
+        header = {
+            "grade_id": grade.id, "grade_code": grade.code, "grade_name": grade.name, "year": year,
+            "published_at": published_at.isoformat(), "count": len(result.students),
+            "subjects": [
+                {"id": s.id, "code": s.sub_code, "name": s.sub_name, "th_ch": float(s.Th_ch or 0),
+                 "pr_ch": float(s.Pr_ch or 0)}
+                for s in result.subjects
+            ],
+            "labels": {"grade": GRADE_LABELS, "division": list(DIVISIONS), "component": list(GRADE_LETTERS)},
+        }
+
+        version, f = store.create_version(year, grade.id)
+        try:
+            with f:
+                write_snapshot(f, {**header, "version": version}, _columns(result))
+                f.flush()
+                os.fsync(f.fileno())
+            missing = int((result.results.missing > 0).sum())
+            log_action(
+                db=db,
+                user_id=user.id,
+                action="PUBLISH",
+                table_name="published_results",
+                record_id=version,
+                new_data={"grade_id": grade.id, "year": year, "version": version, "students": header["count"],
+                          "missing_marks": missing},
+                strict=True,
+            )
+            db.commit()
+        except BaseException:
+            os.remove(f.name)
+            raise
+        store.set_current(year, grade.id, version)
+
+        return {
+            "year": year, "version": version, "students": header["count"], "missing_marks": missing,
+            "bytes": os.path.getsize(f.name), "published_at": published_at,
+        }
+
+    @staticmethod
+    def list_versions(grade: GradeContext, year: str):
+        if not store.valid_year(year):
+            return []
+        current = store.current_path(year, grade.id)
+        out = []
+        for version in store.versions(year, grade.id):
+            path = os.path.join(store.grade_dir(year, grade.id), f"v{version}.res")
+            try:
+                snapshot = Snapshot(path)
+            except ValueError:
+                continue  # a publish in progress or one that failed midway
+            out.append({
+                "version": version, "published_at": snapshot.header["published_at"],
+                "students": snapshot.header["count"], "bytes": snapshot.size, "current": path == current,
+            })
+            snapshot.close()
+        return out
+
+    # ---------------- PUBLIC LOOKUP ----------------
+    @staticmethod
+    def lookup(year: str, roll: str, grade_code: str | None = None) -> dict:
+        """A published result by roll number, read from the memory-mapped snapshots only."""
+        if not store.valid_year(year):
+            raise HTTPException(status_code=404, detail="No published result for this roll number")
+        matches = []
+        for grade_id in store.published_grades(year):
+            snapshot = store.open_current(year, grade_id)
+            if snapshot is None or (grade_code is not None and snapshot.header["grade_code"] != grade_code):
+                continue
+            row = snapshot.find(roll)
+            if row is not None:
+                matches.append((snapshot, row))
+        if not matches:
+            raise HTTPException(status_code=404, detail="No published result for this roll number")
+        if len(matches) > 1:
+            raise HTTPException(status_code=409, detail="Roll number is published in more than one grade, pass grade")
+        snapshot, row = matches[0]
+        return snapshot.record(row)
+
+    @staticmethod
+    async def cached_lookup(year: str, roll: str, grade_code: str | None = None) -> tuple[int, bytes]:
+        """
+        (status, JSON body) of a lookup. Hits come from the hot cache; a miss on
+        mapped snapshots is a binary search read inline (tens of microseconds, less
+        than a threadpool hop). Only a miss that has to list and map files runs in
+        the threadpool, and concurrent misses for the same key share that one read.
+        """
+        key = (year, roll, grade_code)
+        hit = lookup_cache.get(key)
+        if hit is not None:
+            return hit
+        if store.is_open(year):
+            generation = lookup_cache.generation
+            value = PublishService._answer(*key)
+            lookup_cache.set(key, value, generation)
+            return value
+        return await lookup_flight.do(key, lambda: PublishService._load_lookup(key))
+
+    @staticmethod
+    async def _load_lookup(key) -> tuple[int, bytes]:
+        generation = lookup_cache.generation
+        value = await run_in_threadpool(PublishService._answer, *key)
+        lookup_cache.set(key, value, generation)
+        return value
+
+    @staticmethod
+    def _answer(year: str, roll: str, grade_code: str | None) -> tuple[int, bytes]:
+        """A serialized lookup; 404/409 are answers worth caching too, other errors propagate."""
+        try:
+            record = PublishService.lookup(year, roll, grade_code)
+        except HTTPException as e:
+            if e.status_code not in (404, 409):
+                raise
+            return e.status_code, orjson.dumps({"detail": e.detail})
+        tp = adapter(PublishedResult)
+        return 200, tp.dump_json(tp.validate_python(record))
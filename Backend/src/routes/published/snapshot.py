@@ -0,0 +1,132 @@
+"""
+Published result snapshots.
+
+One immutable file per published grade/year version:
+
+    magic "RESSNAP1" | uint32 header length | JSON header | columns
+
+The header carries the grade, year, version, subjects, label tables and, for
+every column, its dtype, shape and byte offset. Columns are 64-byte aligned raw
+NumPy arrays, so a reader memory-maps the file and wraps each column with
+`np.frombuffer` without copying or parsing anything. Per-student columns have
+one row per student (roll order), per-subject columns are (students x subjects);
+letters are stored as uint8 codes into the header's label tables. `roll` is kept
+sorted alongside `roll_order`, the roll-number index binary-searched by `find`.
+"""
+import json
+import mmap
+import os
+import struct
+
+import numpy as np
+
+MAGIC = b"RESSNAP1"
+ALIGN = 64
+NO_LABEL = 255  # component not taken
+
+
+def _pad(length: int) -> int:
+    return -length % ALIGN
+
+
+def write_snapshot(fileobj, header: dict, columns: dict[str, np.ndarray]):
+    """Write header + aligned columns to an open binary file (the caller fsyncs and publishes it)."""
+    layout, offset = {}, 0
+    for name, array in columns.items():
+        layout[name] = {"dtype": array.dtype.str, "shape": list(array.shape), "offset": offset}
+        offset += array.nbytes + _pad(array.nbytes)
+
+    head = json.dumps({**header, "columns": layout}, separators=(",", ":")).encode("utf-8")
+    start = len(MAGIC) + 4 + len(head)
+    fileobj.write(MAGIC + struct.pack("<I", len(head)) + head + b"\0" * _pad(start))
+    for array in columns.values():
+        data = np.ascontiguousarray(array).tobytes()
+        fileobj.write(data + b"\0" * _pad(len(data)))
+
+
+class Snapshot:
+    """A memory-mapped snapshot; columns are zero-copy views into the file."""
+
+    def __init__(self, path: str):
+        self.path = path
+        with open(path, "rb") as f:
+            self._mmap = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+        if self._mmap[:len(MAGIC)] != MAGIC:
+            raise ValueError(f"{path} is not a result snapshot")
+        (length,) = struct.unpack_from("<I", self._mmap, len(MAGIC))
+        start = len(MAGIC) + 4
+        self.header = json.loads(self._mmap[start:start + length].decode("utf-8"))
+        self._base = start + length + _pad(start + length)
+        self._columns = {}
+
+    def column(self, name: str) -> np.ndarray:
+        array = self._columns.get(name)
+        if array is None:
+            spec = self.header["columns"][name]
+            dtype = np.dtype(spec["dtype"])
+            count = int(np.prod(spec["shape"], dtype=np.int64))
+            array = np.frombuffer(self._mmap, dtype=dtype, count=count, offset=self._base + spec["offset"])
+            array = self._columns[name] = array.reshape(spec["shape"])
+        return array
+
+    def find(self, roll: str) -> int | None:
+        """Row of `roll`, by binary search over the sorted roll index."""
+        rolls = self.column("roll_sorted")
+        encoded = roll.encode("utf-8")
+        if not encoded or len(encoded) > rolls.dtype.itemsize:
+            return None  # would be truncated into a different roll
+        key = np.array(encoded, dtype=rolls.dtype)
+        pos = int(np.searchsorted(rolls, key))
+        if pos < len(rolls) and rolls[pos] == key:
+            return int(self.column("roll_order")[pos])
+        return None
+
+    def name(self, row: int) -> str:
+        offsets = self.column("name_offsets")
+        return bytes(self.column("name_blob")[offsets[row]:offsets[row + 1]]).decode("utf-8")
+
+    def record(self, row: int) -> dict:
+        h, labels = self.header, self.header["labels"]
+
+        def label(table, code):
+            return None if code == NO_LABEL else labels[table][code]
+
+        enrolled = self.column("enrolled")[row]
+        th_grade, pr_grade = self.column("th_grade")[row], self.column("pr_grade")[row]
+        subject_grade, subject_gp = self.column("subject_grade")[row], self.column("subject_gp")[row]
+        subject_passed = self.column("subject_passed")[row]
+        subjects = [
+            {
+                "sub_code": subject["code"], "sub_name": subject["name"],
+                "credit_hours": subject["th_ch"] + subject["pr_ch"],
+                "th_grade": label("component", th_grade[j]), "pr_grade": label("component", pr_grade[j]),
+                "grade": labels["grade"][subject_grade[j]], "grade_point": round(float(subject_gp[j]), 2),
+                "passed": bool(subject_passed[j]),
+            }
+            for j, subject in enumerate(h["subjects"])
+            if enrolled[j]
+        ]
+        return {
+            "grade_code": h["grade_code"], "grade_name": h["grade_name"], "year": h["year"],
+            "version": h["version"], "published_at": h["published_at"],
+            "roll": self.column("roll")[row].decode("utf-8"), "name": self.name(row),
+            "percentage": round(float(self.column("percentage")[row]), 2),
+            "gpa": round(float(self.column("gpa")[row]), 2),
+            "grade": labels["grade"][self.column("grade")[row]],
+            "division": labels["division"][self.column("division")[row]],
+            "passed": bool(self.column("passed")[row]),
+            "rank": int(self.column("rank")[row]),
+            "out_of": h["count"],
+            "subjects": subjects,
+        }
+
+    def close(self):
+        self._columns.clear()
+        try:
+            self._mmap.close()
+        except BufferError:
+            pass  # a column view is still referenced; the map goes when it does
+
+    @property
+    def size(self) -> int:
+        return os.path.getsize(self.path)
@@ -0,0 +1,131 @@
+"""
+On-disk layout of published results:
+
+    PUBLISHED_RESULTS_DIR/<year>/<grade_id>/v<N>.res   immutable snapshots
+    PUBLISHED_RESULTS_DIR/<year>/<grade_id>/CURRENT    "v<N>.res", swapped with os.replace
+
+(<year> percent-encoded.)
+A version file is created exclusively, written, fsynced and only then named in
+CURRENT, so readers never see a partial file and republishing is atomic. Old
+versions stay on disk: a worker still mapping one keeps reading it safely.
+"""
+import os
+import re
+from urllib.parse import quote
+
+from src.config.settings import settings
+from src.util.cache import TTLCache
+from src.util.invalidation import invalidation_channel
+from .snapshot import Snapshot
+
+CURRENT = "CURRENT"
+_VERSION_RE = re.compile(r"^v(\d+)\.res$")
+
+# (year, grade_id) -> open current Snapshot
+snapshots = TTLCache(maxsize=settings.PUBLISHED_CACHE_SIZE, ttl=settings.PUBLISHED_CACHE_TTL)
+# year -> grade ids published for it; only years that have any, so unknown years
+# from the public lookup cannot push listings (or open snapshots) out
+published_years = TTLCache(maxsize=64, ttl=settings.PUBLISHED_CACHE_TTL)
+
+
+def _on_published(key):
+    # snapshots are not closed here: a lookup may still be reading one, the map goes with the last reference
+    if key is None:
+        snapshots.clear()
+        published_years.clear()
+        return
+    year, grade_id = key.split("|", 1)
+    snapshots.pop((year, int(grade_id)))
+    published_years.pop(year)
+
+
+invalidation_channel.subscribe("published", _on_published)
+
+
+def valid_year(year: str) -> bool:
+    return 0 < len(year) <= 10 and year not in (".", "..")
+
+
+def year_dir(year: str) -> str:
+    # percent-encoded so a year like "2081/82" stays one path segment
+    return os.path.join(settings.PUBLISHED_RESULTS_DIR, quote(year, safe=""))
+
+
+def grade_dir(year: str, grade_id: int) -> str:
+    return os.path.join(year_dir(year), str(grade_id))
+
+
+def versions(year: str, grade_id: int) -> list[int]:
+    try:
+        names = os.listdir(grade_dir(year, grade_id))
+    except FileNotFoundError:
+        return []
+    return sorted(int(m.group(1)) for m in map(_VERSION_RE.match, names) if m)
+
+
+def current_path(year: str, grade_id: int) -> str | None:
+    directory = grade_dir(year, grade_id)
+    try:
+        with open(os.path.join(directory, CURRENT), encoding="ascii") as f:
+            name = f.read().strip()
+    except FileNotFoundError:
+        return None
+    return os.path.join(directory, name) if _VERSION_RE.match(name) else None
+
+
+def create_version(year: str, grade_id: int):
+    """Reserve the next version number by creating its file exclusively; returns (version, open file)."""
+    directory = grade_dir(year, grade_id)
+    os.makedirs(directory, exist_ok=True)
+    version = (versions(year, grade_id) or [0])[-1] + 1
+    while True:
+        try:
+            return version, open(os.path.join(directory, f"v{version}.res"), "xb")
+        except FileExistsError:
+            version += 1  # a concurrent publish took it
+
+
+def set_current(year: str, grade_id: int, version: int):
+    """Point CURRENT at `version` atomically, then drop cached snapshots in every worker."""
+    directory = grade_dir(year, grade_id)
+    tmp = os.path.join(directory, f".{CURRENT}.{os.getpid()}.tmp")
+    with open(tmp, "w", encoding="ascii") as f:
+        f.write(f"v{version}.res")
+        f.flush()
+        os.fsync(f.fileno())
+    os.replace(tmp, os.path.join(directory, CURRENT))
+    invalidation_channel.publish("published", f"{year}|{grade_id}")
+
+
+def open_current(year: str, grade_id: int) -> Snapshot | None:
+    key = (year, grade_id)
+    snapshot = snapshots.get(key)
+    if snapshot is None:
+        generation = snapshots.generation
+        path = current_path(year, grade_id)
+        if path is None:
+            return None
+        snapshot = Snapshot(path)
+        snapshots.set(key, snapshot, generation)
+    return snapshot
+
+
+def is_open(year: str) -> bool:
+    """Whether every snapshot of `year` is already mapped, so a lookup touches no file system."""
+    grade_ids = published_years.get(year)
+    return grade_ids is not None and all(snapshots.get((year, grade_id)) is not None for grade_id in grade_ids)
+
+
+def published_grades(year: str) -> list[int]:
+    """Grade ids with a published snapshot for `year` (directory listing, cached when not empty)."""
+    grade_ids = published_years.get(year)
+    if grade_ids is None:
+        generation = published_years.generation
+        try:
+            names = os.listdir(year_dir(year))
+        except FileNotFoundError:
+            return []
+        grade_ids = sorted(int(n) for n in names if n.isdigit())
+        if grade_ids:
+            published_years.set(year, grade_ids, generation)
+    return grade_ids
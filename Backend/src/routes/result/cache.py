@@ -0,0 +1,164 @@
+"""
+Dependency-tracked result cache.
+
+`grade_results` keeps one `CachedGrade` per (grade_id, year): every active
+student's summary plus a sorted list of ranking keys. Writers publish which
+students they touched (`invalidate_results`); those students are only marked
+dirty, and the next read recomputes just them, swaps their summaries and moves
+their ranking keys. Only a change that can touch every student (a compulsory
+subject, a subject becoming elective, ...) drops the whole entry.
+
+`student_results` holds per-student detail responses (without rank, which
+moves whenever anyone else's GPA does) and loses only the touched students.
+
+Writers also `bump_results` in their transaction, which is what tells a
+materialized ranking (result_versions) that it is behind.
+"""
+import asyncio
+from bisect import bisect_left, insort
+
+from sqlalchemy import update
+from sqlalchemy.orm import Session
+
+from .model import ResultVersion
+from src.config.settings import settings
+from src.util.cache import TTLCache
+from src.util.invalidation import invalidation_channel
+
+# CacheInvalidation.key is 255 characters; bigger batches invalidate the whole grade
+MAX_KEY_LENGTH = 255
+MAX_STUDENTS_PER_INVALIDATION = 200
+
+
+def rank_key(summary: dict) -> tuple:
+    """Passed students first, then higher GPA, then higher percentage. Equal keys share a rank."""
+    return (not summary["passed"], -summary["gpa"], -summary["percentage"])
+
+
+class CachedGrade:
+    def __init__(self):
+        self.rows = {}  # student_id -> summary
+        self.keys = []  # sorted rank keys of every row
+        self.dirty = set()
+        self.stale = False  # whole-grade invalidation arrived while loading
+        self.refreshing = asyncio.Lock()  # one dirty recompute at a time, so patches land in order
+        self._ordered = None
+
+    def load(self, summaries: list[dict]):
+        self.rows = {s["student_id"]: s for s in summaries}
+        self.keys = sorted(rank_key(s) for s in summaries)
+        self._ordered = summaries
+
+    def take_dirty(self) -> set:
+        dirty, self.dirty = self.dirty, set()
+        return dirty
+
+    def patch(self, student_ids, summaries: list[dict]):
+        """Replace the rows of `student_ids`; ids missing from `summaries` left the grade."""
+        fresh = {s["student_id"]: s for s in summaries}
+        for student_id in student_ids:
+            old = self.rows.pop(student_id, None)
+            if old is not None:
+                del self.keys[bisect_left(self.keys, rank_key(old))]
+            new = fresh.get(student_id)
+            if new is not None:
+                self.rows[student_id] = new
+                insort(self.keys, rank_key(new))
+        self._ordered = None
+
+    def rank(self, summary: dict) -> int:
+        return bisect_left(self.keys, rank_key(summary)) + 1
+
+    def ordered(self) -> list[dict]:
+        """Summaries in roll order, each with its current rank."""
+        if self._ordered is None:
+            self._ordered = sorted(self.rows.values(), key=lambda s: (s["roll"], s["student_id"]))
+        return [{**s, "rank": self.rank(s)} for s in self._ordered]
+
+
+# (grade_id, year) -> CachedGrade
+grade_results = TTLCache(maxsize=settings.RESULT_CACHE_SIZE, ttl=settings.RESULT_CACHE_TTL)
+# (grade_id, year, student_id) -> detail dict without rank
+student_results = TTLCache(maxsize=settings.STUDENT_RESULT_CACHE_SIZE, ttl=settings.RESULT_CACHE_TTL)
+# (grade_id, year) -> CachedGrade entries being loaded, so invalidations reach them too
+loading = {}
+
+
+def _matches(cache_key, grade_id, year):
+    return grade_id is None or (cache_key[0] == grade_id and (year is None or cache_key[1] == year))
+
+
+def _on_results_invalidated(key):
+    if key is None:
+        grade_id = year = student_ids = None
+    else:
+        grade, year, ids = key.split("|", 2)
+        grade_id, year = int(grade), year or None
+        student_ids = {int(i) for i in ids.split(",")} if ids else None
+
+    for cache_key in grade_results.keys():
+        if not _matches(cache_key, grade_id, year):
+            continue
+        if student_ids is None:
+            grade_results.pop(cache_key)
+        else:
+            entry = grade_results.get(cache_key)
+            if entry is not None:
+                entry.dirty |= student_ids
+    for cache_key, entries in list(loading.items()):
+        if _matches(cache_key, grade_id, year):
+            for entry in entries:
+                if student_ids is None:
+                    entry.stale = True
+                else:
+                    entry.dirty |= student_ids
+    for cache_key in student_results.keys():
+        if _matches(cache_key, grade_id, year) and (student_ids is None or cache_key[2] in student_ids):
+            student_results.pop(cache_key)
+    # a detail being computed right now is not a key yet; make its set() a no-op
+    student_results.bump()
+
+
+invalidation_channel.subscribe("results", _on_results_invalidated)
+
+
+def bump_results(db: Session, grade_id: int, year: str | None = None):
+    """
+    Increment the results version of the grade's `year` (every year if None) in
+    the caller's transaction. Call before commit; only grade/years that have
+    been ranked have a row to bump.
+    """
+    if grade_id is None:
+        return
+    stmt = update(ResultVersion).where(ResultVersion.grade_id == grade_id)
+    if year is not None:
+        stmt = stmt.where(ResultVersion.year == year)
+    db.execute(stmt.values(version=ResultVersion.version + 1))
+
+
+def invalidate_results(grade_id: int, year: str | None = None, student_ids=None):
+    """
+    Mark results stale in this and every other worker. Call after commit.
+
+    `year=None` covers every year; `student_ids=None` covers the whole grade,
+    otherwise only those students are recomputed on the next read.
+    """
+    if grade_id is None:
+        return
+    prefix = f"{grade_id}|{year or ''}|"
+    if student_ids is None:
+        invalidation_channel.publish("results", prefix)
+        return
+    ids = sorted({int(i) for i in student_ids})
+    if not ids:
+        return
+    if len(ids) > MAX_STUDENTS_PER_INVALIDATION:
+        invalidation_channel.publish("results", prefix)
+        return
+    chunk = []
+    for student_id in ids:
+        if chunk and len(prefix) + len(",".join(map(str, chunk + [student_id]))) > MAX_KEY_LENGTH:
+            invalidation_channel.publish("results", prefix + ",".join(map(str, chunk)))
+            chunk = []
+        chunk.append(student_id)
+    invalidation_channel.publish("results", prefix + ",".join(map(str, chunk)))
@@ -0,0 +1,182 @@
+"""
+Vectorized result computation for a grade.
+
+A `GradeSheet` holds one grade/year as dense (students x subjects) arrays;
+`compute` grades every component, weights it by credit hours and aggregates GPA,
+percentage, pass/fail and division with array operations only. Rows are
+independent, so a sheet of one student gives exactly that student's row of the
+whole-grade result.
+"""
+from dataclasses import dataclass
+
+import numpy as np
+
+from src.config.settings import settings
+
+# NEB component scale: percentage lower bounds of D, C, C+, B, B+, A, A+ (below 35 = NG)
+PERCENT_BOUNDS = np.array([35, 40, 50, 60, 70, 80, 90], dtype=float)
+GRADE_POINTS = np.array([0.0, 1.6, 2.0, 2.4, 2.8, 3.2, 3.6, 4.0])
+GRADE_LETTERS = np.array(["NG", "D", "C", "C+", "B", "B+", "A", "A+"])
+
+# final grade of a subject (weighted over its components) or of the GPA:
+# lower bounds of C, C+, B, B+, A, A+ (below 1.6 = D)
+GPA_BOUNDS = np.array([1.6, 2.0, 2.4, 2.8, 3.2, 3.6])
+GPA_LETTERS = np.array(["D", "C", "C+", "B", "B+", "A", "A+"])
+
+# division from aggregate percentage: lower bounds of Third, Second, First, Distinction
+DIVISION_BOUNDS = np.array([35, 45, 60, 80], dtype=float)
+DIVISIONS = np.array(["Fail", "Third", "Second", "First", "Distinction"])
+
+THEORY_PASS_PERCENT = 35.0
+PRACTICAL_PASS_PERCENT = 40.0
+
+
+@dataclass
+class GradeSheet:
+    student_ids: np.ndarray  # (n,) int
+    subject_ids: np.ndarray  # (m,) int
+    th_ch: np.ndarray  # (m,) theory credit hours
+    pr_ch: np.ndarray  # (m,) practical credit hours
+    enrolled: np.ndarray  # (n, m) bool: compulsory subjects plus assigned electives
+    th_om: np.ndarray  # (n, m) float, NaN = not entered
+    pr_om: np.ndarray  # (n, m) float, NaN = not entered
+
+
+@dataclass
+class GradeResults:
+    student_ids: np.ndarray
+    subject_ids: np.ndarray
+    # per student x subject
+    th_grade: np.ndarray
+    pr_grade: np.ndarray
+    subject_gp: np.ndarray
+    subject_grade: np.ndarray
+    subject_passed: np.ndarray
+    enrolled: np.ndarray
+    # per student
+    credit_hours: np.ndarray
+    obtained: np.ndarray
+    full_marks: np.ndarray
+    percentage: np.ndarray
+    gpa: np.ndarray
+    grade: np.ndarray
+    passed: np.ndarray
+    division: np.ndarray
+    missing: np.ndarray
+
+
+def build_sheet(student_ids, subjects, electives, marks) -> GradeSheet:
+    """
+    Dense arrays from query rows:
+    `subjects` (id, Th_ch, Pr_ch, is_elective), `electives` (student_id, sub_id),
+    `marks` (student_id, subject_id, th_om, pr_om). Rows naming students or
+    subjects outside the sheet are ignored.
+    """
+    student_ids = np.asarray(student_ids, dtype=np.int64)
+    subject_arr = np.array(subjects, dtype=float).reshape(-1, 4)
+    subject_ids = subject_arr[:, 0].astype(np.int64)
+    n, m = len(student_ids), len(subject_ids)
+
+    enrolled = np.zeros((n, m), dtype=bool)
+    enrolled[:, subject_arr[:, 3] == 0] = True
+    rows, cols = _locate(student_ids, subject_ids, np.array(electives, dtype=np.int64).reshape(-1, 2))
+    enrolled[rows, cols] = True
+
+    th_om = np.full((n, m), np.nan)
+    pr_om = np.full((n, m), np.nan)
+    mark_arr = np.array(marks, dtype=float).reshape(-1, 4)
+    rows, cols, found = _locate(student_ids, subject_ids, mark_arr[:, :2].astype(np.int64), with_mask=True)
+    th_om[rows, cols] = mark_arr[found, 2]
+    pr_om[rows, cols] = mark_arr[found, 3]
+
+    return GradeSheet(student_ids, subject_ids, subject_arr[:, 1], subject_arr[:, 2], enrolled, th_om, pr_om)
+
+
+def _locate(student_ids, subject_ids, pairs, with_mask=False):
+    # (student_id, subject_id) pairs -> row/column positions, dropping unknown ids
+    def index(ids, values):
+        order = np.argsort(ids)
+        pos = np.searchsorted(ids, values, sorter=order)
+        pos = np.minimum(pos, max(len(ids) - 1, 0))
+        hit = (ids[order[pos]] == values) if len(ids) else np.zeros(len(values), dtype=bool)
+        return order[pos] if len(ids) else pos, hit
+
+    rows, row_hit = index(student_ids, pairs[:, 0])
+    cols, col_hit = index(subject_ids, pairs[:, 1])
+    found = row_hit & col_hit
+    if with_mask:
+        return rows[found], cols[found], found
+    return rows[found], cols[found]
+
+
+def _round2(values):
+    # half-up to 2 decimals; the epsilon absorbs float noise from summation order
+    return np.floor(np.asarray(values) * 100 + 0.5 + 1e-9) / 100
+
+
+def _grade_component(om, fm, pass_percent):
+    """Grade points, letters and pass flags of one component (NaN marks fail)."""
+    with np.errstate(divide="ignore", invalid="ignore"):
+        pct = np.where(fm > 0, om / fm * 100, np.nan)
+    scale = np.searchsorted(PERCENT_BOUNDS, np.nan_to_num(pct, nan=-1.0), side="right")
+    return GRADE_POINTS[scale], GRADE_LETTERS[scale], pct >= pass_percent
+
+
+def compute(sheet: GradeSheet) -> GradeResults:
+    per_credit = settings.MARKS_PER_CREDIT_HOUR
+    th_fm, pr_fm = sheet.th_ch * per_credit, sheet.pr_ch * per_credit
+
+    th_taken = sheet.enrolled & (th_fm > 0)
+    pr_taken = sheet.enrolled & (pr_fm > 0)
+    th_w = np.where(th_taken, sheet.th_ch, 0.0)
+    pr_w = np.where(pr_taken, sheet.pr_ch, 0.0)
+
+    th_gp, th_grade, th_pass = _grade_component(sheet.th_om, th_fm, THEORY_PASS_PERCENT)
+    pr_gp, pr_grade, pr_pass = _grade_component(sheet.pr_om, pr_fm, PRACTICAL_PASS_PERCENT)
+
+    # a subject passes when every component it has passes
+    subject_passed = sheet.enrolled & (th_pass | ~th_taken) & (pr_pass | ~pr_taken)
+    subject_credits = th_w + pr_w
+    with np.errstate(divide="ignore", invalid="ignore"):
+        subject_gp = np.where(subject_credits > 0, (th_gp * th_w + pr_gp * pr_w) / subject_credits, 0.0)
+    subject_gp = np.where(subject_passed, subject_gp, 0.0)
+    subject_grade = GPA_LETTERS[np.searchsorted(GPA_BOUNDS, subject_gp, side="right")]
+    subject_grade = np.where(subject_passed, subject_grade, "NG")
+
+    credit_hours = subject_credits.sum(axis=1)
+    with np.errstate(divide="ignore", invalid="ignore"):
+        gpa = np.where(credit_hours > 0, (th_gp * th_w + pr_gp * pr_w).sum(axis=1) / credit_hours, 0.0)
+    gpa = _round2(gpa)
+
+    obtained = np.nansum(np.where(th_taken, sheet.th_om, 0.0), axis=1) + np.nansum(
+        np.where(pr_taken, sheet.pr_om, 0.0), axis=1
+    )
+    full_marks = (th_taken * th_fm).sum(axis=1) + (pr_taken * pr_fm).sum(axis=1)
+    with np.errstate(divide="ignore", invalid="ignore"):
+        percentage = _round2(np.where(full_marks > 0, obtained / full_marks * 100, 0.0))
+
+    missing = (th_taken & np.isnan(sheet.th_om)).sum(axis=1) + (pr_taken & np.isnan(sheet.pr_om)).sum(axis=1)
+    passed = ((subject_passed | ~sheet.enrolled).all(axis=1)) & (missing == 0) & (credit_hours > 0)
+
+    grade = np.where(passed, GPA_LETTERS[np.searchsorted(GPA_BOUNDS, gpa, side="right")], "NG")
+    division = np.where(passed, DIVISIONS[np.searchsorted(DIVISION_BOUNDS, percentage, side="right")], "Fail")
+
+    return GradeResults(
+        student_ids=sheet.student_ids,
+        subject_ids=sheet.subject_ids,
+        th_grade=np.where(th_taken, th_grade, None),
+        pr_grade=np.where(pr_taken, pr_grade, None),
+        subject_gp=_round2(subject_gp),
+        subject_grade=subject_grade,
+        subject_passed=subject_passed,
+        enrolled=sheet.enrolled,
+        credit_hours=credit_hours,
+        obtained=obtained,
+        full_marks=full_marks,
+        percentage=percentage,
+        gpa=gpa,
+        grade=grade,
+        passed=passed,
+        division=division,
+        missing=missing,
+    )
@@ -0,0 +1,51 @@
+from sqlalchemy import Column, Integer, String, Numeric, Boolean, ForeignKey, DateTime, UniqueConstraint, Index
+
+from src.config.database import Base
+
+
+class ResultRank(Base):
+    """
+    Materialized ranking of one grade/year: a row per active student with the
+    engine's totals and the rank, rebuilt as a whole by RankingService.refresh.
+    """
+    __tablename__ = "result_ranks"
+
+    id = Column(Integer, primary_key=True, index=True)
+
+    grade_id = Column(Integer, ForeignKey("grades.id"), nullable=False)
+    year = Column(String(10), nullable=False)
+    student_id = Column(Integer, ForeignKey("students.id"), nullable=False)
+    roll = Column(String(20), nullable=False)
+    name = Column(String(100), nullable=False)
+
+    credit_hours = Column(Numeric(6, 2), nullable=False)
+    obtained = Column(Numeric(8, 2), nullable=False)
+    full_marks = Column(Numeric(8, 2), nullable=False)
+    percentage = Column(Numeric(5, 2), nullable=False)
+    gpa = Column(Numeric(4, 2), nullable=False)
+    grade = Column(String(5), nullable=False)
+    division = Column(String(20), nullable=False)
+    passed = Column(Boolean, nullable=False)
+
+    # competition rank (1, 2, 2, 4) within the grade/year; "rank" is reserved in MySQL 8
+    position = Column(Integer, nullable=False, default=0)
+    refreshed_at = Column(DateTime(timezone=True), nullable=False)
+
+    __table_args__ = (
+        UniqueConstraint("grade_id", "year", "student_id", name="uq_result_ranks_grade_year_student"),
+        Index("ix_result_ranks_grade_year_position", "grade_id", "year", "position"),
+    )
+
+
+class ResultVersion(Base):
+    """
+    Write counter of one grade/year's results. Writers bump `version` with their
+    change (bump_results); a ranking refresh records the version it was built
+    from in `ranked_version`, so the ranking is stale while the two differ.
+    """
+    __tablename__ = "result_versions"
+
+    grade_id = Column(Integer, ForeignKey("grades.id"), primary_key=True)
+    year = Column(String(10), primary_key=True)
+    version = Column(Integer, nullable=False, default=0)
+    ranked_version = Column(Integer, nullable=False, default=0)
@@ -0,0 +1,65 @@
+from fastapi import APIRouter, Depends, Query
+from sqlalchemy.orm import Session
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from src.config.database import get_db, get_async_db
+from src.config.dependencies import user_only
+from src.routes.auth.dependencies import get_current_user
+from src.routes.auth.model import User
+from src.routes.grade.dependencies import get_grade_context
+from src.routes.grade.schema import GradeContext
+
+from .schema import StudentResult, StudentResultDetail, RankingTop, StudentRank, RankingRefreshResult
+from .service import ResultService, RankingService
+
+router = APIRouter(prefix="/results", tags=["Results"])
+
+
+@router.get("/", response_model=list[StudentResult], dependencies=[Depends(user_only)])
+async def get_grade_results(
+    year: str | None = None,
+    db: AsyncSession = Depends(get_async_db),
+    grade: GradeContext = Depends(get_grade_context),
+):
+    return await ResultService.get_grade_results(db, grade, year)
+
+
+@router.get("/student/{student_id}", response_model=StudentResultDetail, dependencies=[Depends(user_only)])
+async def get_student_result(
+    student_id: int,
+    year: str | None = None,
+    db: AsyncSession = Depends(get_async_db),
+    grade: GradeContext = Depends(get_grade_context),
+):
+    return await ResultService.get_student_result(db, grade, student_id, year)
+
+
+# ---------------- RANKING ----------------
+@router.post("/ranking/refresh", response_model=RankingRefreshResult, dependencies=[Depends(user_only)])
+def refresh_ranking(
+    year: str | None = None,
+    db: Session = Depends(get_db),
+    current_user: User = Depends(get_current_user),
+    grade: GradeContext = Depends(get_grade_context),
+):
+    return RankingService.refresh(db, grade, year, current_user)
+
+
+@router.get("/ranking/top", response_model=RankingTop, dependencies=[Depends(user_only)])
+async def get_top_ranks(
+    year: str | None = None,
+    limit: int = Query(10, ge=1, le=500),
+    db: AsyncSession = Depends(get_async_db),
+    grade: GradeContext = Depends(get_grade_context),
+):
+    return await RankingService.get_top(db, grade, year, limit)
+
+
+@router.get("/ranking/student/{student_id}", response_model=StudentRank, dependencies=[Depends(user_only)])
+async def get_student_rank(
+    student_id: int,
+    year: str | None = None,
+    db: AsyncSession = Depends(get_async_db),
+    grade: GradeContext = Depends(get_grade_context),
+):
+    return await RankingService.get_student_rank(db, grade, student_id, year)
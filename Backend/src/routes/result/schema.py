@@ -0,0 +1,70 @@
+from datetime import datetime
+
+from pydantic import BaseModel
+
+
+class SubjectResult(BaseModel):
+    subject_id: int
+    sub_code: str
+    sub_name: str
+    th_om: float | None = None
+    pr_om: float | None = None
+    th_grade: str | None = None
+    pr_grade: str | None = None
+    grade_point: float
+    grade: str
+    passed: bool
+
+
+class StudentResult(BaseModel):
+    student_id: int
+    roll: str
+    name: str
+    credit_hours: float
+    obtained: float
+    full_marks: float
+    percentage: float
+    gpa: float
+    grade: str
+    division: str
+    passed: bool
+    missing: int
+    rank: int
+
+
+class StudentResultDetail(StudentResult):
+    year: str
+    subjects: list[SubjectResult]
+
+
+class RankEntry(BaseModel):
+    student_id: int
+    roll: str
+    name: str
+    percentage: float
+    gpa: float
+    grade: str
+    division: str
+    passed: bool
+    rank: int
+
+
+class RankingTop(BaseModel):
+    year: str
+    refreshed_at: datetime
+    stale: bool  # results changed since refreshed_at; POST /results/ranking/refresh to catch up
+    entries: list[RankEntry]
+
+
+class StudentRank(RankEntry):
+    year: str
+    refreshed_at: datetime
+    stale: bool
+    out_of: int
+
+
+class RankingRefreshResult(BaseModel):
+    year: str
+    ranked: int
+    refreshed_at: datetime
+    method: str
@@ -0,0 +1,388 @@
+from bisect import bisect_left
+from datetime import datetime, timezone
+
+from sqlalchemy import select, insert, update, delete, func
+from sqlalchemy.orm import Session
+from sqlalchemy.ext.asyncio import AsyncSession
+from fastapi import HTTPException
+
+from .cache import CachedGrade, grade_results, student_results, loading, invalidate_results, rank_key
+from .engine import build_sheet, compute
+from .model import ResultRank, ResultVersion
+from src.config.settings import settings
+from src.routes.aamaster.model import Mark
+from src.routes.elective_subject.model import ElectiveSub
+from src.routes.grade.schema import GradeContext
+from src.routes.log.services import log_action
+from src.routes.student.model import Student
+from src.routes.subject.model import Subject
+from src.routes.year.model import Year
+from src.routes.year.service import YearService
+
+
+def _sheet_queries(grade_id: int, year: str, student_ids=None):
+    students = select(Student.id, Student.roll, Student.name).where(
+        Student.grade_id == grade_id, Student.is_active == True
+    )
+    if student_ids is not None:
+        students = students.where(Student.id.in_(student_ids))
+    student_filter = students.with_only_columns(Student.id).scalar_subquery()
+    return (
+        students.order_by(Student.roll, Student.id),
+        select(Subject.id, Subject.Th_ch, Subject.Pr_ch, Subject.is_elective, Subject.sub_code, Subject.sub_name)
+        .where(Subject.grade_id == grade_id, Subject.is_active == True)
+        .order_by(Subject.is_elective, Subject.id),
+        select(ElectiveSub.student_id, ElectiveSub.sub_id)
+        .where(ElectiveSub.year == year, ElectiveSub.student_id.in_(student_filter)),
+        select(Mark.student_id, Mark.subject_id, Mark.th_om, Mark.pr_om)
+        .where(Mark.year == year, Mark.student_id.in_(student_filter)),
+    )
+
+
+class ResultSet:
+    """Engine output plus the labels (roll, name, subject codes) needed to report it."""
+
+    def __init__(self, year, students, subjects, sheet, results):
+        self.year = year
+        self.students = students
+        self.subjects = subjects
+        self.sheet = sheet
+        self.results = results
+        self._summaries = None
+
+    def summaries(self) -> list[dict]:
+        if self._summaries is None:
+            self._summaries = self._build_summaries()
+        return self._summaries
+
+    def _build_summaries(self) -> list[dict]:
+        r = self.results
+        columns = zip(
+            r.student_ids.tolist(), r.credit_hours.tolist(), r.obtained.tolist(), r.full_marks.tolist(),
+            r.percentage.tolist(), r.gpa.tolist(), r.grade.tolist(), r.division.tolist(), r.passed.tolist(),
+            r.missing.tolist(),
+        )
+        return [
+            {
+                "student_id": sid, "roll": student.roll, "name": student.name, "credit_hours": credit_hours,
+                "obtained": obtained, "full_marks": full, "percentage": percentage, "gpa": gpa, "grade": grade,
+                "division": division, "passed": passed, "missing": missing,
+            }
+            for student, (sid, credit_hours, obtained, full, percentage, gpa, grade, division, passed, missing)
+            in zip(self.students, columns)
+        ]
+
+    def detail(self, index: int) -> dict:
+        r, s = self.results, self.sheet
+        subjects = [
+            {
+                "subject_id": subject.id, "sub_code": subject.sub_code, "sub_name": subject.sub_name,
+                "th_om": _num(s.th_om[index, j]), "pr_om": _num(s.pr_om[index, j]),
+                "th_grade": r.th_grade[index, j], "pr_grade": r.pr_grade[index, j],
+                "grade_point": float(r.subject_gp[index, j]), "grade": str(r.subject_grade[index, j]),
+                "passed": bool(r.subject_passed[index, j]),
+            }
+            for j, subject in enumerate(self.subjects)
+            if r.enrolled[index, j]
+        ]
+        return {**self.summaries()[index], "year": self.year, "subjects": subjects}
+
+
+def _num(value):
+    return None if value != value else float(value)  # NaN -> None
+
+
+class ResultService:
+
+    @staticmethod
+    def _build(year, students, subjects, electives, marks) -> ResultSet:
+        sheet = build_sheet(
+            [s.id for s in students],
+            [(s.id, s.Th_ch, s.Pr_ch, s.is_elective) for s in subjects],
+            electives,
+            marks,
+        )
+        return ResultSet(year, students, subjects, sheet, compute(sheet))
+
+    @staticmethod
+    async def compute(db: AsyncSession, grade_id: int, year: str, student_ids=None) -> ResultSet:
+        queries = _sheet_queries(grade_id, year, student_ids)
+        students, subjects, electives, marks = [(await db.execute(q)).all() for q in queries]
+        return ResultService._build(year, students, subjects, electives, marks)
+
+    @staticmethod
+    def compute_sync(db: Session, grade_id: int, year: str, student_ids=None) -> ResultSet:
+        students, subjects, electives, marks = [db.execute(q).all() for q in _sheet_queries(grade_id, year, student_ids)]
+        return ResultService._build(year, students, subjects, electives, marks)
+
+    @staticmethod
+    async def resolve_year(db: AsyncSession, year: str | None) -> str:
+        if year is None:
+            current = await YearService.get_current(db)
+            if not current:
+                raise HTTPException(status_code=400, detail="No current year is set")
+            return current.year
+        if (await db.execute(select(Year.id).where(Year.year == year))).first() is None:
+            raise HTTPException(status_code=404, detail="Year not found")
+        return year
+
+    @staticmethod
+    def invalidate_subject(db: Session, subject_id: int, grade_ids, elective: bool):
+        """
+        After a subject edit: an elective that stayed elective in the same grade only
+        touches the students holding it (per year); anything else can change every
+        student's enrolment, so the whole grade is recomputed. Call after commit.
+        """
+        grade_ids = list(dict.fromkeys(grade_ids))
+        if not elective or len(grade_ids) != 1:
+            for grade_id in grade_ids:
+                invalidate_results(grade_id)
+            return
+        holders = {}
+        for student_id, year in db.execute(
+            select(ElectiveSub.student_id, ElectiveSub.year).where(ElectiveSub.sub_id == subject_id)
+        ):
+            holders.setdefault(year, []).append(student_id)
+        for year, student_ids in holders.items():
+            invalidate_results(grade_ids[0], year, student_ids)
+
+    @staticmethod
+    async def cached_grade(db: AsyncSession, grade_id: int, year: str) -> CachedGrade:
+        """
+        The grade's cached summaries, brought up to date: a miss computes the whole
+        grade once, afterwards only students marked dirty by writes are recomputed.
+        """
+        key = (grade_id, year)
+        entry = grade_results.get(key)
+        if entry is None:
+            entry = CachedGrade()
+            loading.setdefault(key, []).append(entry)
+            try:
+                entry.load((await ResultService.compute(db, grade_id, year)).summaries())
+            finally:
+                loading[key].remove(entry)
+                if not loading[key]:
+                    del loading[key]
+            if not entry.stale:
+                grade_results.set(key, entry)
+
+        if entry.dirty:
+            # serialised: a slower reader must not patch older data over a newer recompute;
+            # students re-marked while the lock is held are picked up by the next holder
+            async with entry.refreshing:
+                if entry.dirty:
+                    student_ids = entry.take_dirty()
+                    try:
+                        result = await ResultService.compute(db, grade_id, year, student_ids=student_ids)
+                    except Exception:
+                        entry.dirty |= student_ids
+                        raise
+                    entry.patch(student_ids, result.summaries())
+        return entry
+
+    # ---------------- GET ----------------
+    @staticmethod
+    async def get_grade_results(db: AsyncSession, grade: GradeContext, year: str | None):
+        year = await ResultService.resolve_year(db, year)
+        return (await ResultService.cached_grade(db, grade.id, year)).ordered()
+
+    @staticmethod
+    async def get_student_result(db: AsyncSession, grade: GradeContext, student_id: int, year: str | None):
+        year = await ResultService.resolve_year(db, year)
+        entry = await ResultService.cached_grade(db, grade.id, year)
+        summary = entry.rows.get(student_id)
+        if summary is None:
+            raise HTTPException(status_code=404, detail="Student not found in this grade")
+
+        key = (grade.id, year, student_id)
+        detail = student_results.get(key)
+        if detail is None:
+            generation = student_results.generation
+            result = await ResultService.compute(db, grade.id, year, student_ids=[student_id])
+            if not result.students:
+                raise HTTPException(status_code=404, detail="Student not found in this grade")
+            detail = result.detail(0)
+            student_results.set(key, detail, generation)
+        return {**detail, "rank": entry.rank(detail)}
+
+
+def window_functions_supported(db: Session) -> bool:
+    """UPDATE ... FROM (SELECT RANK() OVER ...): MySQL 8 / MariaDB 10.2, SQLite 3.33, PostgreSQL."""
+    if not settings.RANKING_WINDOW_FUNCTIONS:
+        return False
+    dialect = db.get_bind().dialect
+    version = dialect.server_version_info or ()
+    if dialect.name == "mysql":
+        return version >= ((10, 2) if dialect.is_mariadb else (8, 0))
+    if dialect.name == "sqlite":
+        return version >= (3, 33)
+    return dialect.name == "postgresql"
+
+
+def _utc(value: datetime) -> datetime:
+    # stored as UTC; SQLite and MySQL hand it back without the zone
+    return value.replace(tzinfo=timezone.utc) if value.tzinfo is None else value
+
+
+def _version_row_statement(db: Session, grade_id: int, year: str):
+    """Create the grade/year's result_versions row unless it exists (concurrent refreshes may race)."""
+    dialect = db.get_bind().dialect.name
+    values = {"grade_id": grade_id, "year": year, "version": 0, "ranked_version": 0}
+    if dialect == "mysql":
+        from sqlalchemy.dialects.mysql import insert as mysql_insert
+
+        stmt = mysql_insert(ResultVersion).values(values)
+        return stmt.on_duplicate_key_update(version=ResultVersion.version)
+    if dialect in ("sqlite", "postgresql"):
+        from sqlalchemy.dialects.sqlite import insert as sqlite_insert
+        from sqlalchemy.dialects.postgresql import insert as pg_insert
+
+        stmt = (sqlite_insert if dialect == "sqlite" else pg_insert)(ResultVersion).values(values)
+        return stmt.on_conflict_do_nothing(index_elements=["grade_id", "year"])
+    raise RuntimeError(f"Ranking refresh is not supported on {dialect}; use MySQL/MariaDB, SQLite or PostgreSQL")
+
+
+def _rank_order():
+    # same order as cache.rank_key: passed first, then GPA, then percentage
+    return ResultRank.passed.desc(), ResultRank.gpa.desc(), ResultRank.percentage.desc()
+
+
+class RankingService:
+
+    @staticmethod
+    def resolve_year_sync(db: Session, year: str | None) -> str:
+        if year is None:
+            current = YearService.get_current_sync(db)
+            if not current:
+                raise HTTPException(status_code=400, detail="No current year is set")
+            return current.year
+        if not db.query(Year.id).filter(Year.year == year).first():
+            raise HTTPException(status_code=404, detail="Year not found")
+        return year
+
+    # ---------------- REFRESH ----------------
+    @staticmethod
+    def refresh(db: Session, grade: GradeContext, year: str | None, user):
+        """
+        Rebuild the grade/year ranking in one transaction.
+
+        The engine computes every active student's totals (electives included), the
+        rows replace the previous ranking, and the positions are assigned by one
+        UPDATE over RANK() OVER (...). Where window functions are unavailable the
+        same competition ranks are computed in Python before the insert.
+
+        The results version is read before the engine runs and recorded as the
+        ranked version, so a write that lands during the refresh still leaves
+        the ranking flagged stale.
+        """
+        year = RankingService.resolve_year_sync(db, year)
+        db.execute(_version_row_statement(db, grade.id, year))
+        version = db.execute(
+            select(ResultVersion.version).where(ResultVersion.grade_id == grade.id, ResultVersion.year == year)
+        ).scalar_one()
+        summaries = ResultService.compute_sync(db, grade.id, year).summaries()
+        windowed = window_functions_supported(db)
+        now = datetime.now(timezone.utc)
+
+        positions = [0] * len(summaries)
+        if not windowed:
+            keys = sorted(rank_key(s) for s in summaries)
+            positions = [bisect_left(keys, rank_key(s)) + 1 for s in summaries]
+
+        db.execute(delete(ResultRank).where(ResultRank.grade_id == grade.id, ResultRank.year == year))
+        if summaries:
+            db.execute(
+                insert(ResultRank).values([
+                    {
+                        "grade_id": grade.id, "year": year, "student_id": s["student_id"], "roll": s["roll"],
+                        "name": s["name"], "credit_hours": s["credit_hours"], "obtained": s["obtained"],
+                        "full_marks": s["full_marks"], "percentage": s["percentage"], "gpa": s["gpa"],
+                        "grade": s["grade"], "division": s["division"], "passed": s["passed"],
+                        "position": position, "refreshed_at": now,
+                    }
+                    for s, position in zip(summaries, positions)
+                ])
+            )
+        if windowed and summaries:
+            ranked = (
+                select(ResultRank.id, func.rank().over(order_by=_rank_order()).label("position"))
+                .where(ResultRank.grade_id == grade.id, ResultRank.year == year)
+                .subquery()
+            )
+            db.execute(
+                update(ResultRank).where(ResultRank.id == ranked.c.id).values(position=ranked.c.position)
+            )
+        db.execute(
+            update(ResultVersion)
+            .where(ResultVersion.grade_id == grade.id, ResultVersion.year == year)
+            .values(ranked_version=version)
+        )
+
+        log_action(
+            db=db,
+            user_id=user.id,
+            action="REFRESH",
+            table_name="result_ranks",
+            record_id=0,
+            new_data={"grade_id": grade.id, "year": year, "count": len(summaries)},
+            strict=True,
+        )
+        db.commit()
+        return {
+            "year": year, "ranked": len(summaries), "refreshed_at": now,
+            "method": "window" if windowed else "python",
+        }
+
+    # ---------------- GET ----------------
+    @staticmethod
+    async def get_top(db: AsyncSession, grade: GradeContext, year: str | None, limit: int):
+        """The first `limit` positions; students tied at the cut-off are all included."""
+        year = await ResultService.resolve_year(db, year)
+        rows = (
+            await db.execute(
+                select(ResultRank)
+                .where(ResultRank.grade_id == grade.id, ResultRank.year == year, ResultRank.position <= limit)
+                .order_by(ResultRank.position, ResultRank.roll, ResultRank.student_id)
+            )
+        ).scalars().all()
+        if not rows:
+            raise HTTPException(status_code=404, detail="No ranking has been refreshed for this year")
+        return {
+            "year": year, "refreshed_at": _utc(rows[0].refreshed_at),
+            "stale": await RankingService.is_stale(db, grade.id, year),
+            "entries": [RankingService._entry(r) for r in rows],
+        }
+
+    @staticmethod
+    async def get_student_rank(db: AsyncSession, grade: GradeContext, student_id: int, year: str | None):
+        year = await ResultService.resolve_year(db, year)
+        in_ranking = (ResultRank.grade_id == grade.id, ResultRank.year == year)
+        row = (
+            await db.execute(select(ResultRank).where(*in_ranking, ResultRank.student_id == student_id))
+        ).scalars().first()
+        if not row:
+            raise HTTPException(status_code=404, detail="Student is not in the ranking for this year")
+        out_of = (await db.execute(select(func.count(ResultRank.id)).where(*in_ranking))).scalar()
+        return {
+            **RankingService._entry(row), "year": year, "refreshed_at": _utc(row.refreshed_at), "out_of": out_of,
+            "stale": await RankingService.is_stale(db, grade.id, year),
+        }
+
+    @staticmethod
+    async def is_stale(db: AsyncSession, grade_id: int, year: str) -> bool:
+        """Whether results were written since the ranking was refreshed (see ResultVersion)."""
+        versions = (
+            await db.execute(
+                select(ResultVersion.version, ResultVersion.ranked_version)
+                .where(ResultVersion.grade_id == grade_id, ResultVersion.year == year)
+            )
+        ).first()
+        # rankings refreshed before result_versions existed have no row: unknown, so stale
+        return versions is None or versions.version != versions.ranked_version
+
+    @staticmethod
+    def _entry(row: ResultRank) -> dict:
+        return {
+            "student_id": row.student_id, "roll": row.roll, "name": row.name, "percentage": row.percentage,
+            "gpa": row.gpa, "grade": row.grade, "division": row.division, "passed": row.passed, "rank": row.position,
+        }
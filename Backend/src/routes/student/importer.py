@@ -0,0 +1,71 @@
+import csv
+import io
+from itertools import islice
+from typing import BinaryIO, Iterator
+
+from fastapi import HTTPException
+from openpyxl import load_workbook
+
+# the Student table of databaseTable.xlsx; `id` is assigned by the database
+COLUMNS = ("roll", "name", "year", "grade_id", "is_active")
+REQUIRED = ("roll", "name")
+
+# header row is searched for within the first HEADER_SCAN rows, so a title row
+# or blank lines above the table (as in databaseTable.xlsx) are fine
+HEADER_SCAN = 20
+
+
+def _sheet_rows(file: BinaryIO, filename: str) -> Iterator[tuple]:
+    name = (filename or "").lower()
+    if name.endswith(".csv"):
+        text = io.TextIOWrapper(file, encoding="utf-8-sig", newline="")
+        yield from (tuple(row) for row in csv.reader(text))
+    elif name.endswith(".xlsx"):
+        # read_only streams rows from the zip instead of building the whole sheet
+        workbook = load_workbook(file, read_only=True, data_only=True)
+        try:
+            yield from workbook.active.iter_rows(values_only=True)
+        finally:
+            workbook.close()
+    else:
+        raise HTTPException(status_code=415, detail="Upload a .csv or .xlsx file")
+
+
+def _cell(value):
+    if value is None:
+        return None
+    if isinstance(value, float) and value.is_integer():
+        value = int(value)
+    value = str(value).strip()
+    return value or None
+
+
+def iter_student_rows(file: BinaryIO, filename: str) -> Iterator[tuple[int, dict]]:
+    """
+    Yield `(row_number, {column: value})` for each non-blank student row.
+
+    Values are stripped strings (or None); row numbers are 1-based sheet rows so
+    they can be reported back against the uploaded file.
+    """
+    rows = enumerate(_sheet_rows(file, filename), start=1)
+
+    positions = None
+    for _, row in islice(rows, HEADER_SCAN):
+        header = [str(c).strip().lower() if c is not None else "" for c in row]
+        if all(col in header for col in REQUIRED):
+            # first occurrence wins: later tables on the same row reuse `year`
+            positions = {col: header.index(col) for col in COLUMNS if col in header}
+            break
+    if positions is None:
+        raise HTTPException(status_code=400, detail=f"No header row with columns: {', '.join(COLUMNS)}")
+
+    for number, row in rows:
+        values = {col: _cell(row[i]) if i < len(row) else None for col, i in positions.items()}
+        if any(v is not None for v in values.values()):
+            yield number, values
+
+
+def batched(iterable, size: int):
+    iterator = iter(iterable)
+    while batch := list(islice(iterator, size)):
+        yield batch
@@ -1,4 +1,4 @@
-from sqlalchemy import Column, Integer, String, Boolean, ForeignKey
+from sqlalchemy import Column, Integer, String, Boolean, ForeignKey, Index
 from sqlalchemy.orm import relationship
 
 from src.config.database import Base
@@ -21,3 +21,8 @@ class Student(Base):
     grade = relationship("Grade", back_populates="students")
 
     elective_subjects = relationship("ElectiveSub", back_populates="student")
+
+    __table_args__ = (
+        # keyset order of GET /students/: active first, then roll, id as tiebreak
+        Index("ix_students_grade_listing", "grade_id", is_active.desc(), "roll", "id"),
+    )
@@ -1,12 +1,17 @@
-from fastapi import APIRouter, Depends
+from fastapi import APIRouter, Depends, UploadFile, File, Query
 from sqlalchemy.orm import Session
+from sqlalchemy.ext.asyncio import AsyncSession
 
-from src.config.database import get_db
+from src.config.database import get_db, get_async_db
+from src.config.settings import settings
+from src.util.projection import lean_response
 from src.config.dependencies import user_only
 from src.routes.auth.dependencies import get_current_user
 from src.routes.auth.model import User
+from src.routes.grade.dependencies import get_grade_context
+from src.routes.grade.schema import GradeContext
 
-from .schema import StudentCreate, StudentUpdate, StudentResponse
+from .schema import StudentCreate, StudentUpdate, StudentResponse, StudentImportReport, StudentPage
 from .service import StudentService
 
 router = APIRouter(prefix="/students", tags=["Students"])
@@ -17,14 +22,32 @@ def create_student(data: StudentCreate, db: Session = Depends(get_db), current_u
     return StudentService.create_student(db, data, current_user)
 
 
-@router.get("/", response_model=list[StudentResponse], dependencies=[Depends(user_only)])
-def get_all_students(db: Session = Depends(get_db), current_user: User = Depends(get_current_user)):
-    return StudentService.get_all(db, current_user)
+@router.post("/import", response_model=StudentImportReport, dependencies=[Depends(user_only)])
+def import_students(file: UploadFile = File(...), db: Session = Depends(get_db), current_user: User = Depends(get_current_user)):
+    return StudentService.import_students(db, file.file, file.filename, current_user)
+
+
+@router.get("/", response_model=StudentPage, dependencies=[Depends(user_only)])
+async def get_all_students(
+    active: bool | None = None,
+    year: str | None = None,
+    search: str | None = Query(None, description="Prefix of the student's name or roll"),
+    cursor: str | None = None,
+    limit: int = Query(50, ge=1, le=500),
+    total: bool = False,
+    db: AsyncSession = Depends(get_async_db),
+    grade: GradeContext = Depends(get_grade_context),
+):
+    lean = settings.LEAN_LIST_RESPONSES
+    page = await StudentService.get_all(
+        db, grade, active=active, year=year, search=search, cursor=cursor, limit=limit, with_total=total, lean=lean
+    )
+    return lean_response(StudentPage, page) if lean else page
 
 
 @router.get("/{student_id}", response_model=StudentResponse, dependencies=[Depends(user_only)])
-def get_student(student_id: int, db: Session = Depends(get_db)):
-    return StudentService.get_by_id(db, student_id)
+async def get_student(student_id: int, db: AsyncSession = Depends(get_async_db)):
+    return await StudentService.get_by_id(db, student_id)
 
 
 @router.put("/{student_id}", response_model=StudentResponse, dependencies=[Depends(user_only)])
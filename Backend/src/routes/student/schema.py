@@ -35,10 +35,28 @@ class StudentResponse(StudentBase):
     class Config:
         from_attributes = True
 
+class StudentPage(BaseModel):
+    items: list[StudentResponse]
+    next_cursor: str | None = None
+    total: int | None = None
+
+
 class StudentMini(BaseModel):
     id: int
     roll: str
     name: str
 
     class Config:
-        from_attributes = True
\ No newline at end of file
+        from_attributes = True
+
+class StudentImportError(BaseModel):
+    row: int
+    roll: Optional[str] = None
+    errors: list[str]
+
+
+class StudentImportReport(BaseModel):
+    total: int
+    inserted: int
+    failed: int
+    errors: list[StudentImportError]
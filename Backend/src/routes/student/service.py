@@ -1,25 +1,40 @@
+from sqlalchemy import select, insert, tuple_, func, or_, and_
+from sqlalchemy.exc import SQLAlchemyError
 from sqlalchemy.orm import Session
+from pydantic import ValidationError
+from sqlalchemy.ext.asyncio import AsyncSession
 from fastapi import HTTPException
 
 from .model import Student
-from .schema import StudentCreate, StudentUpdate
-from src.routes.log.services import log_action
+from .schema import StudentCreate, StudentUpdate, StudentResponse
+from .importer import iter_student_rows, batched
+from src.config.settings import settings
+from src.util.pagination import encode_cursor, decode_cursor
+from src.util.projection import columns_for, as_dicts
+from src.routes.year.model import Year
+from src.routes.year.service import YearService
+from src.routes.log.services import log_action, log_records
+from src.routes.log.utils import model_snapshot
 from src.config.dependencies import check_user_validation_for_grade
 from src.routes.grade.service import GradeService
+from src.routes.grade.schema import GradeContext
 from src.routes.elective_subject.service import ElectiveSubService
 from src.routes.elective_subject.model import ElectiveSub
+from src.routes.result.cache import bump_results, invalidate_results
 
 
 class StudentService:
 
     @staticmethod
     def create_student(db: Session, data: StudentCreate, user):
-        check_user_validation_for_grade(db, user, data.grade_id)
+        check_user_validation_for_grade(user, data.grade_id)
 
         student = Student(**data.model_dump())
         db.add(student)        
+        bump_results(db, student.grade_id)
         db.commit()
         db.refresh(student)
+        invalidate_results(student.grade_id, None, [student.id])
 
         log_action(
             db=db,
@@ -33,14 +48,181 @@ class StudentService:
 
         return student
 
+    # ---------------- IMPORT ----------------
     @staticmethod
-    def get_all(db: Session, user):
-        grade_id = GradeService.get_grade_by_user(user, db).id
-        return db.query(Student).filter(Student.grade_id == grade_id).order_by(Student.is_active.desc(),Student.roll.asc()).all()
+    def import_students(db: Session, file, filename: str, user):
+        """
+        Stream a CSV/XLSX sheet into the user's working grade.
+
+        Rows are validated and inserted STUDENT_IMPORT_BATCH at a time: one lookup
+        for existing rolls, one multi-row INSERT and one summarised IMPORT audit
+        row per batch, committed together. Each student also gets a CREATE audit
+        row (multi-row INSERTs too) so rebuild_record has its baseline. Invalid
+        rows are skipped and reported; the rest of their batch is still inserted.
+        """
+        grade_id = GradeService.get_grade_id_by_user(user)
+        current = YearService.get_current_sync(db)
+        years = set(db.execute(select(Year.year)).scalars())
+        limits = {col: Student.__table__.c[col].type.length for col in ("roll", "name", "year")}
+
+        seen = set()
+        total = inserted = 0
+        errors = []
+
+        for batch_no, batch in enumerate(batched(iter_student_rows(file, filename), settings.STUDENT_IMPORT_BATCH), start=1):
+            total += len(batch)
+            valid = []
+
+            for number, values in batch:
+                problems = []
+                values["grade_id"] = values["grade_id"] or grade_id
+                values["year"] = values["year"] or (current.year if current else None)
+                values = {k: v for k, v in values.items() if v is not None}
+
+                try:
+                    student = StudentCreate.model_validate(values)
+                except ValidationError as e:
+                    problems = [f"{'.'.join(map(str, err['loc']))}: {err['msg']}" for err in e.errors()]
+                else:
+                    if student.grade_id != grade_id:
+                        problems.append("grade_id: you are not allowed to work for this grade")
+                    if student.year not in years:
+                        problems.append(f"year: unknown year {student.year}")
+                    for col, length in limits.items():
+                        if len(getattr(student, col)) > length:
+                            problems.append(f"{col}: longer than {length} characters")
+                    if (student.year, student.roll) in seen:
+                        problems.append("roll: duplicated in this file")
+
+                if problems:
+                    errors.append({"row": number, "roll": values.get("roll"), "errors": problems})
+                    continue
+                seen.add((student.year, student.roll))
+                valid.append((number, student))
+
+            if valid:
+                existing = set(
+                    db.execute(
+                        select(Student.year, Student.roll).where(
+                            Student.grade_id == grade_id,
+                            tuple_(Student.year, Student.roll).in_([(s.year, s.roll) for _, s in valid]),
+                        )
+                    ).all()
+                )
+                for number, student in valid:
+                    if (student.year, student.roll) in existing:
+                        errors.append({"row": number, "roll": student.roll, "errors": ["roll: already exists for this year"]})
+                valid = [(n, s) for n, s in valid if (s.year, s.roll) not in existing]
+
+            if not valid:
+                continue
+
+            try:
+                db.execute(insert(Student).values([s.model_dump() for _, s in valid]))
+                created = {(s.year, s.roll): s.model_dump() for _, s in valid}
+                log_records(
+                    db,
+                    user_id=user.id,
+                    action="CREATE",
+                    table_name="students",
+                    records=(
+                        (student_id, None, created[(year, roll)])
+                        for student_id, year, roll in db.execute(
+                            select(Student.id, Student.year, Student.roll).where(
+                                Student.grade_id == grade_id,
+                                tuple_(Student.year, Student.roll).in_(list(created)),
+                            )
+                        )
+                    ),
+                )
+                log_action(
+                    db=db,
+                    user_id=user.id,
+                    action="IMPORT",
+                    table_name="students",
+                    record_id=0,
+                    new_data={
+                        "file": filename,
+                        "batch": batch_no,
+                        "rows": [valid[0][0], valid[-1][0]],
+                        "count": len(valid),
+                        "rolls": [s.roll for _, s in valid],
+                    },
+                    strict=True,
+                )
+                bump_results(db, grade_id)
+                db.commit()
+                inserted += len(valid)
+                invalidate_results(grade_id)
+            except SQLAlchemyError as e:
+                db.rollback()
+                reason = f"batch {batch_no} rolled back: {e.__class__.__name__}"
+                errors.extend({"row": n, "roll": s.roll, "errors": [reason]} for n, s in valid)
+
+        errors.sort(key=lambda e: e["row"])
+        return {"total": total, "inserted": inserted, "failed": total - inserted, "errors": errors}
 
     @staticmethod
-    def get_by_id(db: Session, student_id: int):
-        student = db.query(Student).filter(Student.id == student_id).first()
+    async def get_all(
+        db: AsyncSession,
+        grade: GradeContext,
+        *,
+        active: bool | None = None,
+        year: str | None = None,
+        search: str | None = None,
+        cursor: str | None = None,
+        limit: int = 50,
+        with_total: bool = False,
+        lean: bool = False,
+    ):
+        """
+        Students of the grade, active first and then by roll, keyset-paginated on
+        (is_active, roll, id) so every page is a range scan of ix_students_grade_listing.
+        `search` is a prefix match on name or roll; `with_total` adds a COUNT of all
+        matching rows, which is the only part that grows with the grade's history.
+        With `lean` the items are plain dicts of the StudentResponse columns.
+        """
+        query = select(*columns_for(StudentResponse, Student)) if lean else select(Student)
+        query = query.where(Student.grade_id == grade.id)
+        if active is not None:
+            query = query.where(Student.is_active == active)
+        if year is not None:
+            query = query.where(Student.year == year)
+        if search:
+            prefix = search.replace("\\", "\\\\").replace("%", "\\%").replace("_", "\\_") + "%"
+            query = query.where(or_(Student.name.like(prefix, escape="\\"), Student.roll.like(prefix, escape="\\")))
+
+        total = None
+        if with_total:
+            total = (await db.execute(select(func.count()).select_from(query.subquery()))).scalar_one()
+
+        if cursor:
+            last_active, last_roll, last_id = decode_cursor(cursor, 3)
+            after = and_(
+                Student.is_active == bool(last_active),
+                or_(Student.roll > last_roll, and_(Student.roll == last_roll, Student.id > last_id)),
+            )
+            # active rows sort first, so after an active cursor all inactive rows follow too
+            query = query.where(or_(after, Student.is_active == False) if last_active else after)
+
+        query = query.order_by(Student.is_active.desc(), Student.roll.asc(), Student.id.asc()).limit(limit + 1)
+        result = await db.execute(query)
+        rows = as_dicts(result) if lean else result.scalars().all()
+
+        next_cursor = None
+        if len(rows) > limit:
+            rows = rows[:limit]
+            last = rows[-1]
+            if lean:
+                next_cursor = encode_cursor(last["is_active"], last["roll"], last["id"])
+            else:
+                next_cursor = encode_cursor(last.is_active, last.roll, last.id)
+        return {"items": rows, "next_cursor": next_cursor, "total": total}
+
+    @staticmethod
+    async def get_by_id(db: AsyncSession, student_id: int):
+        result = await db.execute(select(Student).where(Student.id == student_id))
+        student = result.scalars().first()
         if not student:
             raise HTTPException(status_code=404, detail="Student not found")
         return student
@@ -51,16 +233,21 @@ class StudentService:
         if not student:
             raise HTTPException(status_code=404, detail="Student not found")
 
-        old_data = student.__dict__.copy()
+        old_data = model_snapshot(student)
+        old_grade_id = student.grade_id
         student_data = data.model_dump( exclude_unset=True)
 
         for field, value in student_data.items():
             setattr(student, field, value)
 
-        
-
+        bump_results(db, old_grade_id)
+        if student.grade_id != old_grade_id:
+            bump_results(db, student.grade_id)
         db.commit()
         db.refresh(student)
+        invalidate_results(old_grade_id, None, [student.id])
+        if student.grade_id != old_grade_id:
+            invalidate_results(student.grade_id, None, [student.id])
 
         log_action(
             db=db,
@@ -83,8 +270,10 @@ class StudentService:
         old_data = {"is_active": student.is_active}
         student.is_active = not student.is_active
 
+        bump_results(db, student.grade_id)
         db.commit()
         db.refresh(student)
+        invalidate_results(student.grade_id, None, [student.id])
 
         log_action(
             db=db,
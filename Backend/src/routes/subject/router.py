@@ -1,10 +1,16 @@
-from fastapi import APIRouter, Depends
+from fastapi import APIRouter, Depends, Request, Response
 from sqlalchemy.orm import Session
+from sqlalchemy.ext.asyncio import AsyncSession
 
-from src.config.database import get_db
+from src.config.database import get_db, get_async_db
+from src.config.settings import settings
+from src.util.projection import lean_response
+from src.util.versions import table_etag, not_modified, etag_headers
 from src.config.dependencies import admin_only, read_only_or_admin, user_only
 from src.routes.auth.dependencies import get_current_user
 from src.routes.auth.model import User
+from src.routes.grade.dependencies import get_grade_context
+from src.routes.grade.schema import GradeContext
 
 from .schema import SubjectCreate, SubjectUpdate, SubjectBase,SubjectResponse
 from .service import SubjectService
@@ -24,30 +30,38 @@ def create_subject(
 
 # ---------------- GET ALL ----------------
 @router.get("/", response_model=list[SubjectResponse] , dependencies=[Depends(user_only)])
-def get_all_subjects(
-    db: Session = Depends(get_db),
-    current_user: User = Depends(get_current_user),
+async def get_all_subjects(
+    request: Request,
+    response: Response,
+    db: AsyncSession = Depends(get_async_db),
+    grade: GradeContext = Depends(get_grade_context),
 ):
-    return SubjectService.get_all(db, current_user)
+    etag = await table_etag(db, "subjects", scope=grade.id)
+    if cached := not_modified(request, etag):
+        return cached
+    response.headers.update(etag_headers(etag))
+    lean = settings.LEAN_LIST_RESPONSES
+    subjects = await SubjectService.get_all(db, grade, lean=lean)
+    return lean_response(list[SubjectResponse], subjects, headers=etag_headers(etag)) if lean else subjects
 
 
 # ---------------- GET BY ID ----------------
 @router.get("/{subject_id}", response_model=SubjectBase,  dependencies=[Depends(user_only)])
-def get_subject_by_id(
+async def get_subject_by_id(
     subject_id: int,
-    db: Session = Depends(get_db),
+    db: AsyncSession = Depends(get_async_db),
     current_user: User = Depends(get_current_user),
 ):
-    return SubjectService.get_by_id(db, subject_id)
+    return await SubjectService.get_by_id(db, subject_id)
 
 
 # ---------------- GET ELECTIVE ----------------
 @router.get("/elective/list", response_model=list[SubjectBase],  dependencies=[Depends(user_only)])
 def get_elective_subjects(
     db: Session = Depends(get_db),
-    current_user: User = Depends(get_current_user),
+    grade: GradeContext = Depends(get_grade_context),
 ):
-    return SubjectService.get_elective(db, current_user.id)
+    return SubjectService.get_elective(db, grade)
 
 
 # ---------------- UPDATE ----------------
@@ -1,12 +1,20 @@
+from sqlalchemy import select
 from sqlalchemy.orm import Session
+from sqlalchemy.ext.asyncio import AsyncSession
 from fastapi import HTTPException
 
 from .model import Subject
-from .schema import SubjectCreate, SubjectUpdate
+from .schema import SubjectCreate, SubjectUpdate, SubjectResponse
 from src.routes.log.services import log_action
 from src.routes.auth import service as auth_services
 from src.config.dependencies import check_user_validation_for_grade
 from src.routes.grade.service import GradeService
+from src.routes.grade.cache import invalidate_grade
+from src.routes.result.cache import bump_results, invalidate_results
+from src.routes.result.service import ResultService
+from src.util.versions import bump_versions, invalidate_versions
+from src.routes.grade.schema import GradeContext
+from src.util.projection import columns_for, as_dicts
 
 
 class SubjectService:
@@ -15,11 +23,16 @@ class SubjectService:
 
     @staticmethod
     def create_subject(db: Session, data: SubjectCreate, user):
-        check_user_validation_for_grade(db, user, data.grade_id)
+        check_user_validation_for_grade(user, data.grade_id)
         subject = Subject(**data.model_dump())
         db.add(subject)
+        bump_versions(db, "subjects")
+        bump_results(db, subject.grade_id)
         db.commit()
         db.refresh(subject)
+        invalidate_grade(subject.grade_id)
+        invalidate_versions("subjects")
+        invalidate_results(subject.grade_id)
 
         log_action(
             db=db,
@@ -43,32 +56,32 @@ class SubjectService:
 
     # ---------------- GET ALL ----------------
     @staticmethod
-    def get_all(db: Session, user):
-        grade_id=GradeService.get_grade_by_user(user,db).id        
-        if grade_id:
-            return db.query(Subject).filter(Subject.grade_id==grade_id).all()
-        raise HTTPException(status_code=403, detail="Subjects not found for the user's grade")
+    async def get_all(db: AsyncSession, grade: GradeContext, lean: bool = False):
+        if lean:
+            return as_dicts(
+                await db.execute(select(*columns_for(SubjectResponse, Subject)).where(Subject.grade_id == grade.id))
+            )
+        result = await db.execute(select(Subject).where(Subject.grade_id == grade.id))
+        return result.scalars().all()
 
     # ---------------- GET BY ID ----------------
     @staticmethod
-    def get_by_id(db: Session, subject_id: int):
-        subject = db.query(Subject).filter(Subject.id == subject_id).first()
+    async def get_by_id(db: AsyncSession, subject_id: int):
+        result = await db.execute(select(Subject).where(Subject.id == subject_id))
+        subject = result.scalars().first()
         if not subject:
             raise HTTPException(status_code=404, detail="Subject not found")
         return subject
 
   
     @staticmethod
-    def get_elective(db: Session, user_id: int):
-        grade_id=get_grade_id_by_user(user_id,db)
-        if grade_id:
-            return db.query(Subject).filter(Subject.grade_id==grade_id, Subject.is_elective == True).all()
-        raise HTTPException(status_code=403, detail="Elective subjects not found for the user's grade")
+    def get_elective(db: Session, grade: GradeContext):
+        return db.query(Subject).filter(Subject.grade_id==grade.id, Subject.is_elective == True).all()
 
     # ---------------- UPDATE ----------------
     @staticmethod
     def update_subject(db: Session, subject_id: int, data: SubjectUpdate, user):
-        check_user_validation_for_grade(db, user, data.grade_id)
+        check_user_validation_for_grade(user, data.grade_id)
         subject = db.query(Subject).filter(Subject.id == subject_id).first()
         if not subject:
             raise HTTPException(status_code=404, detail="Subject not found")
@@ -85,8 +98,17 @@ class SubjectService:
         for field, value in data.model_dump(exclude_unset=True).items():
             setattr(subject, field, value)
 
+        bump_versions(db, "subjects")
+        bump_results(db, old_data["grade_id"])
+        if subject.grade_id != old_data["grade_id"]:
+            bump_results(db, subject.grade_id)
         db.commit()
         db.refresh(subject)
+        invalidate_grade(old_data["grade_id"], subject.grade_id)
+        invalidate_versions("subjects")
+        ResultService.invalidate_subject(
+            db, subject.id, (old_data["grade_id"], subject.grade_id), old_data["is_elective"] and subject.is_elective
+        )
 
         log_action(
             db=db,
@@ -109,8 +131,7 @@ class SubjectService:
 
     @staticmethod
     def toggle_active(db: Session, subject_id: int, user):
-        grade_id=GradeService.get_grade_by_user(user,db).id
-        check_user_validation_for_grade(db, user, grade_id)
+        GradeService.get_grade_id_by_user(user)
         subject = db.query(Subject).filter(Subject.id == subject_id).first()
         if not subject:
             raise HTTPException(status_code=404, detail="Subject not found")
@@ -121,14 +142,19 @@ class SubjectService:
 
         subject.is_active = not subject.is_active
         
+        bump_versions(db, "subjects")
+        bump_results(db, subject.grade_id)
         db.commit()
         db.refresh(subject)
+        invalidate_grade(subject.grade_id)
+        invalidate_versions("subjects")
+        ResultService.invalidate_subject(db, subject.id, (subject.grade_id,), subject.is_elective)
 
         log_action(
             db=db,
             user_id=user.id,
             action="TOGGLE_ACTIVE",
-            table_name="subject",
+            table_name="subjects",
             record_id=subject_id,
             old_data=old_data,
             new_data={"is_active": subject.is_active},
@@ -0,0 +1,15 @@
+from src.config.settings import settings
+from src.util.cache import TTLCache
+from src.util.invalidation import invalidation_channel
+
+CURRENT = "current"
+
+# single entry: the current academic year as a YearResponse
+current_year_cache = TTLCache(maxsize=1, ttl=settings.YEAR_CACHE_TTL)
+
+invalidation_channel.subscribe("years", lambda key: current_year_cache.clear())
+
+
+def invalidate_current_year():
+    """Drop the cached current year in this and every other worker. Call after commit."""
+    invalidation_channel.publish("years")
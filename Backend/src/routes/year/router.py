@@ -1,11 +1,13 @@
-from fastapi import APIRouter, Depends, HTTPException
+from fastapi import APIRouter, Depends, HTTPException, Request, Response
 from sqlalchemy.orm import Session
+from sqlalchemy.ext.asyncio import AsyncSession
 
-from src.config.database import get_db
+from src.config.database import get_db, get_async_db
 from .schema import YearCreate, YearResponse
 from .service import YearService
 from src.config.dependencies import admin_only, read_only_or_admin
 from src.routes.auth.dependencies import get_current_user
+from src.util.versions import table_etag, not_modified, etag_headers
 
 router = APIRouter(
     prefix="/years",
@@ -21,8 +23,12 @@ def create_year(data: YearCreate, db: Session = Depends(get_db), current_user=De
 
 
 @router.get("/", response_model=list[YearResponse])
-def get_years(db: Session = Depends(get_db)):
-    return YearService.get_all(db)
+async def get_years(request: Request, response: Response, db: AsyncSession = Depends(get_async_db)):
+    etag = await table_etag(db, "years")
+    if cached := not_modified(request, etag):
+        return cached
+    response.headers.update(etag_headers(etag))
+    return await YearService.get_all(db)
 
 
 @router.patch("/{year_id}/set-current", response_model=YearResponse , dependencies=[Depends(admin_only)])
@@ -33,8 +39,12 @@ def set_current_year(year_id: int, db: Session = Depends(get_db), current_user=D
     return year
 
 @router.get("/current", response_model=YearResponse)
-def get_current_year(db: Session = Depends(get_db)):
-    year = YearService.get_current(db)
+async def get_current_year(request: Request, response: Response, db: AsyncSession = Depends(get_async_db)):
+    etag = await table_etag(db, "years", scope="current")
+    if cached := not_modified(request, etag):
+        return cached
+    response.headers.update(etag_headers(etag))
+    year = await YearService.get_current(db)
     if not year:
         raise HTTPException(status_code=404, detail="Current year not found")
     return year
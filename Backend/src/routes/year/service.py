@@ -1,8 +1,12 @@
+from sqlalchemy import select
 from sqlalchemy.orm import Session
+from sqlalchemy.ext.asyncio import AsyncSession
 from fastapi import HTTPException
 from .model import Year
-from .schema import YearCreate
+from .schema import YearCreate, YearResponse
+from .cache import current_year_cache, invalidate_current_year, CURRENT
 from src.routes.log.services import log_action
+from src.util.versions import bump_versions, invalidate_versions
 
 
 class YearService:
@@ -16,8 +20,11 @@ class YearService:
 
         year = Year(**data.dict())
         db.add(year)
+        bump_versions(db, "years")
         db.commit()
         db.refresh(year)
+        invalidate_current_year()
+        invalidate_versions("years")
 
         log_action(
             db=db,
@@ -52,8 +59,11 @@ class YearService:
 
         # set selected
         year.is_current = True
+        bump_versions(db, "years")
         db.commit()
         db.refresh(year)
+        invalidate_current_year()
+        invalidate_versions("years")
 
         log_action(
             db=db,
@@ -72,12 +82,35 @@ class YearService:
 
     # ---------------- GETTERS ----------------
     @staticmethod
-    def get_all(db: Session):
-        return db.query(Year).order_by(Year.year.desc()).all()
+    async def get_all(db: AsyncSession):
+        result = await db.execute(select(Year).order_by(Year.year.desc()))
+        return result.scalars().all()
 
+    # the current year changes about once a year, so both getters serve it from
+    # current_year_cache and only query after an invalidation
     @staticmethod
-    def get_current(db: Session):
-        return db.query(Year).filter(Year.is_current == True).first()
+    async def get_current(db: AsyncSession):
+        current = current_year_cache.get(CURRENT)
+        if current is None:
+            generation = current_year_cache.generation
+            year = (await db.execute(select(Year).where(Year.is_current == True))).scalars().first()
+            if not year:
+                return None
+            current = YearResponse.model_validate(year)
+            current_year_cache.set(CURRENT, current, generation)
+        return current
+
+    @staticmethod
+    def get_current_sync(db: Session):
+        current = current_year_cache.get(CURRENT)
+        if current is None:
+            generation = current_year_cache.generation
+            year = db.query(Year).filter(Year.is_current == True).first()
+            if not year:
+                return None
+            current = YearResponse.model_validate(year)
+            current_year_cache.set(CURRENT, current, generation)
+        return current
 
     # ---------------- DELETE ----------------
     @staticmethod
@@ -92,7 +125,10 @@ class YearService:
         }
 
         db.delete(year)
+        bump_versions(db, "years")
         db.commit()
+        invalidate_current_year()
+        invalidate_versions("years")
 
         log_action(
             db=db,
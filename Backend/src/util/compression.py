@@ -0,0 +1,77 @@
+from starlette.datastructures import Headers
+from starlette.middleware.gzip import GZipResponder, IdentityResponder
+from starlette.types import ASGIApp, Receive, Scope, Send
+
+try:
+    import brotli
+except ImportError:  # gzip only
+    brotli = None
+
+# bodies that are compressed already, or must reach the client chunk by chunk
+EXCLUDED_CONTENT_TYPES = (
+    "text/event-stream", "application/zip", "application/gzip", "image/",
+    # xlsx/docx are already-deflated zip packages
+    "application/vnd.openxmlformats-officedocument.",
+)
+
+
+class _SkipCompressed:
+    async def send_with_compression(self, message):
+        await super().send_with_compression(message)
+        if message["type"] == "http.response.start":
+            content_type = Headers(raw=message["headers"]).get("content-type", "")
+            self.content_type_is_excluded = content_type.startswith(EXCLUDED_CONTENT_TYPES)
+
+
+class _Identity(_SkipCompressed, IdentityResponder):
+    pass
+
+
+class _GZip(_SkipCompressed, GZipResponder):
+    pass
+
+
+class _Brotli(_SkipCompressed, IdentityResponder):
+    content_encoding = "br"
+
+    def __init__(self, app: ASGIApp, minimum_size: int, quality: int):
+        super().__init__(app, minimum_size)
+        self.compressor = brotli.Compressor(quality=quality)
+
+    def apply_compression(self, body: bytes, *, more_body: bool) -> bytes:
+        body = self.compressor.process(body)
+        # flush every chunk so streamed responses stay incremental
+        return body + (self.compressor.flush() if more_body else self.compressor.finish())
+
+
+class CompressionMiddleware:
+    """
+    Compresses responses of at least `minimum_size` bytes with brotli when the
+    client accepts it and the `brotli` package is installed, otherwise gzip.
+
+    Built on Starlette's GZip responders, so streaming responses, Vary and
+    Content-Length are handled the same way as GZipMiddleware.
+    """
+
+    def __init__(self, app: ASGIApp, minimum_size: int = 1024, gzip_level: int = 6, brotli_quality: int = 4):
+        self.app = app
+        self.minimum_size = minimum_size
+        self.gzip_level = gzip_level
+        self.brotli_quality = brotli_quality
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        accepted = {
+            part.split(";")[0].strip().lower()
+            for part in Headers(scope=scope).get("accept-encoding", "").split(",")
+        }
+        if brotli is not None and "br" in accepted:
+            responder = _Brotli(self.app, self.minimum_size, self.brotli_quality)
+        elif "gzip" in accepted:
+            responder = _GZip(self.app, self.minimum_size, compresslevel=self.gzip_level)
+        else:
+            responder = _Identity(self.app, self.minimum_size)
+        await responder(scope, receive, send)
@@ -0,0 +1,168 @@
+import asyncio
+import logging
+import uuid
+from collections import defaultdict
+from datetime import datetime, timedelta, timezone
+
+from sqlalchemy import Column, Integer, String, DateTime, select, delete, func, insert
+
+from src.config.database import Base, SessionLocal, AsyncSessionLocal
+from src.config.settings import settings
+
+logger = logging.getLogger(__name__)
+
+
+class CacheInvalidation(Base):
+    __tablename__ = "cache_invalidations"
+
+    id = Column(Integer, primary_key=True, index=True)
+    origin = Column(String(32), nullable=False)
+    topic = Column(String(50), nullable=False)
+    key = Column(String(255), nullable=True)
+    # naive UTC, stamped by the writer: func.now() would be in the database session's zone
+    created_at = Column(DateTime, server_default=func.now(), index=True)
+
+
+def _utcnow() -> datetime:
+    return datetime.now(timezone.utc).replace(tzinfo=None)
+
+
+class InvalidationChannel:
+    """
+    Fans cache invalidations out to subscribers.
+
+    `publish(topic, key)` always runs the subscribers of this process right away;
+    subclasses additionally broadcast it to the other workers. A `None` key means
+    "drop everything for this topic".
+    """
+
+    def __init__(self):
+        self.origin = uuid.uuid4().hex
+        self._subscribers = defaultdict(list)
+
+    def subscribe(self, topic: str, callback):
+        self._subscribers[topic].append(callback)
+
+    def publish(self, topic: str, key=None):
+        self._dispatch(topic, key)
+        self._broadcast(topic, key)
+
+    def _dispatch(self, topic: str, key):
+        for callback in self._subscribers.get(topic, ()):
+            try:
+                callback(key)
+            except Exception:
+                logger.exception("Cache invalidation callback failed for %s", topic)
+
+    def _broadcast(self, topic: str, key):
+        pass
+
+    async def start(self):
+        pass
+
+    async def stop(self):
+        pass
+
+
+class LocalInvalidationChannel(InvalidationChannel):
+    """Single-process stand-in: invalidations never leave this worker."""
+
+
+class DatabaseInvalidationChannel(InvalidationChannel):
+    """
+    Broadcasts through the `cache_invalidations` table. Every worker polls for
+    rows written by other workers since its last poll, so no extra infrastructure
+    is needed beyond the database all workers already share.
+
+    Auto-increment ids are handed out before commit, so a row can become visible
+    after a row with a higher id was already read. Each poll therefore re-reads the
+    last `overlap` ids and skips the ones it has already dispatched.
+    """
+
+    def __init__(self, poll_interval: float = 1.0, retention: timedelta = timedelta(hours=1), overlap: int = 500):
+        super().__init__()
+        self.poll_interval = poll_interval
+        self.retention = retention
+        self.overlap = overlap
+        self._last_id = 0
+        self._seen = set()  # ids above _last_id - overlap already handled
+        self._task = None
+
+    def _broadcast(self, topic: str, key):
+        with SessionLocal() as db:
+            db.execute(
+                insert(CacheInvalidation).values(
+                    origin=self.origin,
+                    topic=topic,
+                    key=None if key is None else str(key),
+                    created_at=_utcnow(),
+                )
+            )
+            db.commit()
+
+    async def start(self):
+        async with AsyncSessionLocal() as db:
+            self._last_id = (await db.execute(select(func.max(CacheInvalidation.id)))).scalar() or 0
+            # rows already in the window predate this worker's (empty) caches
+            self._seen = set(
+                (
+                    await db.execute(
+                        select(CacheInvalidation.id).where(CacheInvalidation.id > self._last_id - self.overlap)
+                    )
+                ).scalars()
+            )
+        self._task = asyncio.create_task(self._poll_forever())
+
+    async def stop(self):
+        if self._task:
+            self._task.cancel()
+            self._task = None
+
+    async def poll(self):
+        async with AsyncSessionLocal() as db:
+            rows = (
+                await db.execute(
+                    select(CacheInvalidation.id, CacheInvalidation.origin, CacheInvalidation.topic, CacheInvalidation.key)
+                    .where(CacheInvalidation.id > self._last_id - self.overlap)
+                    .order_by(CacheInvalidation.id)
+                )
+            ).all()
+        for row_id, origin, topic, key in rows:
+            if row_id in self._seen:
+                continue
+            self._seen.add(row_id)
+            self._last_id = max(self._last_id, row_id)
+            if origin != self.origin:
+                self._dispatch(topic, key)
+        floor = self._last_id - self.overlap
+        self._seen = {row_id for row_id in self._seen if row_id > floor}
+
+    async def prune(self):
+        async with AsyncSessionLocal() as db:
+            await db.execute(
+                delete(CacheInvalidation).where(CacheInvalidation.created_at < _utcnow() - self.retention)
+            )
+            await db.commit()
+
+    async def _poll_forever(self):
+        polls = 0
+        while True:
+            await asyncio.sleep(self.poll_interval)
+            try:
+                await self.poll()
+                polls += 1
+                if polls % 600 == 0:
+                    await self.prune()
+            except Exception:
+                logger.exception("Polling cache invalidations failed")
+
+
+def _build_channel() -> InvalidationChannel:
+    if settings.CACHE_INVALIDATION_BACKEND == "db":
+        return DatabaseInvalidationChannel(
+            settings.CACHE_INVALIDATION_POLL_INTERVAL, overlap=settings.CACHE_INVALIDATION_POLL_OVERLAP
+        )
+    return LocalInvalidationChannel()
+
+
+invalidation_channel = _build_channel()
@@ -0,0 +1,34 @@
+from functools import lru_cache
+
+from fastapi import Response
+from pydantic import BaseModel, TypeAdapter
+
+
+def columns_for(schema: type[BaseModel], entity) -> list:
+    """The mapped columns of `entity` named like the fields of `schema`, for select()."""
+    return [getattr(entity, name) for name in schema.model_fields]
+
+
+def as_dicts(result) -> list[dict]:
+    """Column rows of a Result as plain dicts; the fastest input pydantic-core validates."""
+    keys = list(result.keys())
+    return [dict(zip(keys, row)) for row in result]
+
+
+@lru_cache(maxsize=None)
+def adapter(tp) -> TypeAdapter:
+    # building a TypeAdapter compiles a validator/serializer; do it once per type
+    return TypeAdapter(tp)
+
+
+def lean_response(tp, data, status_code: int = 200, headers: dict | None = None) -> Response:
+    """
+    Validate `data` as `tp` in one pass and return it as JSON bytes.
+
+    Returning a Response skips FastAPI's own response_model round trip (which
+    would validate and serialize the same rows again through jsonable_encoder).
+    """
+    ta = adapter(tp)
+    return Response(
+        ta.dump_json(ta.validate_python(data)), status_code=status_code, headers=headers, media_type="application/json"
+    )
@@ -0,0 +1,64 @@
+import threading
+import time
+from collections import OrderedDict
+
+
+class TokenBucketLimiter:
+    """
+    Per-key token buckets: each key may burst up to `burst` requests and is
+    refilled at `rate` per second. Buckets live in an LRU of `max_keys`, so a
+    flood of distinct clients costs bounded memory (an evicted client simply
+    starts again with a full bucket). Per process: each worker limits on its own.
+    """
+
+    def __init__(self, rate: float, burst: int, max_keys: int = 100_000):
+        self.rate = rate
+        self.burst = burst
+        self.max_keys = max_keys
+        self._buckets = OrderedDict()  # key -> [tokens, last refill]
+        self._lock = threading.Lock()
+        self.allowed = 0
+        self.limited = 0
+
+    def acquire(self, key) -> float:
+        """0 when a token was taken, else the seconds until one is available."""
+        now = time.monotonic()
+        with self._lock:
+            bucket = self._buckets.get(key)
+            if bucket is None:
+                bucket = self._buckets[key] = [float(self.burst), now]
+                if len(self._buckets) > self.max_keys:
+                    self._buckets.popitem(last=False)
+            else:
+                self._buckets.move_to_end(key)
+                bucket[0] = min(self.burst, bucket[0] + (now - bucket[1]) * self.rate)
+                bucket[1] = now
+            if bucket[0] >= 1:
+                bucket[0] -= 1
+                self.allowed += 1
+                return 0.0
+            self.limited += 1
+            return (1 - bucket[0]) / self.rate
+
+    def stats(self):
+        return {
+            "rate": self.rate,
+            "burst": self.burst,
+            "clients": len(self._buckets),
+            "max_keys": self.max_keys,
+            "allowed": self.allowed,
+            "limited": self.limited,
+        }
+
+
+def client_ip(request, trust_forwarded_for: bool = False) -> str:
+    """
+    The caller's address. Behind a reverse proxy that appends to X-Forwarded-For
+    (nginx's $proxy_add_x_forwarded_for), the last entry is the one the proxy saw;
+    earlier entries come from the client and can be forged.
+    """
+    if trust_forwarded_for:
+        forwarded = request.headers.get("x-forwarded-for")
+        if forwarded:
+            return forwarded.rsplit(",", 1)[-1].strip()
+    return request.client.host if request.client else "unknown"
@@ -0,0 +1,27 @@
+from decimal import Decimal
+
+import orjson
+from fastapi.responses import JSONResponse
+
+OPTIONS = orjson.OPT_NON_STR_KEYS | orjson.OPT_SERIALIZE_NUMPY
+
+
+def _default(value):
+    # same mapping as FastAPI's jsonable_encoder: whole Decimals as int, others as float
+    if isinstance(value, Decimal):
+        return int(value) if value.as_tuple().exponent >= 0 else float(value)
+    if isinstance(value, (set, frozenset)):
+        return list(value)
+    raise TypeError
+
+
+class FastJSONResponse(JSONResponse):
+    """
+    Default response class: orjson instead of json.dumps.
+
+    Handles datetimes, dates, UUIDs, numpy scalars/arrays and Decimal natively, so
+    content built by hand (not just response_model output) can be returned as is.
+    """
+
+    def render(self, content) -> bytes:
+        return orjson.dumps(content, default=_default, option=OPTIONS)
@@ -0,0 +1,41 @@
+import asyncio
+
+
+class SingleFlight:
+    """
+    Coalesces identical concurrent loads: while a load for `key` is running,
+    other callers with the same key await its outcome (value or exception)
+    instead of starting their own.
+    """
+
+    def __init__(self):
+        self._inflight = {}
+        self.loads = 0
+        self.shared = 0
+
+    async def do(self, key, load):
+        future = self._inflight.get(key)
+        if future is not None:
+            self.shared += 1
+            return await asyncio.shield(future)
+
+        future = asyncio.get_running_loop().create_future()
+        self._inflight[key] = future
+        self.loads += 1
+        try:
+            value = await load()
+        except Exception as e:
+            future.set_exception(e)
+            future.exception()  # retrieved: no "never retrieved" warning when nobody shared it
+            raise
+        except BaseException:
+            future.cancel()  # the leader was cancelled; its followers are too
+            raise
+        else:
+            future.set_result(value)
+            return value
+        finally:
+            del self._inflight[key]
+
+    def stats(self):
+        return {"in_flight": len(self._inflight), "loads": self.loads, "shared": self.shared}
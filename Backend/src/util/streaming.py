@@ -0,0 +1,150 @@
+"""
+Streamed file bodies: CSV and XLSX written batch by batch as rows arrive, so a
+response's memory use depends on the batch size and not on the row count.
+"""
+import csv
+import io
+import re
+import zipfile
+from datetime import date, datetime
+from decimal import Decimal
+from xml.sax.saxutils import escape
+
+CSV_MEDIA_TYPE = "text/csv; charset=utf-8"
+XLSX_MEDIA_TYPE = "application/vnd.openxmlformats-officedocument.spreadsheetml.sheet"
+
+
+class ZipSink:
+    """Unseekable ZIP target (no tell/seek): zipfile writes data descriptors and the bytes are drained as they come."""
+
+    def __init__(self):
+        self._buffer = bytearray()
+
+    def write(self, data):
+        self._buffer += data
+        return len(data)
+
+    def flush(self):
+        pass
+
+    def drain(self) -> bytes:
+        data = bytes(self._buffer)
+        self._buffer.clear()
+        return data
+
+
+async def csv_chunks(header: list[str], batches):
+    """CSV bytes, one chunk per batch of rows from the async iterator `batches`."""
+    buffer = io.StringIO()
+    writer = csv.writer(buffer)
+    writer.writerow(header)
+    async for rows in batches:
+        writer.writerows(rows)
+        yield buffer.getvalue().encode("utf-8")
+        buffer.seek(0)
+        buffer.truncate()
+    yield buffer.getvalue().encode("utf-8")
+
+
+# ---------------- XLSX ----------------
+# The smallest package Excel/LibreOffice/openpyxl open: one worksheet with
+# inline strings, so no shared-string table has to be held until the end.
+
+_CONTENT_TYPES = (
+    '<?xml version="1.0" encoding="UTF-8" standalone="yes"?>\n'
+    '<Types xmlns="http://schemas.openxmlformats.org/package/2006/content-types">'
+    '<Default Extension="rels" ContentType="application/vnd.openxmlformats-package.relationships+xml"/>'
+    '<Default Extension="xml" ContentType="application/xml"/>'
+    '<Override PartName="/xl/workbook.xml" '
+    'ContentType="application/vnd.openxmlformats-officedocument.spreadsheetml.sheet.main+xml"/>'
+    '<Override PartName="/xl/worksheets/sheet1.xml" '
+    'ContentType="application/vnd.openxmlformats-officedocument.spreadsheetml.worksheet+xml"/>'
+    "</Types>"
+)
+_ROOT_RELS = (
+    '<?xml version="1.0" encoding="UTF-8" standalone="yes"?>\n'
+    '<Relationships xmlns="http://schemas.openxmlformats.org/package/2006/relationships">'
+    '<Relationship Id="rId1" '
+    'Type="http://schemas.openxmlformats.org/officeDocument/2006/relationships/officeDocument" '
+    'Target="xl/workbook.xml"/>'
+    "</Relationships>"
+)
+_WORKBOOK = (
+    '<?xml version="1.0" encoding="UTF-8" standalone="yes"?>\n'
+    '<workbook xmlns="http://schemas.openxmlformats.org/spreadsheetml/2006/main" '
+    'xmlns:r="http://schemas.openxmlformats.org/officeDocument/2006/relationships">'
+    '<sheets><sheet name="{name}" sheetId="1" r:id="rId1"/></sheets>'
+    "</workbook>"
+)
+_WORKBOOK_RELS = (
+    '<?xml version="1.0" encoding="UTF-8" standalone="yes"?>\n'
+    '<Relationships xmlns="http://schemas.openxmlformats.org/package/2006/relationships">'
+    '<Relationship Id="rId1" '
+    'Type="http://schemas.openxmlformats.org/officeDocument/2006/relationships/worksheet" '
+    'Target="worksheets/sheet1.xml"/>'
+    "</Relationships>"
+)
+_SHEET_START = (
+    '<?xml version="1.0" encoding="UTF-8" standalone="yes"?>\n'
+    '<worksheet xmlns="http://schemas.openxmlformats.org/spreadsheetml/2006/main"><sheetData>'
+)
+_SHEET_END = "</sheetData></worksheet>"
+
+# characters XML 1.0 cannot carry at all
+_ILLEGAL_XML = re.compile("[\x00-\x08\x0b\x0c\x0e-\x1f]")
+
+
+def _column_letters(count: int) -> list[str]:
+    letters = []
+    for index in range(1, count + 1):
+        name = ""
+        while index:
+            index, rem = divmod(index - 1, 26)
+            name = chr(65 + rem) + name
+        letters.append(name)
+    return letters
+
+
+def _cell(ref: str, value) -> str:
+    if value is None:
+        return ""
+    if isinstance(value, bool):
+        return f'<c r="{ref}" t="b"><v>{int(value)}</v></c>'
+    if isinstance(value, (int, float, Decimal)):
+        return f'<c r="{ref}"><v>{value}</v></c>'
+    if isinstance(value, (datetime, date)):
+        value = value.isoformat()
+    text = escape(_ILLEGAL_XML.sub("", str(value)))
+    return f'<c r="{ref}" t="inlineStr"><is><t xml:space="preserve">{text}</t></is></c>'
+
+
+def _xml_row(number: int, letters: list[str], values) -> str:
+    cells = "".join(_cell(f"{col}{number}", value) for col, value in zip(letters, values))
+    return f'<row r="{number}">{cells}</row>'
+
+
+async def xlsx_chunks(sheet_name: str, header: list[str], batches):
+    """XLSX bytes: the worksheet XML is deflated into the package one batch of rows at a time."""
+    sink = ZipSink()
+    archive = zipfile.ZipFile(sink, "w", compression=zipfile.ZIP_DEFLATED)
+    archive.writestr("[Content_Types].xml", _CONTENT_TYPES)
+    archive.writestr("_rels/.rels", _ROOT_RELS)
+    archive.writestr("xl/workbook.xml", _WORKBOOK.format(name=escape(sheet_name[:31], {'"': "&quot;"})))
+    archive.writestr("xl/_rels/workbook.xml.rels", _WORKBOOK_RELS)
+
+    letters = _column_letters(len(header))
+    number = 1
+    # force_zip64: the size of the sheet is unknown until it is closed
+    with archive.open("xl/worksheets/sheet1.xml", "w", force_zip64=True) as sheet:
+        sheet.write((_SHEET_START + _xml_row(number, letters, header)).encode("utf-8"))
+        yield sink.drain()
+        async for rows in batches:
+            parts = []
+            for values in rows:
+                number += 1
+                parts.append(_xml_row(number, letters, values))
+            sheet.write("".join(parts).encode("utf-8"))
+            yield sink.drain()
+        sheet.write(_SHEET_END.encode("utf-8"))
+    archive.close()
+    yield sink.drain()
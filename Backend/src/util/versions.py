@@ -0,0 +1,97 @@
+from fastapi import Request, Response
+from sqlalchemy import Column, Integer, String, select
+from sqlalchemy.orm import Session
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from src.config.database import Base
+from src.config.settings import settings
+from src.util.cache import TTLCache
+from src.util.invalidation import invalidation_channel
+
+
+class TableVersion(Base):
+    """A write counter per table, used as the validator of conditional GETs."""
+    __tablename__ = "table_versions"
+
+    name = Column(String(50), primary_key=True)
+    version = Column(Integer, nullable=False, default=0)
+
+
+# table name -> version
+table_versions = TTLCache(maxsize=64, ttl=settings.TABLE_VERSION_TTL)
+
+
+def _on_version_invalidated(name):
+    if name is None:
+        table_versions.clear()
+    else:
+        table_versions.pop(name)
+
+
+invalidation_channel.subscribe("table_versions", _on_version_invalidated)
+
+
+def _bump_statement(db: Session, name: str):
+    """
+    Insert the counter at 1 or add one to it, in a single statement, so two first
+    writes of a table cannot both insert: ON DUPLICATE KEY UPDATE on MySQL,
+    ON CONFLICT DO UPDATE on SQLite/PostgreSQL.
+    """
+    dialect = db.get_bind().dialect.name
+    if dialect == "mysql":
+        from sqlalchemy.dialects.mysql import insert
+
+        return insert(TableVersion).values(name=name, version=1).on_duplicate_key_update(
+            version=TableVersion.version + 1
+        )
+    if dialect in ("sqlite", "postgresql"):
+        from sqlalchemy.dialects.sqlite import insert as sqlite_insert
+        from sqlalchemy.dialects.postgresql import insert as pg_insert
+
+        stmt = (sqlite_insert if dialect == "sqlite" else pg_insert)(TableVersion).values(name=name, version=1)
+        return stmt.on_conflict_do_update(index_elements=["name"], set_={"version": TableVersion.version + 1})
+    raise RuntimeError(f"Table versions are not supported on {dialect}; use MySQL/MariaDB, SQLite or PostgreSQL")
+
+
+def bump_versions(db: Session, *tables: str):
+    """Increment each table's version in the caller's transaction. Call before commit."""
+    for name in dict.fromkeys(tables):
+        db.execute(_bump_statement(db, name))
+
+
+def invalidate_versions(*tables: str):
+    """Drop cached versions in this and every other worker. Call after commit."""
+    for name in dict.fromkeys(tables):
+        invalidation_channel.publish("table_versions", name)
+
+
+async def get_version(db: AsyncSession, name: str) -> int:
+    version = table_versions.get(name)
+    if version is None:
+        generation = table_versions.generation
+        version = (
+            await db.execute(select(TableVersion.version).where(TableVersion.name == name))
+        ).scalar() or 0
+        table_versions.set(name, version, generation)
+    return version
+
+
+async def table_etag(db: AsyncSession, *tables: str, scope=None) -> str:
+    """Weak ETag over the versions of `tables`; `scope` separates per-grade views of one table."""
+    parts = [f"{name}.{await get_version(db, name)}" for name in tables]
+    if scope is not None:
+        parts.append(str(scope))
+    return 'W/"' + "-".join(parts) + '"'
+
+
+def not_modified(request: Request, etag: str) -> Response | None:
+    """A 304 for `If-None-Match` requests that already hold `etag`, else None."""
+    candidates = request.headers.get("if-none-match")
+    if candidates and (candidates.strip() == "*" or etag in [c.strip() for c in candidates.split(",")]):
+        return Response(status_code=304, headers=etag_headers(etag))
+    return None
+
+
+def etag_headers(etag: str) -> dict:
+    # no-cache: browsers keep the body but revalidate on every use
+    return {"ETag": etag, "Cache-Control": "private, no-cache"}
@@ -35,12 +35,39 @@ export interface StudentUpdateData {
   
 }
 
-// Get all students (filtered by user's grade on backend)
-export const getStudents = async (): Promise<Student[]> => {
-  const response = await api.get('/students');
+// One keyset page of students (filtered by user's grade on backend)
+export interface StudentPage {
+  items: Student[];
+  next_cursor: string | null;
+  total: number | null;
+}
+
+export interface StudentPageParams {
+  active?: boolean;
+  year?: string;
+  search?: string;
+  cursor?: string;
+  limit?: number;
+  total?: boolean;
+}
+
+export const getStudentPage = async (params: StudentPageParams = {}): Promise<StudentPage> => {
+  const response = await api.get('/students', { params });
   return response.data;
 };
 
+// Get all students by following the page cursors
+export const getStudents = async (): Promise<Student[]> => {
+  const students: Student[] = [];
+  let cursor: string | undefined;
+  do {
+    const page = await getStudentPage({ cursor, limit: 500 });
+    students.push(...page.items);
+    cursor = page.next_cursor ?? undefined;
+  } while (cursor);
+  return students;
+};
+
 // Create new student
 export const createStudent = async (data: StudentCreateData): Promise<Student> => {
   const response = await api.post('/students', data);
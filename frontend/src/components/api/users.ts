@@ -59,6 +59,10 @@ export const updateUser = async (userId: number, data: UserUpdate): Promise<{ me
 
 export const submitSelectedGrade = async (gradeId: number): Promise<{ message: string }> => {
   const response = await api.post(`/auth/grades/select/${gradeId}`);
+  // selecting a grade revokes the old token, keep the re-issued one
+  if (response.data.access_token) {
+    localStorage.setItem("access_token", response.data.access_token);
+  }
   return response.data;
 };
 